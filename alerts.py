@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Streaming alert engine
+Evaluates user-defined rules on every new comparison (or arbitrage
+opportunity) and delivers alerts to webhooks and/or a local JSONL file
+"""
+
+import json
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from config import ALERT_RULES, ALERTS
+from structured_log import get_logger
+
+log = get_logger('alerts')
+
+
+class FileSink:
+    """Append alerts as JSON lines to a local file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def send(self, alert: Dict):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(alert, ensure_ascii=False) + '\n')
+
+
+class WebhookSink:
+    """POST alerts as JSON to a webhook URL"""
+
+    def __init__(self, url: str, timeout: float = 5):
+        import requests  # Only needed when a webhook is configured
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def send(self, alert: Dict):
+        self.session.post(self.url, json=alert, timeout=self.timeout)
+
+
+class Cusum:
+    """
+    Two-sided CUSUM change-point detector on a series
+
+    The reference level is an exponentially weighted mean of the series,
+    `drift` is the slack per sample and `threshold` the decision limit.
+    """
+
+    def __init__(self, drift: float = 0.5, threshold: float = 5.0, alpha: float = 0.1):
+        self.drift = drift
+        self.threshold = threshold
+        self.alpha = alpha
+        self.mean = None
+        self.pos = 0.0
+        self.neg = 0.0
+
+    def update(self, value: float) -> Optional[str]:
+        """Feed one sample, returns 'up' / 'down' on a detected shift"""
+        if self.mean is None:
+            self.mean = value
+            return None
+
+        deviation = value - self.mean
+        self.pos = max(0.0, self.pos + deviation - self.drift)
+        self.neg = max(0.0, self.neg - deviation - self.drift)
+        self.mean += self.alpha * deviation
+
+        if self.pos > self.threshold:
+            self.pos = self.neg = 0.0
+            self.mean = value
+            return 'up'
+        if self.neg > self.threshold:
+            self.pos = self.neg = 0.0
+            self.mean = value
+            return 'down'
+        return None
+
+
+class AlertEngine:
+    """
+    Incremental rule evaluation with debouncing
+
+    Rule types (see ALERT_RULES in config.py):
+      - diff:   max Polymarket/Kalshi difference >= threshold
+      - score:  arbitrage_score >= threshold
+      - trend:  trend direction equals `direction`
+      - cusum:  change point on the diff series (drift, threshold)
+      - profit: arbitrage opportunity profit_pct >= threshold
+
+    A rule fires when its condition becomes true, and again only after it
+    cleared or `cooldown` seconds have passed.
+    """
+
+    def __init__(self, rules: Optional[List[Dict]] = None, settings: Optional[Dict] = None):
+        self.rules = rules if rules is not None else ALERT_RULES
+        settings = settings if settings is not None else ALERTS
+        self.cooldown = settings.get('cooldown', 300)
+
+        self.sinks = []
+        if settings.get('file'):
+            self.sinks.append(FileSink(settings['file']))
+        for url in settings.get('webhooks', []):
+            if url:
+                self.sinks.append(WebhookSink(url))
+
+        self.state = {}      # (sport, game, rule) -> {'active', 'last_fired', 'cusum'}
+        self.lock = threading.Lock()
+        self.recent = []     # last alerts, newest last
+        self.fired = 0
+        self.delivery_errors = 0
+
+        self.queue = queue.Queue(maxsize=settings.get('queue_size', 1000))
+        self.worker = None
+
+    def _condition(self, rule: Dict, item: Dict, state: Dict):
+        """Evaluate one rule, returns (triggered, value)"""
+        rule_type = rule['type']
+        if rule_type == 'diff':
+            value = item.get('diff', {}).get('max', 0)
+            return value >= rule['threshold'], value
+        if rule_type == 'score':
+            value = item.get('arbitrage_score', 0)
+            return value >= rule['threshold'], value
+        if rule_type == 'trend':
+            trend = item.get('trend', {})
+            return trend.get('direction') == rule.get('direction', 'increasing'), trend.get('value', 0)
+        if rule_type == 'cusum':
+            if 'cusum' not in state:
+                state['cusum'] = Cusum(rule.get('drift', 0.5), rule.get('threshold', 5.0))
+            value = item.get('diff', {}).get('max', 0)
+            return state['cusum'].update(value) is not None, value
+        if rule_type == 'profit':
+            value = item.get('profit_pct', 0)
+            return value >= rule['threshold'], value
+        return False, None
+
+    def _evaluate(self, sport: str, game: str, item: Dict, source: str):
+        now = time.time()
+        alerts = []
+
+        with self.lock:
+            for rule in self.rules:
+                if rule.get('source', 'comparison') != source:
+                    continue
+                key = (sport, game, rule['name'])
+                state = self.state.setdefault(key, {'active': False, 'last_fired': 0.0})
+                triggered, value = self._condition(rule, item, state)
+
+                if not triggered:
+                    state['active'] = False
+                    continue
+
+                # Debounce: fire on the rising edge, or again after the cooldown
+                if state['active'] and now - state['last_fired'] < self.cooldown:
+                    continue
+
+                state['active'] = True
+                state['last_fired'] = now
+                alerts.append({
+                    'rule': rule['name'],
+                    'type': rule['type'],
+                    'sport': sport,
+                    'game': game,
+                    'value': value,
+                    'timestamp': datetime.now().isoformat(),
+                    'data': item
+                })
+
+            self.fired += len(alerts)
+            self.recent.extend(alerts)
+            del self.recent[:-100]
+
+        for alert in alerts:
+            self._deliver(alert)
+
+    def process_comparisons(self, sport: str, comparisons: List[Dict]):
+        """Evaluate comparison rules on a fresh batch from calculate_comparisons"""
+        for comparison in comparisons:
+            game = comparison.get('game_id') or f"{comparison['away_code']}@{comparison['home_code']}"
+            self._evaluate(sport, game, comparison, 'comparison')
+
+    def process_opportunities(self, sport: str, opportunities: List[Dict]):
+        """Evaluate opportunity rules on results from ArbitrageDetector"""
+        for opportunity in opportunities:
+            self._evaluate(sport, opportunity['game'], opportunity, 'arbitrage')
+
+    def forget_game(self, sport: str, game: str):
+        """Drop rule state (debounce, CUSUM) of a finished game"""
+        with self.lock:
+            for key in [key for key in self.state if key[0] == sport and key[1] == game]:
+                del self.state[key]
+
+    def _deliver(self, alert: Dict):
+        """Hand an alert to the background sender, never blocks the refresh"""
+        if not self.sinks:
+            return
+        if self.worker is None:
+            with self.lock:
+                if self.worker is None:
+                    self.worker = threading.Thread(target=self._run, name='alert-sender', daemon=True)
+                    self.worker.start()
+        try:
+            self.queue.put_nowait(alert)
+        except queue.Full:
+            with self.lock:
+                self.delivery_errors += 1
+
+    def _run(self):
+        while True:
+            alert = self.queue.get()
+            for sink in self.sinks:
+                try:
+                    sink.send(alert)
+                except Exception as e:
+                    with self.lock:
+                        self.delivery_errors += 1
+                    log.warning('Alert delivery failed (%s): %s', type(sink).__name__, e)
+
+    def status(self) -> Dict:
+        with self.lock:
+            return {
+                'rules': [rule['name'] for rule in self.rules],
+                'fired': self.fired,
+                'delivery_errors': self.delivery_errors,
+                'pending': self.queue.qsize(),
+                'recent': [{k: v for k, v in alert.items() if k != 'data'} for alert in self.recent[-20:]]
+            }
+
+
+# Shared engine fed by the API refresh loop
+alert_engine = AlertEngine()
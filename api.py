@@ -4,23 +4,51 @@ Flask API for PolyMix monitoring
 Provides real-time NBA odds comparison data
 """
 
-from flask import Flask, jsonify, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory
 from flask_cors import CORS
-from datetime import datetime, timedelta
-from polymarket_api import PolymarketAPI
-from kalshi_api import KalshiAPI
-from team_mapping import TEAM_LOGOS
-from nfl_polymarket_api import NFLPolymarketAPI
-from nfl_kalshi_api import NFLKalshiAPI
-from nfl_team_mapping import NFL_TEAM_LOGOS
-from odds_api_aggregator import OddsAPIAggregator
-from manifold_api import ManifoldAPI
-from config import PLATFORMS
+import re
+from datetime import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from config import PLATFORMS, SCHEDULER, HISTORY, COLD_START, HORIZON, PROFILER
+from quota_governor import governor
+from circuit_breaker import get_breaker
+from refresh_scheduler import RefreshScheduler, parse_game_time
+from game_history import GameHistoryStore
+from alerts import alert_engine
+from change_log import change_log
+from quote_recorder import quote_recorder
+from history_rollups import HistoryRollups, RESOLUTIONS
+from snapshot_exporter import snapshot_exporter
+from structured_log import get_logger, log_status
+from sampling_profiler import profiler, folded, render_svg
+from memory_accounting import deep_size, process_memory, memory_tracker
+from warm_snapshot import snapshot_writer, load_snapshot
+from market_snapshot import (SPORT_MODULES, load_sport, source_cache, source_status, sources_loaded, get_listing,
+                             set_source_data)
+from arbitrage_detector import ArbitrageDetector
+from game_index import GameTimeIndex, day_bounds
+from comparison_memo import ComparisonMemo, quote_key
+from response_format import TEAM_FIELDS, wants_msgpack, team_mode, encode
+import hashlib
+import json
 import os
-from collections import defaultdict, deque
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 app = Flask(__name__, static_folder='static')
 CORS(app)
+log = get_logger('api')
+
+@app.before_request
+def track_request():
+    """Let the sampling profiler see this request's thread"""
+    profiler.track(f'{request.method} {request.path}')
+
+@app.teardown_request
+def untrack_request(exc):
+    profiler.untrack()
 
 # Cache data to avoid too frequent API calls
 nba_cache = {
@@ -36,38 +64,287 @@ nfl_cache = {
 }
 
 # Historical data storage (keep last 60 data points = 30 minutes at 30s intervals)
-nba_game_history = defaultdict(lambda: {
-    'diff_history': deque(maxlen=60),
-    'poly_history': deque(maxlen=60),
-    'kalshi_history': deque(maxlen=60),
-    'timestamps': deque(maxlen=60)
-})
-
-nfl_game_history = defaultdict(lambda: {
-    'diff_history': deque(maxlen=60),
-    'poly_history': deque(maxlen=60),
-    'kalshi_history': deque(maxlen=60),
-    'timestamps': deque(maxlen=60)
-})
-
-def get_date_range():
-    """Get today and tomorrow's date strings"""
-    today = datetime.now()
-    tomorrow = today + timedelta(days=1)
-    return today.strftime('%Y-%m-%d'), tomorrow.strftime('%Y-%m-%d')
+# Keyed by unique game ID, finished games are evicted (see HISTORY in config.py)
+nba_game_history = GameHistoryStore('nba')
+nfl_game_history = GameHistoryStore('nfl')
+game_history_stores = {
+    'nba': nba_game_history,
+    'nfl': nfl_game_history
+}
+
+# Multi-resolution OHLC rollups (1m / 5m / 1h) for the history endpoint
+history_rollups = {
+    'nba': HistoryRollups(),
+    'nfl': HistoryRollups()
+}
+
+# Per-game refresh priorities (hot games get short intervals)
+schedulers = {
+    'nba': RefreshScheduler(),
+    'nfl': RefreshScheduler()
+}
+
+# Last comparison and ranking of every game, so a refresh only rebuilds changed games
+comparison_memos = {
+    'nba': ComparisonMemo(),
+    'nfl': ComparisonMemo()
+}
+
+def get_game_id(poly_game):
+    """Unique game ID: the Polymarket slug (contains the date, so rematches differ)"""
+    if poly_game.get('slug'):
+        return poly_game['slug']
+    return f"{poly_game['away_code']}@{poly_game['home_code']}-{poly_game.get('end_date', '')[:10]}"
+
+def export_game_ids(poly_games):
+    """Game ID of every listed matchup, other platforms are matched to it by team codes"""
+    return {(game['away_code'], game['home_code']): get_game_id(game) for game in poly_games}
+
+def update_schedule(sport, matched_games, comparisons):
+    """Re-prioritize a sport's games after a full refresh"""
+    scheduler = schedulers[sport]
+    refs = {}
+    for poly_game, kalshi_game in matched_games:
+        refs[get_game_id(poly_game)] = {
+            'poly_slug': poly_game.get('slug', ''),
+            'kalshi_tickers': kalshi_game.get('market_tickers', [])
+        }
+
+    game_keys = [game['game_id'] for game in comparisons]
+    scheduler.update(comparisons, game_keys, [refs.get(key) for key in game_keys])
+
+    # Games that left the listing no longer need refreshing
+    listed = set(game_keys)
+    scheduler.forget([row['game'] for row in scheduler.status()['games'] if row['game'] not in listed])
+
+# Both platforms are refreshed concurrently
+refresh_executor = ThreadPoolExecutor(max_workers=4)
+
+def merge_games(games, updates, key):
+    """
+    Replace games of a cached listing with refreshed ones
+
+    Games are matched by their unique `key` field ('slug' on Polymarket,
+    'event_ticker' on Kalshi), not by team codes: the listing can hold the
+    same matchup on several days.
+    """
+    updated = {game[key]: game for game in updates if game.get(key)}
+    return [updated.get(game.get(key), game) if game.get(key) else game for game in games]
+
+# Set by the asyncio server (asgi_app.py), which refreshes listings and due
+# games with its own clients before dispatching, so the views never block on
+# upstream (see listing)
+external_refresh = {'enabled': False}
+
+def targeted_refs(sport):
+    """
+    Games of a sport whose schedule is due, with their platform references
+
+    Returns:
+        (due game keys, Polymarket slugs, Kalshi tickers), or None when
+        nothing is due or a listing isn't cached yet
+    """
+    scheduler = schedulers[sport]
+    if (sport, 'polymarket') not in source_cache or (sport, 'kalshi') not in source_cache:
+        return None
+
+    due = scheduler.due_games(limit=SCHEDULER.get('max_targeted', 10))
+    if not due:
+        return None
+
+    slugs = []
+    tickers = []
+    for game_key in due:
+        refs = scheduler.refs(game_key) or {}
+        slugs.append(refs.get('poly_slug', ''))
+        tickers.extend(refs.get('kalshi_tickers', []))
+    return due, slugs, tickers
+
+def apply_targeted(sport, due, poly_updates, poly_error, kalshi_updates, kalshi_error):
+    """Merge refreshed games into the cached listings, a failed platform keeps its cached games"""
+    if poly_error is None:
+        entry = source_cache[(sport, 'polymarket')]
+        set_source_data(entry, merge_games(entry['data'], poly_updates, 'slug'))
+    if kalshi_error is None:
+        entry = source_cache[(sport, 'kalshi')]
+        set_source_data(entry, merge_games(entry['data'], kalshi_updates, 'event_ticker'))
+    schedulers[sport].mark_refreshed(due)
+
+def refresh_due_games(sport):
+    """
+    Refresh the games whose schedule is due with targeted requests
+
+    Fetches only those events (Polymarket) and markets (Kalshi), concurrently,
+    and merges them into the cached listings.
+
+    Returns:
+        True if any game was refreshed
+    """
+    if external_refresh['enabled']:
+        return False
+
+    targets = targeted_refs(sport)
+    if targets is None:
+        return False
+    due, slugs, tickers = targets
+
+    poly_api = load_sport(sport, 'polymarket')()
+    kalshi_api = load_sport(sport, 'kalshi')()
+    poly_future = refresh_executor.submit(poly_api.get_games_by_slugs, slugs)
+    kalshi_future = refresh_executor.submit(kalshi_api.get_games_by_tickers, tickers)
+    poly_updates = poly_future.result()
+    kalshi_updates = kalshi_future.result()
+
+    apply_targeted(sport, due, poly_updates, poly_api.session.last_error,
+                   kalshi_updates, kalshi_api.session.last_error)
+    return True
+
+def listing(sport, platform):
+    """
+    Games of one platform for the odds views
+
+    Under the asyncio server the listings are refreshed before the view runs,
+    so the view only reads the source cache and never blocks on upstream.
+    """
+    if external_refresh['enabled']:
+        entry = source_cache.get((sport, platform))
+        return entry['data'] if entry else []
+    return get_listing(sport, platform)
+
+def cache_expired(cache, now):
+    """True if a sport's result is missing or older than its cache duration"""
+    if not cache['data'] or not cache['timestamp']:
+        return True
+    return (now - cache['timestamp']).total_seconds() >= cache['cache_duration']
+
+def evict_finished_games(sport, game_history_dict, listed=None):
+    """
+    Drop history, schedule and alert state of finished games, and stale rollups
+
+    Games in `listed` (IDs of the current listing) are never evicted.
+    """
+    evicted = game_history_dict.evict_expired(listed=listed)
+    if evicted:
+        schedulers[sport].forget(evicted)
+        for game_id in evicted:
+            alert_engine.forget_game(sport, game_id)
+        log.info('Evicted %d finished games from history', len(evicted), extra={'fields': {'sport': sport}})
+
+    retention = HISTORY.get('rollup_retention_hours', 72) * 3600
+    history_rollups[sport].evict_before(time.time() - retention)
+    return evicted
+
+# Sports whose warm snapshot was already considered in this process, and
+# the ones whose restored result is still to be served (once)
+rehydrated = set()
+serve_snapshot = set()
+
+def persist_snapshot(sport, cache, game_history_dict):
+    """
+    Queue the sport's result, source listings and history for the warm store
+
+    The result and listings are captured now; the history export and the
+    file write run on the snapshot writer's thread.
+    """
+    result = cache['data']
+    timestamp = cache['timestamp'].isoformat()
+    sources = {
+        platform: dict(entry) for (entry_sport, platform), entry in source_cache.items()
+        if entry_sport == sport
+    }
+    snapshot_writer.submit(sport, lambda: {
+        'result': result,
+        'timestamp': timestamp,
+        'sources': sources,
+        'history': game_history_dict.export_state()
+    })
+
+def restore_snapshot(sport, cache, game_history_dict):
+    """
+    Restore a warm snapshot, once per process
+
+    Source listings keep their original timestamps, so fetch_source only
+    re-fetches the ones that are actually due.
+
+    Returns:
+        True if the snapshot's result is to be served as-is by the next request
+    """
+    if sport in rehydrated:
+        return sport in serve_snapshot
+    rehydrated.add(sport)
+
+    snapshot = load_snapshot(sport)
+    if not snapshot:
+        return False
+
+    for platform, entry in snapshot.get('sources', {}).items():
+        # Versions from another process are meaningless here
+        set_source_data(source_cache.setdefault((sport, platform), entry), entry['data'])
+    game_history_dict.load_state(snapshot.get('history', {}))
+
+    log.info('Rehydrated warm snapshot', extra={'fields': {'sport': sport, 'games': len(snapshot.get('history', {}))}})
+
+    # Serve the snapshot itself while it is young enough, the next request refreshes
+    if time.time() - snapshot['saved_at'] <= COLD_START.get('serve_age', 120):
+        cache['data'] = {**snapshot['result'], 'rehydrated': True}
+        cache['timestamp'] = datetime.fromisoformat(snapshot['timestamp'])
+        serve_snapshot.add(sport)
+        return True
+    return False
+
+def rehydrate(sport, cache, game_history_dict):
+    """
+    Restore a warm snapshot on the first request of a fresh process
+
+    Returns:
+        True if the snapshot's result should be served as-is (this request only)
+    """
+    restore_snapshot(sport, cache, game_history_dict)
+    if sport in serve_snapshot:
+        serve_snapshot.discard(sport)
+        return True
+    return False
+
+def poly_game_date(poly_game):
+    """Local game date of a Polymarket game: the slug's date (nba-bkn-was-2025-11-16), else its end date"""
+    found = re.search(r'(\d{4}-\d{2}-\d{2})$', poly_game.get('slug', ''))
+    if found:
+        return found.group(1)
+    return poly_game.get('end_date', '')[:10] or None
+
+def kalshi_game_date(kalshi_game):
+    """Local game date of a Kalshi game, from its event ticker (KXNBAGAME-25NOV16BKNWAS)"""
+    found = re.search(r'-(\d{2}[A-Z]{3}\d{2})', kalshi_game.get('event_ticker', ''))
+    if not found:
+        return None
+    try:
+        return datetime.strptime(found.group(1).title(), '%y%b%d').strftime('%Y-%m-%d')
+    except ValueError:
+        return None
 
 def match_games(polymarket_games, kalshi_games):
-    """Match games between platforms"""
+    """
+    Match games between platforms
+
+    Games pair on team codes and game date, so a listing holding two games
+    of the same teams (a series, or today's game next to a rematch) pairs
+    each with its own market. A game whose date can't be read pairs on
+    team codes alone.
+    """
     matched = []
     for poly_game in polymarket_games:
         poly_away = poly_game['away_code']
         poly_home = poly_game['home_code']
+        poly_date = poly_game_date(poly_game)
 
         for kalshi_game in kalshi_games:
             kalshi_away = kalshi_game['away_code']
             kalshi_home = kalshi_game['home_code']
 
             if poly_away == kalshi_away and poly_home == kalshi_home:
+                kalshi_date = kalshi_game_date(kalshi_game)
+                if poly_date and kalshi_date and poly_date != kalshi_date:
+                    continue
                 matched.append((poly_game, kalshi_game))
                 break
 
@@ -88,10 +365,20 @@ def match_additional_platform(base_games, additional_games):
 
     return matched_dict
 
-def calculate_comparisons(matched_games, team_logos, game_history_dict, odds_games=None, manifold_games=None):
-    """Calculate odds comparisons with historical tracking and analysis"""
+def calculate_comparisons(matched_games, team_logos, game_history_dict, odds_games=None, manifold_games=None,
+                          rollups=None, index=None, memo=None):
+    """
+    Calculate odds comparisons with historical tracking and analysis
+
+    With `index` (a GameTimeIndex) every comparison is also added under its
+    start time, in ranking order. With `memo` (a ComparisonMemo) games whose
+    quotes and history window are unchanged reuse their last comparison, and
+    the ranking is updated in place instead of re-sorted.
+    """
     comparisons = []
     current_time = datetime.now()
+    if memo is not None:
+        memo.begin()
 
     # Match additional platforms if provided
     odds_dict = {}
@@ -113,17 +400,49 @@ def calculate_comparisons(matched_games, team_logos, game_history_dict, odds_gam
         # Extract game time from end_date
         game_time = poly_game.get('end_date', '')[:16] if poly_game.get('end_date') else ''
 
-        # Create unique game key
-        game_key = f"{poly_game['away_code']}@{poly_game['home_code']}"
+        # Unique game ID (history survives only for this game, not rematches)
+        game_id = get_game_id(poly_game)
+        start_time = parse_game_time(poly_game.get('end_date') or kalshi_game.get('close_time', ''))
 
         # Get historical data for this game
-        history = game_history_dict[game_key]
+        history = game_history_dict.get(game_id, start_time)
+
+        # Add current data to history (on the history cadence, not every targeted refresh)
+        advanced = game_history_dict.point_due(history, current_time)
+        if advanced:
+            history['diff_history'].append(max_diff)
+            history['poly_history'].append((poly_game['away_prob'], poly_game['home_prob']))
+            history['kalshi_history'].append((kalshi_game['away_prob'], kalshi_game['home_prob']))
+            history['timestamps'].append(current_time.isoformat())
+
+        # Fold the tick into the long-range rollups
+        if rollups is not None:
+            rollups.add_tick(game_id, current_time.timestamp(), {
+                'poly_away': poly_game['away_prob'],
+                'poly_home': poly_game['home_prob'],
+                'kalshi_away': kalshi_game['away_prob'],
+                'kalshi_home': kalshi_game['home_prob'],
+                'diff': max_diff
+            })
+
+        # Get additional platform data if available
+        game_key = f"{poly_game['away_code']}@{poly_game['home_code']}"
+        odds_game = odds_dict.get(game_key)
+        manifold_game = manifold_dict.get(game_key)
 
-        # Add current data to history
-        history['diff_history'].append(max_diff)
-        history['poly_history'].append((poly_game['away_prob'], poly_game['home_prob']))
-        history['kalshi_history'].append((kalshi_game['away_prob'], kalshi_game['home_prob']))
-        history['timestamps'].append(current_time.isoformat())
+        # Same quotes over the whole history window: only the history payload moves
+        key = quote_key(poly_game, kalshi_game, odds_game, manifold_game)
+        cached = memo.reuse(game_id, key) if memo is not None else None
+        if cached is not None:
+            comparison = {
+                **cached,
+                'history': {
+                    'diff': list(history['diff_history']),
+                    'timestamps': list(history['timestamps'])
+                }
+            }
+            memo.store(game_id, key, comparison, rebuilt=False, advanced=advanced)
+            continue
 
         # Calculate trend (comparing recent 5 points vs older 5 points)
         trend = 'stable'
@@ -169,12 +488,8 @@ def calculate_comparisons(matched_games, team_logos, game_history_dict, odds_gam
 
         arb_score = min(round(arb_score), 100)
 
-        # Get additional platform data if available
-        game_key = f"{poly_game['away_code']}@{poly_game['home_code']}"
-        odds_game = odds_dict.get(game_key)
-        manifold_game = manifold_dict.get(game_key)
-
         comparison = {
+            'game_id': game_id,
             'away_team': poly_game['away_team'],
             'home_team': poly_game['home_team'],
             'away_code': poly_game['away_code'],
@@ -217,44 +532,238 @@ def calculate_comparisons(matched_games, team_logos, game_history_dict, odds_gam
             },
             'arbitrage_score': arb_score,
             'game_time': game_time,
+            'start_time': start_time.isoformat() if start_time else None,
             'history': {
                 'diff': list(history['diff_history']),
                 'timestamps': list(history['timestamps'])
             }
         }
 
-        comparisons.append(comparison)
+        if memo is not None:
+            memo.store(game_id, key, comparison, rebuilt=True, advanced=advanced)
+        else:
+            comparisons.append(comparison)
 
     # Sort by arbitrage score (descending), then by max difference
-    comparisons.sort(key=lambda x: (x['arbitrage_score'], x['diff']['max']), reverse=True)
+    if memo is not None:
+        comparisons = memo.ranked(get_game_id(poly_game) for poly_game, _ in matched_games)
+    else:
+        comparisons.sort(key=lambda x: (x['arbitrage_score'], x['diff']['max']), reverse=True)
+
+    if index is not None:
+        for comparison in comparisons:
+            index.add(parse_game_time(comparison['start_time']), comparison)
 
     return comparisons
 
+# Keys of the first local days in grouped results, later days use their date
+DAY_KEYS = ('today', 'tomorrow')
+
+def local_tz():
+    """Time zone of the server"""
+    return datetime.now().astimezone().tzinfo
+
+def horizon_params():
+    """
+    (days, tz) from ?days= and ?tz=, None for each one not given
+
+    Raises:
+        ValueError on an out-of-range horizon or an unknown time zone
+    """
+    days = request.args.get('days')
+    if days is not None:
+        days = int(days)
+        if not 1 <= days <= HORIZON['max_days']:
+            raise ValueError(f"days must be between 1 and {HORIZON['max_days']}")
+
+    tz = request.args.get('tz')
+    if tz:
+        try:
+            tz = ZoneInfo(tz)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f'Unknown time zone: {tz}')
+    return days, tz or None
+
+def bucket_games(index, days, tz):
+    """
+    Games per local day, in one pass over the index
+
+    Returns:
+        (games, dates) keyed 'today', 'tomorrow', then by date
+    """
+    games = {}
+    dates = {}
+    for offset, (day, day_games) in enumerate(index.bucket_days(tz, days)):
+        key = DAY_KEYS[offset] if offset < len(DAY_KEYS) else day
+        games[key] = day_games
+        dates[key] = day
+    return games, dates
+
+def horizon_view(cache):
+    """
+    The cached result, regrouped when the request sets ?days= or ?tz=
+
+    Raises:
+        ValueError on invalid parameters
+    """
+    days, tz = horizon_params()
+    result = cache['data']
+    if days is None and tz is None:
+        return result
+
+    days = days or HORIZON['default_days']
+    tz = tz or local_tz()
+    index = cache.get('index')
+    if index is None:
+        # Rehydrated result, rebuild the index from its games once
+        games = result.get('games', [])
+        if isinstance(games, dict):
+            games = [game for day_games in games.values() for game in day_games]
+        index = cache['index'] = GameTimeIndex.from_games(games)
+
+    horizon = {'days': days, 'tz': str(tz)}
+    if isinstance(result.get('games'), dict):
+        games, dates = bucket_games(index, days, tz)
+        stats = dict(result['stats'])
+        for key in DAY_KEYS:
+            stats[f'{key}_games'] = len(games.get(key, []))
+        return {**result, 'dates': dates, 'horizon': horizon, 'stats': stats, 'games': games}
+
+    bounds = day_bounds(tz, days)
+    return {**result, 'horizon': horizon, 'games': index.between(bounds[0], bounds[-1])}
+
+def cached_response(cache):
+    """Response for the cached result of a sport, horizon then field projection"""
+    try:
+        result = horizon_view(cache)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    return odds_response(result)
+
+HISTORY_MODES = ('none', 'last', 'full')
+
+def project_game(game, fields, history_mode, drop=()):
+    """
+    Copy of a comparison with only the requested fields
+
+    Args:
+        fields: top-level keys or dotted paths ('diff.max'), None for all
+        history_mode: 'none' drops history, 'last' keeps the latest point
+        drop: top-level keys to leave out (e.g. TEAM_FIELDS)
+    """
+    if fields is None:
+        projected = dict(game)
+    else:
+        projected = {}
+        for path in fields:
+            key, _, subkey = path.partition('.')
+            if key not in game:
+                continue
+            if subkey and isinstance(game[key], dict):
+                if subkey in game[key]:
+                    projected.setdefault(key, {})[subkey] = game[key][subkey]
+            else:
+                projected[key] = game[key]
+
+    for key in drop:
+        projected.pop(key, None)
+
+    if 'history' in projected:
+        if history_mode == 'none':
+            del projected['history']
+        elif history_mode == 'last':
+            projected['history'] = {name: values[-1:] for name, values in projected['history'].items()}
+    return projected
+
+def odds_response(result):
+    """
+    JSON or MessagePack response for a cached /api/odds result
+
+    Clients sending `Accept: application/msgpack` get MessagePack (when the
+    msgpack package is installed).
+
+    Query params:
+        fields: comma-separated game fields to keep (e.g. game_id,diff.max,arbitrage_score)
+        history: none, last or full (default full), full series are also
+                 served per game by /api/history/<sport>/<game>?resolution=raw
+        teams: inline (JSON default) or ref (MessagePack default), ref leaves
+               team names and logos to /api/teams/<sport>, games keep the codes
+
+    Projection runs on the game dicts before serialization; the cached
+    result itself is never modified.
+    """
+    history_mode = request.args.get('history', 'full')
+    if history_mode not in HISTORY_MODES:
+        return jsonify({
+            'success': False,
+            'error': f'Unknown history mode: {history_mode} (use {", ".join(HISTORY_MODES)})'
+        }), 400
+
+    binary = wants_msgpack()
+    try:
+        drop = TEAM_FIELDS if team_mode(binary) == 'ref' else ()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    fields = request.args.get('fields')
+    fields = [field.strip() for field in fields.split(',') if field.strip()] if fields else None
+    if fields is None and history_mode == 'full' and not drop:
+        return encode(result, binary)
+
+    games = result.get('games')
+    if isinstance(games, dict):
+        games = {day: [project_game(game, fields, history_mode, drop) for game in day_games]
+                 for day, day_games in games.items()}
+    elif isinstance(games, list):
+        games = [project_game(game, fields, history_mode, drop) for game in games]
+    return encode({**result, 'games': games}, binary)
+
+@lru_cache(maxsize=None)
+def team_dictionary(sport):
+    """Static team metadata of a sport by code, and its ETag"""
+    logos = load_sport(sport, 'logos')
+    teams = {
+        code: {'name': names[0], 'kalshi_name': names[1], 'full_name': names[2], 'logo': logos.get(code, '')}
+        for code, names in load_sport(sport, 'teams').items()
+    }
+    etag = hashlib.sha1(json.dumps(teams, sort_keys=True).encode()).hexdigest()[:16]
+    return teams, etag
+
+@app.route('/api/teams/<sport>')
+def get_teams(sport):
+    """
+    Team names and logos by team code, for clients using ?teams=ref
+
+    Static per deploy, so it is served with an ETag and a long max-age.
+    """
+    if sport not in SPORT_MODULES:
+        return jsonify({'success': False, 'error': f'Unknown sport: {sport}'}), 404
+
+    teams, etag = team_dictionary(sport)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = encode({'success': True, 'sport': sport, 'teams': teams}, wants_msgpack())
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, max-age=86400'
+    return response
+
 @app.route('/api/odds')
 @app.route('/api/odds/nba')
 def get_nba_odds():
     """Get NBA odds comparison data"""
     # Check cache
     now = datetime.now()
-    if nba_cache['data'] and nba_cache['timestamp']:
-        elapsed = (now - nba_cache['timestamp']).seconds
-        if elapsed < nba_cache['cache_duration']:
-            return jsonify(nba_cache['data'])
+    if rehydrate('nba', nba_cache, nba_game_history):
+        return cached_response(nba_cache)
+    # Between full refreshes only hot games are re-fetched
+    if not cache_expired(nba_cache, now) and not refresh_due_games('nba'):
+        return cached_response(nba_cache)
 
     try:
-        # Get date range
-        today, tomorrow = get_date_range()
-
-        # Fetch from both platforms
-        poly_api = PolymarketAPI()
-        kalshi_api = KalshiAPI()
-
-        # Get games for today and tomorrow
-        poly_today = poly_api.get_nba_games(date_filter=today)
-        poly_tomorrow = poly_api.get_nba_games(date_filter=tomorrow)
-        poly_games = poly_today + poly_tomorrow
-
-        kalshi_games = kalshi_api.get_nba_games()
+        # Fetch from both platforms (the whole horizon on Polymarket)
+        poly_games = listing('nba', 'polymarket')
+        kalshi_games = listing('nba', 'kalshi')
 
         # Fetch from additional platforms if enabled
         odds_games = []
@@ -262,66 +771,70 @@ def get_nba_odds():
 
         if PLATFORMS.get('odds_api', {}).get('enabled', False):
             try:
-                odds_api = OddsAPIAggregator()
-                odds_games = odds_api.get_nba_games()
-                print(f"✅ Fetched {len(odds_games)} games from Odds API")
+                odds_games = listing('nba', 'odds_api')
+                log.debug('Fetched %d games from Odds API', len(odds_games))
             except Exception as e:
-                print(f"⚠️  Odds API error: {e}")
+                log.error('Odds API error: %s', e, exc_info=True)
 
         if PLATFORMS.get('manifold', {}).get('enabled', False):
             try:
-                manifold_api = ManifoldAPI()
-                manifold_games = manifold_api.get_nba_games()
-                print(f"✅ Fetched {len(manifold_games)} games from Manifold")
+                manifold_games = listing('nba', 'manifold')
+                log.debug('Fetched %d games from Manifold', len(manifold_games))
             except Exception as e:
-                print(f"⚠️  Manifold API error: {e}")
+                log.error('Manifold API error: %s', e, exc_info=True)
+
+        snapshot_exporter.submit('nba', now.astimezone(), poly_games, kalshi_games, odds_games, manifold_games,
+                                 game_ids=export_game_ids(poly_games))
 
         # Match and compare
         matched = match_games(poly_games, kalshi_games)
+        index = GameTimeIndex()
         comparisons = calculate_comparisons(
-            matched, TEAM_LOGOS, nba_game_history,
+            matched, load_sport('nba', 'logos'), nba_game_history,
             odds_games=odds_games,
-            manifold_games=manifold_games
+            manifold_games=manifold_games,
+            rollups=history_rollups['nba'],
+            index=index,
+            memo=comparison_memos['nba']
         )
+        update_schedule('nba', matched, comparisons)
+        evict_finished_games('nba', nba_game_history, {game['game_id'] for game in comparisons})
+        # The change log feeds /api/changes; the recorder diffs the raw quotes
+        # itself (display values are rounded)
+        change_log.record('nba', comparisons)
+        alert_engine.process_comparisons('nba', comparisons)
+        alert_opportunities('nba')
+        quote_recorder.record('nba', now.timestamp(), matched, [get_game_id(poly) for poly, _ in matched])
 
-        # Group by date
-        today_games = []
-        tomorrow_games = []
-
-        for game in comparisons:
-            game_date = game['game_time'][:10] if game['game_time'] else ''
-            if game_date == today:
-                today_games.append(game)
-            elif game_date == tomorrow:
-                tomorrow_games.append(game)
+        # Group by local date (server time zone, default horizon)
+        games, dates = bucket_games(index, HORIZON['default_days'], local_tz())
 
         result = {
             'success': True,
             'sport': 'nba',
             'timestamp': now.isoformat(),
-            'dates': {
-                'today': today,
-                'tomorrow': tomorrow
-            },
+            'dates': dates,
+            'sources': source_status('nba'),
             'stats': {
                 'total_games': len(comparisons),
-                'today_games': len(today_games),
-                'tomorrow_games': len(tomorrow_games),
+                'today_games': len(games.get('today', [])),
+                'tomorrow_games': len(games.get('tomorrow', [])),
                 'poly_total': len(poly_games),
                 'kalshi_total': len(kalshi_games),
                 'matched': len(matched)
             },
-            'games': {
-                'today': today_games,
-                'tomorrow': tomorrow_games
-            }
+            'games': games
         }
 
         # Update cache
         nba_cache['data'] = result
+        nba_cache['index'] = index
         nba_cache['timestamp'] = now
+        # A result missing a source that never loaded isn't worth restoring
+        if sources_loaded('nba'):
+            persist_snapshot('nba', nba_cache, nba_game_history)
 
-        return jsonify(result)
+        return cached_response(nba_cache)
 
     except Exception as e:
         return jsonify({
@@ -335,27 +848,40 @@ def get_nfl_odds():
     """Get NFL odds comparison data"""
     # Check cache
     now = datetime.now()
-    if nfl_cache['data'] and nfl_cache['timestamp']:
-        elapsed = (now - nfl_cache['timestamp']).seconds
-        if elapsed < nfl_cache['cache_duration']:
-            return jsonify(nfl_cache['data'])
+    if rehydrate('nfl', nfl_cache, nfl_game_history):
+        return cached_response(nfl_cache)
+    # Between full refreshes only hot games are re-fetched
+    if not cache_expired(nfl_cache, now) and not refresh_due_games('nfl'):
+        return cached_response(nfl_cache)
 
     try:
         # Fetch from both platforms
-        poly_api = NFLPolymarketAPI()
-        kalshi_api = NFLKalshiAPI()
+        poly_games = listing('nfl', 'polymarket')
+        kalshi_games = listing('nfl', 'kalshi')
 
-        poly_games = poly_api.get_nfl_games()
-        kalshi_games = kalshi_api.get_nfl_games()
+        snapshot_exporter.submit('nfl', now.astimezone(), poly_games, kalshi_games,
+                                 game_ids=export_game_ids(poly_games))
 
         # Match and compare
         matched = match_games(poly_games, kalshi_games)
-        comparisons = calculate_comparisons(matched, NFL_TEAM_LOGOS, nfl_game_history)
+        index = GameTimeIndex()
+        comparisons = calculate_comparisons(matched, load_sport('nfl', 'logos'), nfl_game_history,
+                                            rollups=history_rollups['nfl'], index=index,
+                                            memo=comparison_memos['nfl'])
+        update_schedule('nfl', matched, comparisons)
+        evict_finished_games('nfl', nfl_game_history, {game['game_id'] for game in comparisons})
+        # The change log feeds /api/changes; the recorder diffs the raw quotes
+        # itself (display values are rounded)
+        change_log.record('nfl', comparisons)
+        alert_engine.process_comparisons('nfl', comparisons)
+        alert_opportunities('nfl')
+        quote_recorder.record('nfl', now.timestamp(), matched, [get_game_id(poly) for poly, _ in matched])
 
         result = {
             'success': True,
             'sport': 'nfl',
             'timestamp': now.isoformat(),
+            'sources': source_status('nfl'),
             'stats': {
                 'total_games': len(comparisons),
                 'poly_total': len(poly_games),
@@ -367,9 +893,12 @@ def get_nfl_odds():
 
         # Update cache
         nfl_cache['data'] = result
+        nfl_cache['index'] = index
         nfl_cache['timestamp'] = now
+        if sources_loaded('nfl'):
+            persist_snapshot('nfl', nfl_cache, nfl_game_history)
 
-        return jsonify(result)
+        return cached_response(nfl_cache)
 
     except Exception as e:
         return jsonify({
@@ -378,6 +907,378 @@ def get_nfl_odds():
             'timestamp': now.isoformat()
         }), 500
 
+def parse_time_param(value):
+    """Parse an epoch-seconds or ISO time query parameter"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+@app.route('/api/history/<sport>/<game>')
+def get_game_history(sport, game):
+    """
+    OHLC history of one game by game ID (e.g. /api/history/nba/nba-bkn-was-2025-11-16)
+
+    Query params:
+        resolution: 1m, 5m or 1h (default 5m), or raw for the recent points
+                    /api/odds would inline as the game's history
+        start, end: epoch seconds or ISO timestamps
+    """
+    if sport not in history_rollups:
+        return jsonify({'success': False, 'error': f'Unknown sport: {sport}'}), 404
+
+    resolution = request.args.get('resolution', '5m')
+    if resolution == 'raw':
+        history = game_history_stores[sport].peek(game)
+        if history is None:
+            return jsonify({'success': False, 'error': f'No history for {game}'}), 404
+        return jsonify({
+            'success': True,
+            'sport': sport,
+            'game': game,
+            'resolution': resolution,
+            'history': {
+                'diff': list(history['diff_history']),
+                'polymarket': list(history['poly_history']),
+                'kalshi': list(history['kalshi_history']),
+                'timestamps': list(history['timestamps'])
+            }
+        })
+    if resolution not in RESOLUTIONS:
+        return jsonify({
+            'success': False,
+            'error': f'Unknown resolution: {resolution} (use raw, {", ".join(RESOLUTIONS)})'
+        }), 400
+
+    try:
+        start = parse_time_param(request.args.get('start'))
+        end = parse_time_param(request.args.get('end'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid time: {e}'}), 400
+
+    buckets = history_rollups[sport].query(game, resolution, start, end)
+    if buckets is None:
+        return jsonify({'success': False, 'error': f'No history for {game}'}), 404
+
+    return jsonify({
+        'success': True,
+        'sport': sport,
+        'game': game,
+        'resolution': resolution,
+        'buckets': buckets
+    })
+
+@app.route('/api/changes/<sport>')
+def get_changes(sport):
+    """
+    Change events of a sport after a sequence number
+
+    Query params:
+        since: last sequence number seen (default 0, every retained event)
+        limit: maximum number of events (default 500)
+
+    Poll with the returned `seq`; when `reset` is true events were dropped
+    from the log and the client should reload /api/odds.
+    """
+    if sport not in game_history_stores:
+        return jsonify({'success': False, 'error': f'Unknown sport: {sport}'}), 404
+
+    try:
+        since = int(request.args.get('since', 0))
+        limit = min(int(request.args.get('limit', 500)), 5000)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid parameter: {e}'}), 400
+
+    return jsonify({
+        'success': True,
+        'sport': sport,
+        **change_log.since(sport, since, limit)
+    })
+
+# Arbitrage is evaluated on the shared snapshot, never fetched for
+arbitrage_detector = ArbitrageDetector(alert_engine=alert_engine)
+
+@lru_cache(maxsize=128)
+def cached_opportunities(sport, poly_version, kalshi_version, min_profit):
+    """Opportunities of one snapshot version and parameter set (memoized)"""
+    return arbitrage_detector.find_opportunities(
+        source_cache[(sport, 'polymarket')]['data'],
+        source_cache[(sport, 'kalshi')]['data'],
+        min_profit
+    )
+
+def alert_opportunities(sport):
+    """
+    Evaluate the arbitrage alert rules on a refreshed snapshot
+
+    Every opportunity is passed on (min_profit 0), the rules apply their
+    own thresholds.
+    """
+    poly_entry = source_cache.get((sport, 'polymarket'))
+    kalshi_entry = source_cache.get((sport, 'kalshi'))
+    if not poly_entry or not kalshi_entry:
+        return
+    opportunities = cached_opportunities(sport, poly_entry['version'], kalshi_entry['version'], 0.0)
+    arbitrage_detector.alert_engine.process_opportunities(sport, opportunities)
+
+@app.route('/api/arbitrage')
+def get_arbitrage():
+    """
+    Arbitrage opportunities on the current cached snapshot
+
+    Query params:
+        sport: nba or nfl (default nba)
+        min_profit: minimum profit percentage (default 0.5)
+
+    Only a sport that was never loaded is fetched (once); afterwards
+    results are memoized per snapshot version and min_profit.
+    """
+    sport = request.args.get('sport', 'nba')
+    if sport not in SPORT_MODULES:
+        return jsonify({'success': False, 'error': f'Unknown sport: {sport}'}), 404
+
+    try:
+        min_profit = round(float(request.args.get('min_profit', 0.5)), 2)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid min_profit: {e}'}), 400
+
+    for platform in ('polymarket', 'kalshi'):
+        entry = source_cache.get((sport, platform))
+        if not entry or entry['timestamp'] is None:
+            get_listing(sport, platform)
+
+    poly_entry = source_cache.get((sport, 'polymarket'))
+    kalshi_entry = source_cache.get((sport, 'kalshi'))
+    if (not poly_entry or not kalshi_entry
+            or poly_entry['timestamp'] is None or kalshi_entry['timestamp'] is None):
+        return jsonify({'success': False, 'error': f'No {sport.upper()} snapshot available',
+                        'sources': source_status(sport)}), 503
+
+    opportunities = cached_opportunities(sport, poly_entry['version'], kalshi_entry['version'], min_profit)
+
+    return jsonify({
+        'success': True,
+        'sport': sport,
+        'min_profit': min_profit,
+        'timestamp': datetime.now().isoformat(),
+        'snapshot': {
+            'polymarket': poly_entry['version'],
+            'kalshi': kalshi_entry['version'],
+            'age': round(time.time() - min(poly_entry['timestamp'], kalshi_entry['timestamp']), 1)
+        },
+        'sources': source_status(sport),
+        'count': len(opportunities),
+        'opportunities': opportunities
+    })
+
+@app.route('/api/admin/quota')
+def get_quota_status():
+    """Rate-limit buckets, remaining quotas, adaptive refresh intervals and breakers"""
+    platforms = governor.status()
+    for platform, status in platforms.items():
+        status['breaker'] = get_breaker(platform).status()
+    return jsonify({
+        'success': True,
+        'timestamp': datetime.now().isoformat(),
+        'platforms': platforms
+    })
+
+@app.route('/api/admin/alerts')
+def get_alert_status():
+    """Alert rules, counters and the most recent alerts"""
+    return jsonify({
+        'success': True,
+        'timestamp': datetime.now().isoformat(),
+        **alert_engine.status()
+    })
+
+@app.route('/api/admin/history')
+def get_history_status():
+    """Tracked games, memory use and eviction counts of the history stores"""
+    return jsonify({
+        'success': True,
+        'timestamp': datetime.now().isoformat(),
+        'nba': {**nba_game_history.stats(), 'rollup_games': len(history_rollups['nba'].list_games())},
+        'nfl': {**nfl_game_history.stats(), 'rollup_games': len(history_rollups['nfl'].list_games())}
+    })
+
+@app.route('/api/admin/export')
+def get_export_status():
+    """Columnar snapshot export, quote recorder and warm snapshot writer counters"""
+    return jsonify({
+        'success': True,
+        'timestamp': datetime.now().isoformat(),
+        **snapshot_exporter.status(),
+        'recorder': quote_recorder.status(),
+        'warm_snapshot': snapshot_writer.status()
+    })
+
+@app.route('/api/admin/logging')
+def get_logging_status():
+    """Log queue, rate-limited warnings and parse skips per source"""
+    return jsonify({
+        'success': True,
+        'timestamp': datetime.now().isoformat(),
+        **log_status()
+    })
+
+# Epoch seconds of the last forced ?trace= refresh per sport
+last_traces = {}
+trace_lock = threading.Lock()
+
+@app.route('/api/admin/profile')
+def get_profile():
+    """
+    Flame graph of the request threads
+
+    Query params:
+        minutes: window of the always-on samples (default 5)
+        trace: 'nba' or 'nfl' to profile one forced /api/odds refresh instead,
+               at most once per PROFILER['trace_cooldown'] seconds per sport
+        format: folded (default, for speedscope / flamegraph.pl), svg or json
+    """
+    fmt = request.args.get('format', 'folded')
+    if fmt not in ('folded', 'svg', 'json'):
+        return jsonify({'success': False, 'error': f'Unknown format: {fmt}'}), 400
+
+    trace = request.args.get('trace')
+    if trace:
+        views = {'nba': (get_nba_odds, nba_cache), 'nfl': (get_nfl_odds, nfl_cache)}
+        if trace not in views:
+            return jsonify({'success': False, 'error': f'Unknown sport: {trace}'}), 404
+        with trace_lock:
+            wait = last_traces.get(trace, 0) + PROFILER.get('trace_cooldown', 60) - time.time()
+            if wait <= 0:
+                last_traces[trace] = time.time()
+        if wait > 0:
+            response = jsonify({'success': False, 'error': f'A {trace} refresh was traced recently, retry in {wait:.0f}s'})
+            return response, 429, {'Retry-After': str(int(wait) + 1)}
+        view, cache = views[trace]
+        cache['timestamp'] = None  # Skip the result cache, sources still follow the governor
+        started = time.perf_counter()
+        with profiler.trace(f'trace /api/odds/{trace}') as stacks:
+            view()
+        title = f'/api/odds/{trace} refresh, {(time.perf_counter() - started) * 1000:.0f} ms'
+    else:
+        try:
+            minutes = float(request.args.get('minutes', 5))
+        except ValueError:
+            return jsonify({'success': False, 'error': 'minutes must be a number'}), 400
+        if not 0 < minutes < float('inf'):
+            return jsonify({'success': False, 'error': 'minutes must be positive'}), 400
+        stacks = profiler.recent(minutes)
+        title = f'Request threads, last {minutes:g} minutes'
+
+    if fmt == 'svg':
+        return Response(render_svg(stacks, title), mimetype='image/svg+xml')
+    if fmt == 'json':
+        return jsonify({
+            'success': True,
+            'timestamp': datetime.now().isoformat(),
+            'title': title,
+            'profiler': profiler.status(),
+            'samples': sum(stacks.values()),
+            'stacks': dict(stacks.most_common())
+        })
+    return Response(folded(stacks), mimetype='text/plain')
+
+def memory_structures():
+    """Long-lived structures of the process: name -> (object, lock or None, tracked games)"""
+    structures = {}
+    for sport, cache in (('nba', nba_cache), ('nfl', nfl_cache)):
+        stats = (cache['data'] or {}).get('stats', {})
+        structures[f'{sport}_cache'] = (cache, None, stats.get('total_games', 0))
+    for sport, store in game_history_stores.items():
+        structures[f'{sport}_game_history'] = (store, store.lock, len(store.games))
+    for sport, rollups in history_rollups.items():
+        structures[f'{sport}_history_rollups'] = (rollups, rollups.lock, len(rollups.games))
+    for (sport, platform), entry in list(source_cache.items()):
+        structures[f'{sport}_{platform}_listing'] = (entry, None, len(entry.get('data') or []))
+    structures['change_log'] = (change_log, change_log.lock,
+                                sum(len(games) for games in change_log.snapshots.values()))
+    for sport, memo in comparison_memos.items():
+        structures[f'{sport}_comparison_memo'] = (memo, memo.lock, len(memo.entries))
+    structures['schedulers'] = (schedulers, None, sum(len(scheduler.games) for scheduler in schedulers.values()))
+    structures['profiler'] = (profiler, profiler.lock, 0)
+    return structures
+
+@app.route('/api/admin/memory')
+def get_memory_status():
+    """
+    Deep sizes of the caches and history structures, process RSS and
+    tracemalloc allocation sites
+
+    Shared objects (e.g. games referenced by a cache and its index) are
+    counted once per structure, but can appear in several structures.
+
+    Query params:
+        tracemalloc: start or stop tracing
+        snapshot: store a tracemalloc snapshot under this label
+        diff: 'a,b' compares snapshot b to a, 'a' the current heap to a
+        top: allocation sites to list (default 20)
+    """
+    action = request.args.get('tracemalloc')
+    if action == 'start':
+        memory_tracker.start()
+    elif action == 'stop':
+        memory_tracker.stop()
+    elif action:
+        return jsonify({'success': False, 'error': f'Unknown tracemalloc action: {action}'}), 400
+
+    try:
+        limit = int(request.args.get('top', 20))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'top must be an integer'}), 400
+    if limit < 1:
+        return jsonify({'success': False, 'error': 'top must be positive'}), 400
+    result = {'success': True, 'timestamp': datetime.now().isoformat()}
+    try:
+        if 'snapshot' in request.args:
+            result['snapshot'] = memory_tracker.take(request.args.get('snapshot'))
+        if request.args.get('diff'):
+            labels = request.args['diff'].split(',')
+            result['diff'] = memory_tracker.diff(labels[0], labels[1] if len(labels) > 1 else None, limit)
+    except KeyError as e:
+        return jsonify({'success': False, 'error': f'Unknown snapshot: {e.args[0]}'}), 404
+    except RuntimeError as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+
+    structures = {}
+    started = time.perf_counter()
+    for name, (obj, lock, games) in memory_structures().items():
+        if lock is not None:
+            with lock:
+                size, objects = deep_size(obj)
+        else:
+            size, objects = deep_size(obj)
+        structures[name] = {'bytes': size, 'objects': objects, 'games': games}
+
+    result.update({
+        'process': process_memory(),
+        'structures': structures,
+        'structures_bytes': sum(structure['bytes'] for structure in structures.values()),
+        'sizing_ms': round((time.perf_counter() - started) * 1000, 1),
+        'arbitrage_memo': cached_opportunities.cache_info()._asdict(),
+        'tracemalloc': memory_tracker.status(),
+        'top': memory_tracker.top(limit)
+    })
+    return jsonify(result)
+
+@app.route('/api/admin/schedule/<sport>')
+def get_schedule_status(sport):
+    """Per-game refresh priorities and intervals"""
+    if sport not in schedulers:
+        return jsonify({'success': False, 'error': f'Unknown sport: {sport}'}), 404
+    return jsonify({
+        'success': True,
+        'sport': sport,
+        'timestamp': datetime.now().isoformat(),
+        'comparisons': comparison_memos[sport].status(),
+        **schedulers[sport].status()
+    })
+
 @app.route('/')
 def index():
     """Serve the monitoring dashboard"""
@@ -4,8 +4,7 @@
 """
 
 from typing import List, Dict, Optional
-from polymarket_api_v2 import PolymarketAPI
-from kalshi_api_v2 import KalshiAPI
+from market_snapshot import get_listing
 
 class ArbitrageDetector:
     """
@@ -21,9 +20,14 @@ class ArbitrageDetector:
     POLY_FEE = 0.02   # 2%
     KALSHI_FEE = 0.07 # 7%
 
-    def __init__(self):
-        self.poly_api = PolymarketAPI()
-        self.kalshi_api = KalshiAPI()
+    def __init__(self, alert_engine=None, poly_fee: Optional[float] = None, kalshi_fee: Optional[float] = None):
+        # 可选: 每次检测结果交给告警引擎 (alerts.AlertEngine)
+        self.alert_engine = alert_engine
+        # 可选: 覆盖默认手续费率 (回测参数扫描用)
+        if poly_fee is not None:
+            self.POLY_FEE = poly_fee
+        if kalshi_fee is not None:
+            self.KALSHI_FEE = kalshi_fee
 
     def get_arbitrage_opportunities(self, sport='nba', min_profit=0.5) -> List[Dict]:
         """
@@ -36,10 +40,24 @@ class ArbitrageDetector:
         Returns:
             List of arbitrage opportunities with详细说明
         """
-        # 获取数据
-        poly_games = self.poly_api.get_nba_games()
-        kalshi_games = self.kalshi_api.get_nba_games()
+        # 获取数据: 与看板共用同一份快照缓存 (market_snapshot)，不会重复请求
+        poly_games = get_listing(sport, 'polymarket')
+        kalshi_games = get_listing(sport, 'kalshi')
 
+        opportunities = self.find_opportunities(poly_games, kalshi_games, min_profit)
+
+        if self.alert_engine:
+            self.alert_engine.process_opportunities(sport, opportunities)
+
+        return opportunities
+
+    def find_opportunities(self, poly_games: List[Dict], kalshi_games: List[Dict], min_profit=0.5) -> List[Dict]:
+        """
+        在给定的报价上查找套利机会 (不访问网络，供实时检测和回测共用)
+
+        Returns:
+            按利润排序的套利机会
+        """
         # 匹配比赛
         opportunities = []
 
@@ -54,6 +72,7 @@ class ArbitrageDetector:
 
         # 按利润排序
         opportunities.sort(key=lambda x: x['profit_pct'], reverse=True)
+
         return opportunities
 
     def _games_match(self, poly_game: Dict, kalshi_game: Dict) -> bool:
@@ -80,9 +99,13 @@ class ArbitrageDetector:
         poly_away = poly_game['away_price']
         poly_home = poly_game['home_price']
 
-        # Kalshi 订单簿 (cents)
-        kalshi_away_ob = kalshi_game['away_orderbook']
-        kalshi_home_ob = kalshi_game['home_orderbook']
+        # Kalshi 订单簿 (cents)，按 team code 取，Kalshi 的主客顺序可能与 Polymarket 相反
+        kalshi_orderbooks = {
+            kalshi_game['away_code']: kalshi_game['away_orderbook'],
+            kalshi_game['home_code']: kalshi_game['home_orderbook']
+        }
+        kalshi_away_ob = kalshi_orderbooks[away_code]
+        kalshi_home_ob = kalshi_orderbooks[home_code]
 
         # === 策略 1a: Poly买away, Kalshi卖away ===
         # 在 Poly 买 away: 花费 poly_away (+ fee)
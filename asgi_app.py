@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+asyncio serving mode of the odds API
+Raw ASGI application with the same routes as the Flask app (api.py). The
+odds endpoints fetch upstream with async clients (async_upstream.py), so
+one process holds thousands of open connections without a thread per
+request. Cached results are served by the Flask view inline on the event
+loop; a refresh rebuilds the result (comparisons, change log, snapshot
+files) on a small worker pool, where every other route (history, admin,
+static) runs too. The views only read the source cache in this mode.
+
+Usage:
+    python asgi_app.py --port 5000
+    uvicorn asgi_app:application --port 5000
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+import api
+from config import ASGI, PLATFORMS
+from market_snapshot import LISTINGS, get_listing
+from async_upstream import HAS_HTTPX, fetch_listing, fetch_targeted, close_clients
+from structured_log import get_logger
+
+# Optional dependency, any ASGI server can run `application`
+HAS_UVICORN = importlib.util.find_spec('uvicorn') is not None
+
+log = get_logger('asgi')
+
+ODDS_ROUTES = {
+    '/api/odds': 'nba',
+    '/api/odds/nba': 'nba',
+    '/api/odds/nfl': 'nfl'
+}
+
+SPORTS = {
+    'nba': (api.nba_cache, api.nba_game_history),
+    'nfl': (api.nfl_cache, api.nfl_game_history)
+}
+
+# Listings and games with a due schedule are refreshed here, not by the views
+api.external_refresh['enabled'] = True
+
+# Sports whose warm snapshot was restored in this process
+restored = set()
+
+# A result this close to expiring is refreshed rather than served inline, so
+# the view can't find it expired and rebuild on the loop
+EXPIRY_MARGIN = timedelta(seconds=1)
+
+# One refresh per sport at a time; requests arriving meanwhile wait for it
+# and are then served from the new result
+refresh_locks = {sport: asyncio.Lock() for sport in SPORTS}
+
+workers = ThreadPoolExecutor(max_workers=ASGI.get('worker_threads', 8), thread_name_prefix='asgi-worker')
+
+
+def build_environ(scope: Dict, body: bytes) -> Dict:
+    """WSGI environ of an ASGI http scope"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = f'HTTP_{name}'
+        environ[name] = f'{environ[name]},{value}' if name in environ else value
+    return environ
+
+
+def dispatch(environ: Dict) -> Tuple[int, List, bytes]:
+    """Run the Flask app on one request, returns status, headers and body"""
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started['status'] = int(status.split(' ', 1)[0])
+        started['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                               for name, value in headers]
+
+    chunks = api.app(environ, start_response)
+    try:
+        body = b''.join(chunks)
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+    return started['status'], started['headers'], body
+
+
+async def in_worker(function, *args):
+    return await asyncio.get_running_loop().run_in_executor(workers, function, *args)
+
+
+async def fetch_listings(sport: str):
+    """Refresh a sport's due listings ahead of the view, which then reads them from the source cache"""
+    fetches = [fetch_listing(sport, platform) for platform in ('polymarket', 'kalshi')]
+
+    # Odds API and Manifold have no async client, they refresh on the workers
+    for platform in ('odds_api', 'manifold'):
+        if (sport, platform) in LISTINGS and PLATFORMS.get(platform, {}).get('enabled', False):
+            fetches.append(in_worker(get_listing, sport, platform))
+
+    for result in await asyncio.gather(*fetches, return_exceptions=True):
+        if isinstance(result, Exception):
+            log.error('Listing refresh failed: %s', result, extra={'fields': {'sport': sport}})
+
+
+async def refresh_due_games(sport: str) -> bool:
+    """Async counterpart of api.refresh_due_games"""
+    targets = api.targeted_refs(sport)
+    if targets is None:
+        return False
+    due, slugs, tickers = targets
+    api.apply_targeted(sport, due, *await fetch_targeted(sport, slugs, tickers))
+    return True
+
+
+async def serve_odds(sport: str, environ: Dict):
+    cache, game_history = SPORTS[sport]
+
+    # First request of the sport: restore the warm snapshot (file read on a
+    # worker); a young one is served as-is by this request's view
+    if sport not in restored:
+        async with refresh_locks[sport]:
+            if sport not in restored:
+                serve = await in_worker(api.restore_snapshot, sport, cache, game_history)
+                restored.add(sport)
+                if serve:
+                    return dispatch(environ)
+
+    if not api.cache_expired(cache, datetime.now() + EXPIRY_MARGIN) and api.targeted_refs(sport) is None:
+        return dispatch(environ)
+
+    # Still under the lock, so waiting requests see the new result
+    async with refresh_locks[sport]:
+        if not api.cache_expired(cache, datetime.now() + EXPIRY_MARGIN) and await refresh_due_games(sport):
+            # Rebuild the result from the merged listings
+            cache['timestamp'] = None
+        if api.cache_expired(cache, datetime.now() + EXPIRY_MARGIN):
+            await fetch_listings(sport)
+            # Comparisons, change log, recorder and snapshot files stay off the loop
+            return await in_worker(dispatch, environ)
+        return dispatch(environ)
+
+
+async def read_body(receive) -> bytes:
+    """Request body, None if it exceeds ASGI['max_body']"""
+    limit = ASGI.get('max_body', 64 * 1024)
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if len(body) > limit:
+            return None
+        if not message.get('more_body', False):
+            return body
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await close_clients()
+            workers.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    """ASGI entry point"""
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    body = await read_body(receive)
+    if body is None:
+        status, headers, content = 413, [(b'content-type', b'text/plain')], b'Request body too large'
+    else:
+        environ = build_environ(scope, body)
+        sport = ODDS_ROUTES.get(scope['path'])
+        if sport and scope['method'] in ('GET', 'HEAD'):
+            status, headers, content = await serve_odds(sport, environ)
+        else:
+            status, headers, content = await in_worker(dispatch, environ)
+
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': content})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the odds API on asyncio')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    args = parser.parse_args()
+
+    if not HAS_HTTPX or not HAS_UVICORN:
+        print("❌ The asyncio server needs httpx and uvicorn: pip install httpx uvicorn")
+        sys.exit(1)
+
+    import uvicorn
+    print(f"🚀 Serving the odds API on http://{args.host}:{args.port} (asyncio)")
+    uvicorn.run(application, host=args.host, port=args.port, lifespan='on', log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Async platform clients for the asyncio serving mode
+Polymarket and Kalshi listings and targeted refreshes over shared httpx
+connection pools, gated by the same quota governor and circuit breakers as
+UpstreamSession. Query building and parsing are the adapters' own, so both
+serving modes cache identical games.
+"""
+
+import asyncio
+import importlib.util
+import time
+from typing import Dict, List, Optional
+import requests
+from config import ASGI, HORIZON
+from quota_governor import governor
+from circuit_breaker import get_breaker
+from upstream_session import QuotaExhausted, CircuitOpen
+from polymarket_api import page_offsets, merge_event_pages, slug_params
+from kalshi_api import series_params, ticker_params
+from market_snapshot import load_sport, cached_source, store_source, upcoming_dates
+from structured_log import get_logger
+
+# Optional dependency, only needed by the asyncio server
+HAS_HTTPX = importlib.util.find_spec('httpx') is not None
+httpx = None
+
+log = get_logger('async_upstream')
+
+# One connection pool per platform, opened on first use and closed by the
+# server's lifespan shutdown (see close_clients)
+clients = {}
+
+
+def client_for(platform: str):
+    """Shared AsyncClient of a platform"""
+    global httpx
+    if httpx is None:
+        import httpx as _httpx
+        httpx = _httpx
+    client = clients.get(platform)
+    if client is None:
+        limits = httpx.Limits(max_connections=ASGI.get('upstream_connections', 20),
+                              max_keepalive_connections=ASGI.get('keepalive_connections', 10),
+                              keepalive_expiry=ASGI.get('keepalive_expiry', 30))
+        client = clients[platform] = httpx.AsyncClient(limits=limits)
+    return client
+
+
+async def close_clients():
+    for client in list(clients.values()):
+        await client.aclose()
+    clients.clear()
+
+
+class AsyncUpstreamSession:
+    """
+    Async counterpart of UpstreamSession for one platform
+
+    Denied calls raise QuotaExhausted / CircuitOpen like the sync session;
+    failed calls raise httpx errors. `last_error` tells a real empty slate
+    from a failed fetch.
+    """
+
+    def __init__(self, platform: str):
+        self.platform = platform
+        self.breaker = get_breaker(platform)
+        self.client = client_for(platform)
+        self.last_error = None
+
+    async def get(self, url: str, params=None, timeout: Optional[float] = None):
+        if not self.breaker.allow():
+            self.last_error = CircuitOpen(f"{self.platform} circuit open")
+            raise self.last_error
+
+        if not governor.acquire(self.platform):
+            # Not a platform failure, just give back a half-open probe slot
+            self.breaker.release()
+            self.last_error = QuotaExhausted(f"{self.platform} rate limit or quota exhausted")
+            raise self.last_error
+
+        # Bound the time a slow platform can hold a refresh
+        timeout = min(timeout, self.breaker.timeout) if timeout else self.breaker.timeout
+
+        started = time.monotonic()
+        try:
+            response = await self.client.get(url, params=params, timeout=timeout)
+        except httpx.HTTPError as e:
+            self.breaker.record_failure()
+            self.last_error = e
+            raise
+
+        governor.observe(self.platform, response.headers, response.status_code)
+        if response.status_code >= 500 or response.status_code == 429:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success(time.monotonic() - started)
+        if response.status_code >= 400:
+            self.last_error = httpx.HTTPStatusError(f"{response.status_code} from {self.platform}",
+                                                    request=response.request, response=response)
+
+        return response
+
+    async def get_json(self, url: str, params=None, timeout: Optional[float] = 10):
+        response = await self.get(url, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+
+def _failed(session: AsyncUpstreamSession, error: Exception, message: str):
+    """Log a failed fetch; undecodable bodies count as failures too"""
+    if session.last_error is None:
+        session.last_error = error
+    log.error(message, error)
+
+
+def _errors():
+    return (httpx.HTTPError, requests.RequestException, ValueError)
+
+
+async def fetch_event_pages(session: AsyncUpstreamSession, base_url: str, params: Dict,
+                            page_size: int = 100, max_pages: int = 10) -> List[Dict]:
+    """Every page of a Gamma events listing, see polymarket_api.fetch_event_pages"""
+    url = f"{base_url}/events/pagination"
+    first = await session.get_json(url, {**params, 'limit': page_size, 'offset': 0})
+    offsets = page_offsets(first, page_size, max_pages)
+    rest = await asyncio.gather(*(session.get_json(url, {**params, 'limit': page_size, 'offset': offset})
+                                  for offset in offsets))
+    return merge_event_pages([first.get('data', []), *(page.get('data', []) for page in rest)])
+
+
+async def series_events(session: AsyncUpstreamSession, base_url: str, series_ticker: str,
+                        page_size: int = 200, max_pages: int = 50) -> List[Dict]:
+    """Every open event of a Kalshi series, see kalshi_api.iter_series_events"""
+    url = f"{base_url}/events"
+    events = []
+    cursor = None
+    for _ in range(max_pages):
+        data = await session.get_json(url, series_params(series_ticker, page_size, cursor))
+        page = data.get('events', [])
+        events.extend(page)
+        cursor = data.get('cursor')
+        if not cursor or not page:
+            return events
+    log.warning('Kalshi %s listing exceeded %d pages, truncated', series_ticker, max_pages)
+    return events
+
+
+async def polymarket_games(api, session: AsyncUpstreamSession, *args) -> List[Dict]:
+    """Listing of a Polymarket adapter; `args` go to its listing_params / parse_events"""
+    try:
+        events = await fetch_event_pages(session, api.BASE_URL, api.listing_params(*args))
+    except _errors() as e:
+        _failed(session, e, 'Error fetching Polymarket data: %s')
+        return []
+    return api.parse_events(events, *args)
+
+
+async def kalshi_games(api, session: AsyncUpstreamSession, series_ticker: str) -> List[Dict]:
+    """Listing of a Kalshi adapter's series"""
+    try:
+        events = await series_events(session, api.BASE_URL, series_ticker)
+    except _errors() as e:
+        _failed(session, e, 'Error fetching Kalshi data: %s')
+        return []
+    return api.parse_events(events)
+
+
+async def polymarket_by_slugs(api, session: AsyncUpstreamSession, slugs: List[str]) -> List[Dict]:
+    """Targeted refresh, see PolymarketAPI.get_games_by_slugs"""
+    params = slug_params(slugs)
+    if not params:
+        return []
+    try:
+        events = await session.get_json(f"{api.BASE_URL}/events", params)
+    except _errors() as e:
+        _failed(session, e, 'Error fetching Polymarket events: %s')
+        return []
+    return api.parse_events(events)
+
+
+async def kalshi_by_tickers(api, session: AsyncUpstreamSession, tickers: List[str]) -> List[Dict]:
+    """Targeted refresh, see KalshiAPI.get_games_by_tickers"""
+    tickers = [ticker for ticker in tickers if ticker]
+    if not tickers:
+        return []
+    try:
+        data = await session.get_json(f"{api.BASE_URL}/markets", ticker_params(tickers))
+    except _errors() as e:
+        _failed(session, e, 'Error fetching Kalshi markets: %s')
+        return []
+    return api._group_markets(data.get('markets', []))
+
+
+# Async equivalents of market_snapshot.LISTINGS
+ASYNC_LISTINGS = {
+    ('nba', 'polymarket'): lambda api, session: polymarket_games(api, session, upcoming_dates(HORIZON['max_days'])),
+    ('nba', 'kalshi'): lambda api, session: kalshi_games(api, session, api.NBA_SERIES),
+    ('nfl', 'polymarket'): lambda api, session: polymarket_games(api, session),
+    ('nfl', 'kalshi'): lambda api, session: kalshi_games(api, session, api.NFL_SERIES),
+}
+
+
+async def fetch_listing(sport: str, platform: str) -> List[Dict]:
+    """Games of one platform for a sport, through the shared source cache"""
+    cached = cached_source(sport, platform)
+    if cached is not None:
+        return cached
+
+    api = load_sport(sport, platform)()
+    session = AsyncUpstreamSession(platform)
+    games = await ASYNC_LISTINGS[(sport, platform)](api, session)
+    # Parse and store run without yielding, so the skip counts are this fetch's
+    return store_source(sport, platform, games, session.last_error, getattr(api, 'SOURCE', platform))
+
+
+async def fetch_targeted(sport: str, slugs: List[str], tickers: List[str]):
+    """
+    Refresh specific games on both platforms concurrently
+
+    Returns:
+        (Polymarket games, error, Kalshi games, error)
+    """
+    poly_api = load_sport(sport, 'polymarket')()
+    kalshi_api = load_sport(sport, 'kalshi')()
+    poly_session = AsyncUpstreamSession('polymarket')
+    kalshi_session = AsyncUpstreamSession('kalshi')
+    poly_updates, kalshi_updates = await asyncio.gather(
+        polymarket_by_slugs(poly_api, poly_session, slugs),
+        kalshi_by_tickers(kalshi_api, kalshi_session, tickers)
+    )
+    return poly_updates, poly_session.last_error, kalshi_updates, kalshi_session.last_error
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Arbitrage backtester
+Replays the quotes captured by quote_recorder.py through ArbitrageDetector
+under configurable fee, latency and fill models. Days are sharded across a
+process pool, every worker evaluates the whole parameter grid on its day.
+
+Usage:
+    python backtester.py --sport nba --start 2025-10-21 --end 2026-04-12 \\
+        --poly-fee 0.01,0.02 --kalshi-fee 0.05,0.07 --min-profit 0.5,1,2 --latency 0,5,30
+"""
+
+import argparse
+import itertools
+import json
+import os
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+from arbitrage_detector import ArbitrageDetector
+from quote_recorder import QuoteRecorder, read_quotes
+
+# Strategy parameters and their defaults
+#   poly_fee, kalshi_fee: fee rates passed to ArbitrageDetector
+#   min_profit:   minimum profit_pct to act on a signal
+#   latency:      seconds between the signal and execution, the trade is
+#                 re-priced on the quotes seen at that time
+#   size:         contracts per trade
+#   fill_rate:    expected fraction of the order that gets filled
+#   volume_share: fill at most this share of the Kalshi volume traded since
+#                 the previous quote (0 disables the cap)
+#   cooldown:     seconds before the same game can be traded again
+DEFAULTS = {
+    'poly_fee': ArbitrageDetector.POLY_FEE,
+    'kalshi_fee': ArbitrageDetector.KALSHI_FEE,
+    'min_profit': 0.5,
+    'latency': 0.0,
+    'size': 100,
+    'fill_rate': 1.0,
+    'volume_share': 0.0,
+    'cooldown': 300.0,
+}
+
+
+def load_day(path: str) -> Dict[str, List[Dict]]:
+    """Recorded quotes of one day grouped by game, in time order"""
+    games = defaultdict(list)
+    for quote in read_quotes(path):
+        games[quote['game_id']].append(quote)
+    for quotes in games.values():
+        quotes.sort(key=lambda quote: quote['ts'])
+    return games
+
+
+def traded_side(opportunity: Dict, poly_game: Dict) -> str:
+    """'away' or 'home', the team an opportunity trades"""
+    return 'away' if opportunity['team'].endswith(f"({poly_game['away_code']})") else 'home'
+
+
+def new_stats() -> Dict:
+    return {
+        'signals': 0,
+        'trades': 0,
+        'missed': 0,
+        'contracts': 0.0,
+        'pnl': 0.0,
+        'capacity_contracts': 0.0,
+        'capacity_pnl': 0.0,
+        'days': 0,
+    }
+
+
+def run_day(path: str, strategies: List[Dict]) -> List[Dict]:
+    """
+    Replay one day under every strategy
+
+    Detection only depends on the fees, so opportunities are computed once
+    per quote and fee pair and shared by all strategies with those fees.
+
+    Returns:
+        Stats per strategy, in the order of `strategies`
+    """
+    games = load_day(path)
+    results = [new_stats() for _ in strategies]
+
+    by_fees = defaultdict(list)
+    for index, strategy in enumerate(strategies):
+        by_fees[(strategy['poly_fee'], strategy['kalshi_fee'])].append(index)
+
+    for (poly_fee, kalshi_fee), indexes in by_fees.items():
+        detector = ArbitrageDetector(poly_fee=poly_fee, kalshi_fee=kalshi_fee)
+
+        for quotes in games.values():
+            timestamps = [quote['ts'] for quote in quotes]
+            opportunities = []
+            for quote in quotes:
+                found = detector.find_opportunities([quote['poly']], [quote['kalshi']], min_profit=float('-inf'))
+                opportunities.append(found[0] if found else None)
+
+            for index in indexes:
+                strategy = strategies[index]
+                stats = results[index]
+                last_trade = float('-inf')
+
+                for i, opportunity in enumerate(opportunities):
+                    if opportunity is None or opportunity['profit_pct'] < strategy['min_profit']:
+                        continue
+                    if timestamps[i] - last_trade < strategy['cooldown']:
+                        continue
+                    last_trade = timestamps[i]
+                    stats['signals'] += 1
+
+                    # Execute on the latest quote seen `latency` seconds later
+                    j = max(i, bisect_right(timestamps, timestamps[i] + strategy['latency']) - 1)
+                    executed = opportunities[j]
+                    if executed is None or executed['strategy'] != opportunity['strategy']:
+                        stats['missed'] += 1
+                        continue
+
+                    # Fill model: Kalshi volume traded on the side since the previous quote
+                    side = traded_side(executed, quotes[j]['poly'])
+                    volume = quotes[j]['kalshi'][f'{side}_orderbook'].get('volume') or 0
+                    previous = (quotes[j - 1]['kalshi'][f'{side}_orderbook'].get('volume') or 0) if j > 0 else 0
+                    available = max(volume - previous, 0) * strategy['volume_share']
+
+                    contracts = strategy['size']
+                    if strategy['volume_share']:
+                        contracts = min(contracts, available)
+                    contracts *= strategy['fill_rate']
+
+                    stats['trades'] += 1
+                    stats['contracts'] += contracts
+                    stats['pnl'] += executed['profit'] * contracts
+                    if strategy['volume_share']:
+                        stats['capacity_contracts'] += available
+                        stats['capacity_pnl'] += executed['profit'] * available
+
+    for stats in results:
+        stats['days'] = 1
+    return results
+
+
+def build_grid(args) -> List[Dict]:
+    """Cartesian product of the comma-separated values of every parameter"""
+    values = {}
+    for name, default in DEFAULTS.items():
+        raw = getattr(args, name)
+        values[name] = [float(value) for value in raw.split(',')] if raw else [default]
+    names = list(values)
+    return [dict(zip(names, combination)) for combination in itertools.product(*values.values())]
+
+
+def summarize(strategy: Dict, stats: Dict) -> Dict:
+    """Final report row of one strategy (PnL in dollars, contracts pay $1)"""
+    return {
+        **strategy,
+        'days': stats['days'],
+        'signals': stats['signals'],
+        'trades': stats['trades'],
+        'missed': stats['missed'],
+        'hit_rate': round(stats['trades'] / stats['signals'] * 100, 1) if stats['signals'] else 0.0,
+        'contracts': round(stats['contracts'], 1),
+        'pnl': round(stats['pnl'] / 100, 2),
+        'pnl_per_trade': round(stats['pnl'] / 100 / stats['trades'], 4) if stats['trades'] else 0.0,
+        'capacity_contracts': round(stats['capacity_contracts'], 1),
+        'capacity_pnl': round(stats['capacity_pnl'] / 100, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backtest ArbitrageDetector on recorded quotes')
+    parser.add_argument('--sport', default='nba')
+    parser.add_argument('--start', help='first day (YYYY-MM-DD)')
+    parser.add_argument('--end', help='last day (YYYY-MM-DD)')
+    parser.add_argument('--root', help='recorder directory (default: RECORDER root in config.py)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--json', help='write the full report to this file')
+    for name, default in DEFAULTS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name,
+                            help=f'comma-separated values to sweep (default: {default})')
+    args = parser.parse_args()
+
+    recorder = QuoteRecorder({'root': args.root}) if args.root else QuoteRecorder()
+    days = recorder.days(args.sport, args.start, args.end)
+    if not days:
+        print(f"❌ No recorded {args.sport.upper()} quotes under {recorder.root}")
+        return
+
+    strategies = build_grid(args)
+    print(f"🔁 Replaying {len(days)} days × {len(strategies)} strategies on {args.workers} workers")
+
+    started = time.perf_counter()
+    totals = [new_stats() for _ in strategies]
+    paths = [recorder.day_path(args.sport, day) for day in days]
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for day_results in executor.map(run_day, paths, itertools.repeat(strategies), chunksize=4):
+            for total, stats in zip(totals, day_results):
+                for key, value in stats.items():
+                    total[key] += value
+    elapsed = time.perf_counter() - started
+
+    report = sorted((summarize(strategy, stats) for strategy, stats in zip(strategies, totals)),
+                    key=lambda row: row['pnl'], reverse=True)
+
+    print(f"✅ Done in {elapsed:.1f}s\n")
+    print(f"{'poly':>5} {'kalshi':>6} {'min%':>5} {'lat':>5} {'share':>5} {'signals':>8} {'trades':>7} "
+          f"{'hit%':>6} {'PnL $':>10} {'$/trade':>8} {'cap $':>9}")
+    print("-" * 86)
+    for row in report[:30]:
+        print(f"{row['poly_fee']:>5.3f} {row['kalshi_fee']:>6.3f} {row['min_profit']:>5.2f} {row['latency']:>5.0f} {row['volume_share']:>5.2f} "
+              f"{row['signals']:>8} {row['trades']:>7} {row['hit_rate']:>6.1f} {row['pnl']:>10.2f} "
+              f"{row['pnl_per_trade']:>8.4f} {row['capacity_pnl']:>9.2f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'sport': args.sport, 'days': days, 'elapsed': elapsed, 'strategies': report}, f, indent=2)
+        print(f"\n📄 Report written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark for the serverless entry point
+Measures `import api` in fresh interpreters and lists the slowest imports
+
+Usage: python bench_cold_start.py [runs]
+"""
+
+import subprocess
+import sys
+import time
+
+
+def _timed(command):
+    started = time.perf_counter()
+    subprocess.run(command, check=True, capture_output=True)
+    return time.perf_counter() - started
+
+
+def measure_import(runs=5):
+    """Wall time of `import api` in a fresh interpreter, best of `runs`"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'import api'], check=True, capture_output=True)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def slowest_imports(limit=15):
+    """Cumulative import time per module from -X importtime"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import api'],
+                            check=True, capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, self_us, cumulative_us, name = [part.strip() for part in line.split('|')]
+        rows.append((int(cumulative_us), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:limit]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    baseline = min(
+        _timed([sys.executable, '-c', 'pass']) for _ in range(runs)
+    )
+    total = measure_import(runs)
+
+    print("=" * 60)
+    print("❄️  Cold start: import api")
+    print("=" * 60)
+    print(f"Interpreter startup: {baseline * 1000:7.1f} ms")
+    print(f"import api (total):  {total * 1000:7.1f} ms")
+    print(f"import api (net):    {(total - baseline) * 1000:7.1f} ms")
+    print("\nSlowest imports (cumulative):")
+    for cumulative_us, name in slowest_imports():
+        print(f"  {cumulative_us / 1000:7.1f} ms  {name}")
+
+    # Adapters must not be imported until a sport is requested
+    check = subprocess.run(
+        [sys.executable, '-c', 'import sys, api; print(sorted(m for m in sys.modules if m.endswith("_api")))'],
+        check=True, capture_output=True, text=True
+    )
+    print(f"\nAdapter modules loaded at import: {check.stdout.strip()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Change-event log
+Each refresh is diffed against the previous snapshot by game ID and only
+the differences are recorded, as typed events with sequence numbers:
+
+  - game_added:     a game appeared in the comparison
+  - game_removed:   a game is no longer listed
+  - quote_changed:  a platform's away/home probability moved
+  - spread_crossed: the max Polymarket/Kalshi difference crossed a threshold
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+from config import CHANGE_LOG
+
+QUOTE_PLATFORMS = ('polymarket', 'kalshi', 'odds_api', 'manifold')
+
+
+def quotes_of(comparison: Dict) -> Dict:
+    """Normalized quotes of one comparison: platform -> (away, home)"""
+    quotes = {}
+    for platform in QUOTE_PLATFORMS:
+        block = comparison.get(platform)
+        if block:
+            quotes[platform] = (block.get('away'), block.get('home'))
+    return quotes
+
+
+class ChangeLog:
+    """
+    Bounded per-sport event log
+
+    Sequence numbers are per sport and contiguous. record() diffs a fresh
+    batch of comparisons against the last one and appends the resulting
+    events; since() lets a consumer poll for events after the last
+    sequence number it has seen.
+    """
+
+    def __init__(self, settings: Optional[Dict] = None):
+        settings = settings if settings is not None else CHANGE_LOG
+        self.max_events = settings.get('max_events', 5000)
+        self.thresholds = sorted(settings.get('spread_thresholds', []))
+
+        self.lock = threading.Lock()
+        self.seq = {}          # sport -> last sequence number
+        self.events = {}       # sport -> deque of events
+        self.snapshots = {}    # sport -> {game_id: {'quotes', 'spread'}}
+
+    def _band(self, spread: float) -> int:
+        """Number of thresholds at or below the spread"""
+        return sum(1 for threshold in self.thresholds if spread >= threshold)
+
+    def _append(self, log, events, event_type: str, sport: str, game_id: str, now: float, **data):
+        self.seq[sport] = self.seq.get(sport, 0) + 1
+        event = {'seq': self.seq[sport], 'type': event_type, 'sport': sport, 'game_id': game_id, 'timestamp': now, **data}
+        log.append(event)
+        events.append(event)
+
+    def record(self, sport: str, comparisons: List[Dict]) -> List[Dict]:
+        """
+        Diff a new batch of comparisons against the previous one
+
+        Returns:
+            Events emitted by this batch (empty when nothing changed)
+        """
+        now = time.time()
+        current = {}
+        for comparison in comparisons:
+            current[comparison['game_id']] = {
+                'quotes': quotes_of(comparison),
+                'spread': comparison.get('diff', {}).get('max', 0),
+                'game': f"{comparison['away_code']}@{comparison['home_code']}"
+            }
+
+        events = []
+        with self.lock:
+            log = self.events.setdefault(sport, deque(maxlen=self.max_events))
+            previous = self.snapshots.get(sport, {})
+
+            for game_id, state in current.items():
+                before = previous.get(game_id)
+                if before is None:
+                    self._append(log, events, 'game_added', sport, game_id, now,
+                                 game=state['game'], quotes=state['quotes'], spread=state['spread'])
+                    continue
+
+                for platform, quote in state['quotes'].items():
+                    if before['quotes'].get(platform) != quote:
+                        self._append(log, events, 'quote_changed', sport, game_id, now,
+                                     platform=platform, away=quote[0], home=quote[1],
+                                     previous=before['quotes'].get(platform))
+
+                old_band = self._band(before['spread'])
+                new_band = self._band(state['spread'])
+                if old_band != new_band:
+                    crossed = self.thresholds[max(old_band, new_band) - 1]
+                    self._append(log, events, 'spread_crossed', sport, game_id, now,
+                                 threshold=crossed, direction='up' if new_band > old_band else 'down',
+                                 spread=state['spread'], previous=before['spread'])
+
+            for game_id, state in previous.items():
+                if game_id not in current:
+                    self._append(log, events, 'game_removed', sport, game_id, now, game=state['game'])
+
+            self.snapshots[sport] = current
+
+        return events
+
+    def since(self, sport: str, seq: int = 0, limit: int = 500) -> Dict:
+        """
+        Events of a sport after sequence number `seq`
+
+        `reset` is True when events after `seq` were already dropped from
+        the log, the consumer should then reload the full snapshot.
+        """
+        with self.lock:
+            log = self.events.get(sport, ())
+            latest = self.seq.get(sport, 0)
+            reset = bool(log) and seq < log[0]['seq'] - 1
+            events = [event for event in log if event['seq'] > seq][:limit]
+            return {
+                'seq': events[-1]['seq'] if events else max(seq, latest),
+                'latest': latest,
+                'reset': reset,
+                'events': events
+            }
+
+    def status(self) -> Dict:
+        with self.lock:
+            return {
+                'seq': dict(self.seq),
+                'events': {sport: len(log) for sport, log in self.events.items()},
+                'tracked_games': {sport: len(snapshot) for sport, snapshot in self.snapshots.items()}
+            }
+
+
+# Shared log fed by the API refresh loop
+change_log = ChangeLog()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Per-platform circuit breaker
+Stops calling a platform that keeps failing or responding slowly, and
+probes it again after a cool-down
+"""
+
+import threading
+import time
+from typing import Dict
+from config import CIRCUIT_BREAKER
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    closed    -> calls go through, consecutive failures are counted
+    open      -> calls fail fast until `recovery_timeout` has passed
+    half_open -> a single probe call decides between closed and open
+
+    A call slower than `latency_threshold` counts as a failure.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, latency_threshold: float = 4.0,
+                 recovery_timeout: float = 30, timeout: float = 5):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.latency_threshold = latency_threshold
+        self.recovery_timeout = recovery_timeout
+        self.timeout = timeout
+
+        self.lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.trips = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream right now"""
+        with self.lock:
+            if self.state == CLOSED:
+                return True
+
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.recovery_timeout:
+                self.state = HALF_OPEN
+                self.probe_in_flight = False
+
+            if self.state == HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+
+            self.rejected += 1
+            return False
+
+    def release(self):
+        """Give back a half-open probe slot when the call never went upstream"""
+        with self.lock:
+            self.probe_in_flight = False
+
+    def record_success(self, latency: float):
+        """Record a completed call, slow calls count as failures"""
+        if latency > self.latency_threshold:
+            self.record_failure()
+            return
+        with self.lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.probe_in_flight = False
+
+    def record_failure(self):
+        """Record a failed call, trips the breaker at the threshold"""
+        with self.lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.trips += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self.probe_in_flight = False
+
+    def status(self) -> Dict:
+        with self.lock:
+            retry_in = 0.0
+            if self.state == OPEN:
+                retry_in = max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'trips': self.trips,
+                'rejected': self.rejected,
+                'retry_in': round(retry_in, 1)
+            }
+
+
+# One breaker per platform, created on first use
+breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(platform: str) -> CircuitBreaker:
+    """Shared breaker for a platform"""
+    with _breakers_lock:
+        if platform not in breakers:
+            settings = dict(CIRCUIT_BREAKER.get('default', {}))
+            settings.update(CIRCUIT_BREAKER.get(platform, {}))
+            breakers[platform] = CircuitBreaker(platform, **settings)
+        return breakers[platform]
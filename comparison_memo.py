@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Per-game memo of calculate_comparisons
+A game's comparison is rebuilt only when one of its platform quotes
+changed, or while its history window still moves; the ranking is kept
+sorted and updated only for the games whose score changed
+"""
+
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# History points the trend, price change and volatility look back on
+# (see calculate_comparisons); after this many identical points they are flat
+SETTLE_TICKS = 10
+
+
+def quote_key(poly_game: Dict, kalshi_game: Dict, odds_game: Optional[Dict] = None,
+              manifold_game: Optional[Dict] = None) -> Tuple:
+    """Fingerprint of every input field a comparison is built from"""
+    return (
+        poly_game['away_prob'], poly_game['home_prob'], poly_game['away_team'], poly_game['home_team'],
+        poly_game.get('url', ''), poly_game.get('end_date', ''),
+        kalshi_game['away_prob'], kalshi_game['home_prob'], kalshi_game.get('url', ''),
+        kalshi_game.get('close_time', ''),
+        (odds_game['away_prob'], odds_game['home_prob'], odds_game.get('url', ''),
+         tuple(odds_game.get('bookmakers', []))) if odds_game else None,
+        (manifold_game['away_prob'], manifold_game['home_prob'], manifold_game.get('url', ''))
+        if manifold_game else None,
+    )
+
+
+def rank_key(game_id: str, comparison: Dict) -> Tuple:
+    """Sort key of the ranking: arbitrage score, then max difference, descending"""
+    return (-comparison['arbitrage_score'], -comparison['diff']['max'], game_id)
+
+
+class ComparisonMemo:
+    """
+    Last comparison of every game of a sport, and their ranking
+
+    Entries and ranking are updated under one lock, so overlapping
+    refreshes can't leave them out of sync.
+    """
+
+    def __init__(self):
+        self.entries = {}      # game_id -> {'key', 'steady' (history points with this key), 'comparison', 'rank'}
+        self.ranking = []      # sorted rank keys
+        self.recomputed = 0    # games rebuilt / reused in the last refresh
+        self.reused = 0
+        self.lock = threading.Lock()
+
+    def begin(self):
+        self.recomputed = self.reused = 0
+
+    def reuse(self, game_id: str, key: Tuple) -> Optional[Dict]:
+        """
+        The stored comparison if the game's quotes are unchanged and have been
+        for SETTLE_TICKS history points, None if it has to be rebuilt
+        """
+        with self.lock:
+            entry = self.entries.get(game_id)
+        if entry is None or entry['key'] != key or entry['steady'] < SETTLE_TICKS:
+            return None
+        return entry['comparison']
+
+    def store(self, game_id: str, key: Tuple, comparison: Dict, rebuilt: bool, advanced: bool = True):
+        """
+        Record this refresh's comparison and move the game in the ranking if needed
+
+        `advanced` tells whether the refresh appended a history point; only
+        those count towards SETTLE_TICKS.
+        """
+        rank = rank_key(game_id, comparison)
+        with self.lock:
+            entry = self.entries.get(game_id)
+            if entry is None:
+                entry = self.entries[game_id] = {'key': None, 'steady': 0, 'comparison': None, 'rank': None}
+            if entry['key'] != key:
+                entry['steady'] = 0
+            if advanced:
+                entry['steady'] += 1
+            entry['key'] = key
+            entry['comparison'] = comparison
+
+            if rebuilt:
+                self.recomputed += 1
+            else:
+                self.reused += 1
+
+            if rank != entry['rank']:
+                if entry['rank'] is not None:
+                    del self.ranking[bisect_left(self.ranking, entry['rank'])]
+                insort(self.ranking, rank)
+                entry['rank'] = rank
+
+    def ranked(self, game_ids: Iterable[str]) -> List[Dict]:
+        """
+        Comparisons of this refresh in ranking order
+
+        Games missing from `game_ids` (no longer listed) are dropped.
+        """
+        present = set(game_ids)
+        with self.lock:
+            for game_id in [game_id for game_id in self.entries if game_id not in present]:
+                entry = self.entries.pop(game_id)
+                if entry['rank'] is not None:
+                    del self.ranking[bisect_left(self.ranking, entry['rank'])]
+            return [self.entries[rank[2]]['comparison'] for rank in self.ranking]
+
+    def status(self) -> Dict:
+        with self.lock:
+            return {
+                'games': len(self.entries),
+                'recomputed': self.recomputed,
+                'reused': self.reused,
+                'settled': sum(1 for entry in self.entries.values() if entry['steady'] >= SETTLE_TICKS)
+            }
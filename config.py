@@ -42,9 +42,186 @@ PLATFORMS = {
     }
 }
 
+# Upstream base URLs, overridable per platform, or all at once with
+# FAKE_UPSTREAM_URL pointing at a local fake_upstream.py server
+_FAKE_UPSTREAM = os.environ.get('FAKE_UPSTREAM_URL', '').rstrip('/')
+UPSTREAM_URLS = {
+    'polymarket': os.environ.get('POLYMARKET_BASE_URL') or (
+        f'{_FAKE_UPSTREAM}/gamma' if _FAKE_UPSTREAM else 'https://gamma-api.polymarket.com'),
+    'kalshi': os.environ.get('KALSHI_BASE_URL') or (
+        f'{_FAKE_UPSTREAM}/kalshi/trade-api/v2' if _FAKE_UPSTREAM else 'https://api.elections.kalshi.com/trade-api/v2'),
+    'manifold': os.environ.get('MANIFOLD_BASE_URL') or (
+        f'{_FAKE_UPSTREAM}/manifold/v0' if _FAKE_UPSTREAM else 'https://api.manifold.markets/v0'),
+    'odds_api': os.environ.get('ODDS_API_BASE_URL') or (
+        f'{_FAKE_UPSTREAM}/odds/v4' if _FAKE_UPSTREAM else 'https://api.the-odds-api.com/v4'),
+}
+
 # Cache settings
 CACHE_DURATION = 30  # seconds
 
+# Rate limits per platform
+# rate/burst: token bucket (requests per second / max burst)
+# min_interval: shortest refresh interval for the source (seconds)
+# quota_period/quota_reserve: metered APIs, keep `quota_reserve` requests spare
+RATE_LIMITS = {
+    'polymarket': {'rate': 5, 'burst': 10, 'min_interval': CACHE_DURATION},
+    'kalshi': {'rate': 10, 'burst': 20, 'min_interval': CACHE_DURATION},
+    'odds_api': {
+        'rate': 1,
+        'burst': 2,
+        'min_interval': CACHE_DURATION,
+        'quota_period': 'monthly',
+        'quota_reserve': 10
+    },
+    'manifold': {'rate': 5, 'burst': 10, 'min_interval': 60},
+}
+
+# Circuit breakers per platform ('default' applies to all, overrides per platform)
+# failure_threshold: consecutive failures before the breaker opens
+# latency_threshold: calls slower than this (seconds) count as failures
+# recovery_timeout: seconds before a half-open probe is allowed
+# timeout: upper bound for any upstream request timeout (seconds)
+CIRCUIT_BREAKER = {
+    'default': {
+        'failure_threshold': 3,
+        'latency_threshold': 4.0,
+        'recovery_timeout': 30,
+        'timeout': 5
+    },
+    'manifold': {'latency_threshold': 6.0, 'timeout': 8},
+}
+
+# Date horizon of the odds endpoints (?days= and ?tz=)
+# NBA Polymarket events are listed for `max_days` days
+HORIZON = {
+    'default_days': 2,   # today and tomorrow
+    'max_days': 7
+}
+
+# Per-game refresh scheduling
+# Hot games refresh every `hot_interval` seconds, cold ones every `cold_interval`
+SCHEDULER = {
+    'hot_interval': 5,
+    'cold_interval': 300,
+    'volatility_window': 10,   # diff history points used for volatility
+    'volatility_scale': 3.0,   # diff std dev (pct points) treated as max volatility
+    'live_hours': 3,           # hours after tip-off a game counts as live
+    'max_targeted': 10,        # games refreshed per targeted request
+    'weights': {'volatility': 0.4, 'score': 0.3, 'proximity': 0.3}
+}
+
+# Alert rules, evaluated on every refresh
+# type: diff | score | trend | cusum (comparisons), profit (source='arbitrage')
+ALERT_RULES = [
+    {'name': 'wide_spread', 'type': 'diff', 'threshold': 8},
+    {'name': 'high_score', 'type': 'score', 'threshold': 70},
+    {'name': 'spread_widening', 'type': 'trend', 'direction': 'increasing'},
+    {'name': 'spread_shift', 'type': 'cusum', 'drift': 0.5, 'threshold': 5.0},
+    {'name': 'arbitrage', 'type': 'profit', 'threshold': 1.0, 'source': 'arbitrage'},
+]
+
+# Alert delivery
+ALERTS = {
+    'cooldown': 300,  # seconds before an active rule fires again for the same game
+    'file': os.environ.get('ALERT_FILE'),   # JSONL file of fired alerts, off if unset (read-only on serverless)
+    'webhooks': [url for url in os.environ.get('ALERT_WEBHOOK_URLS', '').split(',') if url],
+}
+
+# In-memory game history
+# Games are evicted `grace_hours` after their start time (or when not seen
+# for `idle_hours`); rollups are kept `rollup_retention_hours` after the last tick
+HISTORY = {
+    'max_points': 60,              # 30 minutes at 30s intervals
+    'point_interval': CACHE_DURATION,  # seconds between points, targeted refreshes in between add none
+    'grace_hours': 6,
+    'idle_hours': 24,
+    'rollup_retention_hours': 72,
+    'archive_dir': os.environ.get('HISTORY_ARCHIVE_DIR')  # JSONL archive of evicted games, off if unset
+}
+
+# Serverless cold start: warm snapshot file store
+# A fresh process serves a snapshot younger than `max_age` seconds on its
+# first request instead of waiting on every upstream
+COLD_START = {
+    'snapshot_dir': os.environ.get('SNAPSHOT_DIR', '/tmp/polymix'),
+    'max_age': 600,
+    'serve_age': 120
+}
+
+# Columnar export of every refresh (requires pyarrow)
+# Off by default (read-only on serverless), EXPORT_ENABLED=1 turns it on
+EXPORT = {
+    'enabled': os.environ.get('EXPORT_ENABLED', '0') == '1',
+    'root': os.environ.get('EXPORT_DIR', 'exports'),
+    'format': 'parquet',      # 'parquet' or 'arrow' (Arrow IPC)
+    'batch_rows': 5000,       # rows per file
+    'flush_interval': 300     # seconds before a partial batch is written
+}
+
+# Change-event log (diff of consecutive snapshots by game ID)
+# `spread_thresholds` are the max Polymarket/Kalshi differences (percentage
+# points) that emit a spread_crossed event when crossed in either direction
+CHANGE_LOG = {
+    'max_events': 5000,        # per sport, oldest events are dropped first
+    'spread_thresholds': [3, 5, 8]
+}
+
+# Quote-stream recorder for the arbitrage backtester
+# Matched Polymarket/Kalshi quotes of every game whose raw prices or
+# orderbook changed are appended to <root>/<sport>/<YYYY-MM-DD>.jsonl (UTC
+# days) by a background thread. Off by default (read-only on serverless)
+RECORDER = {
+    'enabled': os.environ.get('QUOTE_RECORDER', '0') == '1',
+    'root': os.environ.get('QUOTE_DIR', 'quotes'),
+    'queue_size': 1000         # refreshes waiting for the writer, newer ones are dropped when full
+}
+
+# Structured logging (structured_log.py)
+# Records are written by a background thread as JSON lines ('text' for
+# local runs). Identical warnings pass `burst` times per `window` seconds,
+# then one in every `sample`
+LOGGING = {
+    'level': os.environ.get('LOG_LEVEL', 'INFO'),
+    'format': os.environ.get('LOG_FORMAT', 'json'),
+    'queue_size': 10000,       # records waiting for the writer, newer ones are dropped when full
+    'window': 60,
+    'burst': 5,
+    'sample': 100
+}
+
+# Sampling profiler (sampling_profiler.py)
+# Request threads are sampled every `interval` seconds, a traced refresh
+# every `trace_interval`; samples are kept in `bucket_seconds` buckets
+PROFILER = {
+    'enabled': os.environ.get('PROFILER', '1') == '1',
+    'interval': 0.02,
+    'trace_interval': 0.001,
+    'bucket_seconds': 10,
+    'retention_minutes': 15,
+    'all_threads': False,      # sample every thread, not just the ones serving requests
+    'max_depth': 64,
+    'trace_cooldown': 60       # seconds between forced ?trace= refreshes of a sport
+}
+
+# Memory accounting (memory_accounting.py)
+# tracemalloc slows allocations down, start it here or from /api/admin/memory
+MEMORY = {
+    'tracemalloc': os.environ.get('TRACEMALLOC', '0') == '1',
+    'frames': 1,               # traceback depth of every allocation
+    'max_snapshots': 5         # labeled snapshots kept for diffs
+}
+
+# asyncio serving mode (asgi_app.py)
+# Upstream calls share one connection pool per platform; routes other than
+# the odds endpoints run on at most `worker_threads` threads
+ASGI = {
+    'upstream_connections': 20,     # per platform
+    'keepalive_connections': 10,
+    'keepalive_expiry': 30,
+    'worker_threads': 8,
+    'max_body': 64 * 1024           # request bodies above this are rejected
+}
+
 # Display settings
 MAX_GAMES_DISPLAYED = 100
 SHOW_INACTIVE_PLATFORMS = True
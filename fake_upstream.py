@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Fake upstream server for load testing
+Emulates the Gamma (Polymarket), Kalshi, Manifold and Odds API endpoints the
+adapters call, with a synthetic slate whose prices drift between requests.
+
+Usage:
+    python fake_upstream.py --port 8900 --games 15 --latency 80 --error-rate 0.01
+    FAKE_UPSTREAM_URL=http://127.0.0.1:8900 ODDS_API_KEY=fake flask --app api run --with-threads
+    python load_test.py --url http://127.0.0.1:5000
+
+Routes (prefixes match UPSTREAM_URLS in config.py):
+    /gamma/events, /gamma/events/pagination
+    /kalshi/trade-api/v2/events, /kalshi/trade-api/v2/markets
+    /manifold/v0/search-markets
+    /odds/v4/sports/<sport_key>/odds/
+    /_stats                      request counters of this server
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+from team_mapping import NBA_TEAMS
+from nfl_team_mapping import NFL_TEAMS
+
+SPORTS = {
+    'nba': {'teams': NBA_TEAMS, 'tag_id': '745', 'series': 'KXNBAGAME', 'odds_key': 'basketball_nba'},
+    'nfl': {'teams': NFL_TEAMS, 'series_id': '10187', 'series': 'KXNFLGAME', 'odds_key': 'americanfootball_nfl'},
+}
+BOOKMAKERS = ['draftkings', 'fanduel', 'betmgm', 'caesars', 'pointsbetus']
+
+
+def iso(value: datetime) -> str:
+    return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class Slate:
+    """Synthetic games of one sport, prices random-walk on every listing"""
+
+    def __init__(self, sport: str, games: int, extra_events: int, move_rate: float, seed: int):
+        self.sport = sport
+        self.settings = SPORTS[sport]
+        self.teams = self.settings['teams']
+        self.move_rate = move_rate
+        self.extra_events = extra_events
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.games = []
+
+        codes = list(self.teams)
+        per_day = len(codes) // 2
+        now = datetime.now(timezone.utc)
+        for index in range(games):
+            day, slot = divmod(index, per_day)
+            if slot == 0:
+                self.rng.shuffle(codes)
+            start = (now + timedelta(days=day)).replace(hour=23, minute=0, second=0, microsecond=0) \
+                + timedelta(minutes=30 * (slot % 6))
+            local_date = (datetime.now() + timedelta(days=day)).strftime('%Y-%m-%d')
+            self.games.append({
+                'id': f'{sport}{index + 1000}',
+                'away': codes[2 * slot],
+                'home': codes[2 * slot + 1],
+                'date': local_date,
+                'start': start,
+                'prob': self.rng.uniform(0.2, 0.8),
+                'volume': self.rng.randint(1000, 50000),
+            })
+
+    def tick(self):
+        """Move some prices, like a live market between two polls"""
+        with self.lock:
+            for game in self.games:
+                if self.rng.random() < self.move_rate:
+                    game['prob'] = min(0.97, max(0.03, game['prob'] + self.rng.uniform(-0.02, 0.02)))
+                    game['volume'] += self.rng.randint(0, 500)
+
+    def names(self, code: str):
+        """(Polymarket name, Kalshi name, full name) of a team"""
+        return self.teams[code]
+
+    # Gamma
+
+    def gamma_event(self, game: Dict) -> Dict:
+        away, home = self.names(game['away']), self.names(game['home'])
+        title = f'{away[0]} vs. {home[0]}'
+        price = round(game['prob'], 3)
+        return {
+            'id': game['id'],
+            'slug': f"{self.sport}-{game['away'].lower()}-{game['home'].lower()}-{game['date']}",
+            'title': title,
+            'endDate': iso(game['start']),
+            'markets': [{
+                'question': title,
+                'outcomes': json.dumps([away[0], home[0]]),
+                'outcomePrices': json.dumps([f'{price:.3f}', f'{1 - price:.3f}']),
+                'endDate': iso(game['start']),
+            }]
+        }
+
+    def gamma_events(self, params: Dict) -> List[Dict]:
+        """Game events plus futures/props filler, filtered like Gamma does"""
+        events = [self.gamma_event(game) for game in self.games]
+        far = iso(datetime.now(timezone.utc) + timedelta(days=180))
+        events += [{
+            'id': f'{self.sport}-filler-{index}',
+            'slug': f'{self.sport}-futures-{index}',
+            'title': f'{self.sport.upper()} season award market {index}',
+            'endDate': far,
+            'markets': []
+        } for index in range(self.extra_events)]
+
+        if params.get('slug') or params.get('id'):
+            slugs, ids = set(params.get('slug', [])), set(params.get('id', []))
+            return [event for event in events if event['slug'] in slugs or event['id'] in ids]
+
+        end_min, end_max = first(params, 'end_date_min'), first(params, 'end_date_max')
+        if end_min:
+            events = [event for event in events if event['endDate'] >= end_min]
+        if end_max:
+            events = [event for event in events if event['endDate'] <= end_max]
+        return events
+
+    # Kalshi
+
+    def kalshi_markets(self, game: Dict) -> List[Dict]:
+        away, home = self.names(game['away']), self.names(game['home'])
+        # Like the real tickers, the date is the local game date (the slug's), not the UTC start
+        game_date = datetime.strptime(game['date'], '%Y-%m-%d').strftime('%y%b%d').upper()
+        event_ticker = f"{self.settings['series']}-{game_date}{game['away']}{game['home']}"
+        markets = []
+        for code, name, prob in ((game['away'], away[1], game['prob']), (game['home'], home[1], 1 - game['prob'])):
+            last = max(1, min(99, round(prob * 100 + self.rng.uniform(-2, 2))))
+            markets.append({
+                'ticker': f'{event_ticker}-{code}',
+                'event_ticker': event_ticker,
+                'title': f'{away[1]} vs {home[1]} Winner?',
+                'yes_sub_title': name,
+                'last_price': last,
+                'yes_bid': max(1, last - 1),
+                'yes_ask': min(99, last + 1),
+                'volume': game['volume'],
+                'close_time': iso(game['start'] + timedelta(hours=3)),
+            })
+        return markets
+
+    def kalshi_events(self) -> List[Dict]:
+        events = []
+        for game in self.games:
+            markets = self.kalshi_markets(game)
+            events.append({'event_ticker': markets[0]['event_ticker'], 'markets': markets})
+        return events
+
+    # Manifold / Odds API
+
+    def manifold_markets(self, limit: int) -> List[Dict]:
+        markets = []
+        for game in self.games[:limit]:
+            away, home = self.names(game['away']), self.names(game['home'])
+            markets.append({
+                'id': f"mf-{game['id']}",
+                'question': f'{away[2]} vs {home[2]}',
+                'outcomeType': 'BINARY',
+                'probability': min(0.99, max(0.01, game['prob'] + self.rng.uniform(-0.05, 0.05))),
+                'closeTime': int(game['start'].timestamp() * 1000),
+                'url': f"https://manifold.markets/fake/{game['id']}",
+                'volume': game['volume'] / 10,
+                'totalLiquidity': 1000
+            })
+        return markets
+
+    def odds_events(self) -> List[Dict]:
+        events = []
+        for game in self.games:
+            away, home = self.names(game['away']), self.names(game['home'])
+            bookmakers = []
+            for key in BOOKMAKERS:
+                vig = self.rng.uniform(1.03, 1.06)
+                prob = min(0.97, max(0.03, game['prob'] + self.rng.uniform(-0.02, 0.02)))
+                bookmakers.append({
+                    'key': key,
+                    'title': key,
+                    'markets': [{'key': 'h2h', 'outcomes': [
+                        {'name': away[2], 'price': round(1 / (prob * vig), 2)},
+                        {'name': home[2], 'price': round(1 / ((1 - prob) * vig), 2)},
+                    ]}]
+                })
+            events.append({
+                'id': f"odds-{game['id']}",
+                'sport_key': self.settings['odds_key'],
+                'commence_time': iso(game['start']),
+                'home_team': home[2],
+                'away_team': away[2],
+                'bookmakers': bookmakers
+            })
+        return events
+
+
+def first(params: Dict, name: str, default=None):
+    values = params.get(name)
+    return values[0] if values else default
+
+
+class FakeUpstream:
+    """Routing, latency and error injection shared by all handler threads"""
+
+    def __init__(self, args):
+        self.latency = args.latency / 1000
+        self.jitter = args.jitter / 1000
+        self.error_rate = args.error_rate
+        self.throttle_rate = args.throttle_rate
+        self.page_size = args.kalshi_page_size
+        self.slates = {
+            sport: Slate(sport, args.games, args.extra_events, args.move_rate, args.seed + index)
+            for index, sport in enumerate(SPORTS)
+        }
+        self.rng = random.Random(args.seed)
+        self.counts = Counter()
+        self.lock = threading.Lock()
+        self.odds_quota = 500
+
+    def slate_for(self, params: Dict):
+        if first(params, 'series_id') == SPORTS['nfl']['series_id'] or first(params, 'series_ticker') == 'KXNFLGAME':
+            return self.slates['nfl']
+        return self.slates['nba']
+
+    def handle(self, path: str, params: Dict):
+        """Returns (status, headers, body)"""
+        with self.lock:
+            self.counts[path] += 1
+            roll = self.rng.random()
+            delay = max(0.0, self.rng.gauss(self.latency, self.jitter)) if self.latency else 0.0
+        time.sleep(delay)
+
+        if path == '/_stats':
+            return 200, {}, {'requests': dict(self.counts)}
+        if roll < self.error_rate:
+            return 500, {}, {'error': 'injected failure'}
+        if roll < self.error_rate + self.throttle_rate:
+            return 429, {'Retry-After': '2'}, {'error': 'injected throttle'}
+
+        if path in ('/gamma/events', '/gamma/events/pagination'):
+            slate = self.slate_for(params)
+            slate.tick()
+            events = slate.gamma_events(params)
+            if path == '/gamma/events':
+                return 200, {}, events
+            limit, offset = int(first(params, 'limit', 100)), int(first(params, 'offset', 0))
+            return 200, {}, {
+                'data': events[offset:offset + limit],
+                'pagination': {'hasMore': offset + limit < len(events), 'totalResults': len(events)}
+            }
+
+        if path == '/kalshi/trade-api/v2/events':
+            slate = self.slate_for(params)
+            slate.tick()
+            events = slate.kalshi_events()
+            limit = min(int(first(params, 'limit', self.page_size)), self.page_size)
+            offset = int(first(params, 'cursor') or 0)
+            cursor = str(offset + limit) if offset + limit < len(events) else ''
+            return 200, {}, {'events': events[offset:offset + limit], 'cursor': cursor}
+
+        if path == '/kalshi/trade-api/v2/markets':
+            tickers = set((first(params, 'tickers') or '').split(','))
+            markets = [market for slate in self.slates.values() for game in slate.games
+                       for market in slate.kalshi_markets(game) if market['ticker'] in tickers]
+            return 200, {}, {'markets': markets, 'cursor': ''}
+
+        if path == '/manifold/v0/search-markets':
+            return 200, {}, self.slates['nba'].manifold_markets(int(first(params, 'limit', 20)))
+
+        if path.startswith('/odds/v4/sports/') and path.endswith('/odds/'):
+            sport = 'nfl' if 'americanfootball' in path else 'nba'
+            with self.lock:
+                self.odds_quota = max(0, self.odds_quota - 1)
+                headers = {'x-requests-remaining': str(self.odds_quota), 'x-requests-used': str(500 - self.odds_quota),
+                           'x-requests-last': '1'}
+            return 200, headers, self.slates[sport].odds_events()
+
+        return 404, {}, {'error': f'Unknown route: {path}'}
+
+
+def make_handler(upstream: FakeUpstream, verbose: bool):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            status, headers, body = upstream.handle(url.path, parse_qs(url.query))
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            if verbose:
+                super().log_message(format, *args)
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake Gamma / Kalshi / Manifold / Odds API server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--games', type=int, default=15, help='games per sport (spread over days)')
+    parser.add_argument('--extra-events', type=int, default=50, help='non-game Gamma events per sport')
+    parser.add_argument('--latency', type=float, default=50, help='mean response latency (ms)')
+    parser.add_argument('--jitter', type=float, default=20, help='latency standard deviation (ms)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of 500 responses')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='share of 429 responses')
+    parser.add_argument('--move-rate', type=float, default=0.3, help='chance a price moves per listing')
+    parser.add_argument('--kalshi-page-size', type=int, default=10, help='events per Kalshi cursor page')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--verbose', action='store_true', help='log every request')
+    args = parser.parse_args()
+
+    upstream = FakeUpstream(args)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(upstream, args.verbose))
+    print(f"🧪 Fake upstream on http://{args.host}:{args.port} "
+          f"({args.games} games/sport, {args.latency:.0f}±{args.jitter:.0f} ms, "
+          f"{args.error_rate:.0%} errors, {args.throttle_rate:.0%} throttled)")
+    print(f"   export FAKE_UPSTREAM_URL=http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Per-game history with lifecycle management
+History is keyed by a unique game ID (Polymarket slug), so rematches get
+fresh history, and games past their start time plus a grace period are
+evicted (optionally archived to a JSONL file)
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set
+from config import HISTORY
+from structured_log import get_logger
+
+log = get_logger('history')
+
+
+def new_history(maxlen: int) -> Dict:
+    return {
+        'diff_history': deque(maxlen=maxlen),
+        'poly_history': deque(maxlen=maxlen),
+        'kalshi_history': deque(maxlen=maxlen),
+        'timestamps': deque(maxlen=maxlen)
+    }
+
+
+class GameHistoryStore:
+    """
+    Bounded store of recent history per game
+
+    get() returns the same dict shape the old defaultdict produced, so
+    calculate_comparisons keeps appending to deques as before.
+    """
+
+    def __init__(self, name: str, settings: Optional[Dict] = None):
+        settings = settings if settings is not None else HISTORY
+        self.name = name
+        self.maxlen = settings.get('max_points', 60)
+        self.point_interval = settings.get('point_interval', 30)
+        self.grace = timedelta(hours=settings.get('grace_hours', 6))
+        self.idle_seconds = settings.get('idle_hours', 24) * 3600
+        self.archive_dir = settings.get('archive_dir')
+
+        self.lock = threading.Lock()
+        self.games = {}          # game_id -> history dict
+        self.meta = {}           # game_id -> {'expires_at', 'last_update'}
+        self.evicted = 0
+        self.archived = 0
+
+    def get(self, game_id: str, game_time: Optional[datetime] = None) -> Dict:
+        """History of a game, created on first use"""
+        with self.lock:
+            history = self.games.get(game_id)
+            if history is None:
+                history = self.games[game_id] = new_history(self.maxlen)
+                self.meta[game_id] = {'expires_at': None, 'last_update': 0.0}
+            meta = self.meta[game_id]
+            if game_time is not None:
+                meta['expires_at'] = game_time + self.grace
+            meta['last_update'] = time.time()
+            return history
+
+    def point_due(self, history: Dict, now: datetime) -> bool:
+        """
+        True if a new point may be appended at `now`
+
+        Trend, price change and volatility count points, so the history
+        keeps a fixed cadence however often the game is refreshed.
+        """
+        if not history['timestamps']:
+            return True
+        last = datetime.fromisoformat(history['timestamps'][-1])
+        return (now - last).total_seconds() >= self.point_interval
+
+    def peek(self, game_id: str) -> Optional[Dict]:
+        """History of a game without creating or touching it"""
+        with self.lock:
+            return self.games.get(game_id)
+
+    def evict_expired(self, now: Optional[datetime] = None, listed: Optional[Set[str]] = None) -> List[str]:
+        """
+        Drop games past their expiry (start + grace) or idle for too long
+
+        Games in `listed` are still on the platforms' listings (e.g. a
+        delayed game whose market hasn't closed) and are kept; evicting
+        them would only recreate them empty on the next refresh.
+
+        Returns:
+            IDs of the evicted games
+        """
+        now = now or datetime.now(timezone.utc)
+        listed = listed or set()
+        idle_cutoff = time.time() - self.idle_seconds
+
+        with self.lock:
+            expired = [
+                game_id for game_id, meta in self.meta.items()
+                if ((meta['expires_at'] is not None and meta['expires_at'] <= now)
+                    or meta['last_update'] < idle_cutoff)
+                and game_id not in listed
+            ]
+            removed = [(game_id, self.games.pop(game_id), self.meta.pop(game_id)) for game_id in expired]
+            self.evicted += len(removed)
+
+        if removed and self.archive_dir:
+            self._archive(removed)
+
+        return expired
+
+    def _archive(self, removed):
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(self.archive_dir, f"{self.name}_history.jsonl")
+        try:
+            with open(path, 'a', encoding='utf-8') as f:
+                for game_id, history, meta in removed:
+                    f.write(json.dumps({
+                        'game_id': game_id,
+                        'expires_at': meta['expires_at'].isoformat() if meta['expires_at'] else None,
+                        **{key: list(values) for key, values in history.items()}
+                    }) + '\n')
+            self.archived += len(removed)
+        except OSError as e:
+            log.warning('Could not archive %s history: %s', self.name, e)
+
+    def export_state(self) -> Dict:
+        """JSON-serializable copy of all histories (for warm snapshots)"""
+        with self.lock:
+            return {
+                game_id: {
+                    'expires_at': self.meta[game_id]['expires_at'].isoformat() if self.meta[game_id]['expires_at'] else None,
+                    'history': {key: list(values) for key, values in history.items()}
+                }
+                for game_id, history in self.games.items()
+            }
+
+    def load_state(self, state: Dict):
+        """Restore histories from export_state(), existing games are kept"""
+        now = time.time()
+        with self.lock:
+            for game_id, entry in state.items():
+                if game_id in self.games:
+                    continue
+                history = new_history(self.maxlen)
+                for key, values in entry['history'].items():
+                    # JSON turns the (away, home) tuples into lists
+                    history[key].extend(tuple(value) if isinstance(value, list) else value for value in values)
+                self.games[game_id] = history
+                expires_at = entry.get('expires_at')
+                self.meta[game_id] = {
+                    'expires_at': datetime.fromisoformat(expires_at) if expires_at else None,
+                    'last_update': now
+                }
+
+    def __len__(self):
+        return len(self.games)
+
+    def stats(self) -> Dict:
+        """Tracked games, stored points, approximate bytes and eviction counts"""
+        with self.lock:
+            points = 0
+            size = sys.getsizeof(self.games) + sys.getsizeof(self.meta)
+            for history in self.games.values():
+                points += len(history['timestamps'])
+                size += sys.getsizeof(history)
+                for values in history.values():
+                    size += sys.getsizeof(values)
+                    size += sum(sys.getsizeof(value) for value in values)
+            return {
+                'tracked_games': len(self.games),
+                'points': points,
+                'approx_bytes': size,
+                'evicted': self.evicted,
+                'archived': self.archived
+            }
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Game-time index
+Comparisons sorted by their (timezone-aware) start time, so a horizon of
+local days is bucketed in one pass and time ranges are found with bisect
+"""
+
+from bisect import bisect_left
+from datetime import datetime, time, timedelta, tzinfo
+from typing import Dict, List, Optional, Tuple
+from refresh_scheduler import parse_game_time
+
+
+def day_bounds(tz: tzinfo, days: int, now: Optional[datetime] = None) -> List[datetime]:
+    """Local midnights in `tz` from today, `days` + 1 of them (DST-safe)"""
+    today = (now or datetime.now(tz)).astimezone(tz).date()
+    return [datetime.combine(today + timedelta(days=offset), time(), tzinfo=tz) for offset in range(days + 1)]
+
+
+class GameTimeIndex:
+    """
+    Games keyed on start time
+
+    add() only appends; the index is sorted once, on the first query after
+    a change. Games without a start time are kept apart in `undated`.
+    Within a query result games keep the order they were added in (the
+    ranking), not start time.
+    """
+
+    def __init__(self):
+        self.entries = []      # (timestamp, rank, game)
+        self.times = []
+        self.undated = []
+        self.dirty = False
+
+    def add(self, start_time: Optional[datetime], game: Dict):
+        if start_time is None:
+            self.undated.append(game)
+            return
+        self.entries.append((start_time.timestamp(), len(self.entries), game))
+        self.dirty = True
+
+    @classmethod
+    def from_games(cls, games: List[Dict]) -> 'GameTimeIndex':
+        """Rebuild from serialized comparisons (e.g. a warm snapshot), in ranking order"""
+        index = cls()
+        for game in games:
+            index.add(parse_game_time(game.get('start_time') or game.get('game_time', '')), game)
+        return index
+
+    def _sort(self):
+        if self.dirty:
+            self.entries.sort(key=lambda entry: entry[0])
+            self.times = [entry[0] for entry in self.entries]
+            self.dirty = False
+
+    def between(self, start: datetime, end: datetime) -> List[Dict]:
+        """Games starting in [start, end), in ranking order"""
+        self._sort()
+        lo = bisect_left(self.times, start.timestamp())
+        hi = bisect_left(self.times, end.timestamp())
+        return [game for _, _, game in sorted(self.entries[lo:hi], key=lambda entry: entry[1])]
+
+    def bucket_days(self, tz: tzinfo, days: int, now: Optional[datetime] = None) -> List[Tuple[str, List[Dict]]]:
+        """
+        Games per local day, from today in `tz` for `days` days
+
+        Only the slice of the horizon is visited, once.
+
+        Returns:
+            [(date 'YYYY-MM-DD', games in ranking order), ...]
+        """
+        self._sort()
+        midnights = day_bounds(tz, days, now)
+        bounds = [midnight.timestamp() for midnight in midnights]
+
+        buckets = [[] for _ in range(days)]
+        position = bisect_left(self.times, bounds[0])
+        day = 0
+        for timestamp, rank, game in self.entries[position:]:
+            while day < days and timestamp >= bounds[day + 1]:
+                day += 1
+            if day == days:
+                break
+            buckets[day].append((rank, game))
+
+        return [
+            (midnights[offset].date().isoformat(), [game for _, game in sorted(bucket, key=lambda item: item[0])])
+            for offset, bucket in enumerate(buckets)
+        ]
+
+    def __len__(self):
+        return len(self.entries) + len(self.undated)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Multi-resolution OHLC rollups of game history
+Ticks are folded into 1m / 5m / 1h buckets as they arrive, so range
+queries never scan raw ticks
+"""
+
+import bisect
+import math
+import threading
+from array import array
+from typing import Dict, List, Optional
+from config import HISTORY
+
+# Resolution name -> (bucket seconds, max hours kept per game)
+# Games are evicted `rollup_retention_hours` after their last tick, so no
+# resolution keeps more than that
+RESOLUTIONS = {
+    '1m': (60, 48),
+    '5m': (300, 24 * 14),
+    '1h': (3600, 24 * 90),
+}
+
+# Series tracked per game
+SERIES = ('poly_away', 'poly_home', 'kalshi_away', 'kalshi_home', 'diff')
+
+# Doubles per bucket: tick count, then open/high/low/close of every series
+STRIDE = 1 + 4 * len(SERIES)
+
+
+class RollupSeries:
+    """
+    Fixed-resolution buckets for one game
+
+    Buckets are stored flat in one array of doubles (STRIDE per bucket,
+    NaN for a series without ticks yet); bucket start times are kept in a
+    parallel sorted array so ranges are found with bisect.
+    """
+
+    def __init__(self, seconds: int, max_buckets: int):
+        self.seconds = seconds
+        self.max_buckets = max_buckets
+        self.starts = array('q')
+        self.values = array('d')
+
+    def add(self, timestamp: float, values: Dict[str, float]):
+        start = int(timestamp // self.seconds) * self.seconds
+        if self.starts and self.starts[-1] == start:
+            base = len(self.values) - STRIDE
+            self.values[base] += 1
+            for i, name in enumerate(SERIES):
+                value = values.get(name)
+                if value is None:
+                    continue
+                at = base + 1 + 4 * i
+                if math.isnan(self.values[at]):
+                    self.values[at:at + 4] = array('d', (value, value, value, value))
+                else:
+                    self.values[at + 1] = max(self.values[at + 1], value)
+                    self.values[at + 2] = min(self.values[at + 2], value)
+                    self.values[at + 3] = value
+            return
+
+        # Out-of-order ticks older than the last bucket are dropped
+        if self.starts and start < self.starts[-1]:
+            return
+
+        if len(self.starts) >= self.max_buckets:
+            del self.starts[0]
+            del self.values[:STRIDE]
+        self.starts.append(start)
+        self.values.append(1)
+        for name in SERIES:
+            value = values.get(name)
+            self.values.extend((value,) * 4 if value is not None else (math.nan,) * 4)
+
+    def query(self, start: Optional[float], end: Optional[float]) -> List[Dict]:
+        starts = self.starts
+        # Include the bucket that contains `start`
+        lo = bisect.bisect_left(starts, start // self.seconds * self.seconds) if start is not None else 0
+        hi = bisect.bisect_right(starts, end) if end is not None else len(starts)
+
+        rows = []
+        for i in range(lo, hi):
+            base = i * STRIDE
+            row = {'t': starts[i], 'count': int(self.values[base])}
+            for j, name in enumerate(SERIES):
+                o, h, l, c = self.values[base + 1 + 4 * j:base + 5 + 4 * j]
+                if not math.isnan(o):
+                    row[name] = {'o': o, 'h': h, 'l': l, 'c': c}
+            rows.append(row)
+        return rows
+
+
+class HistoryRollups:
+    """Rollups of every game of one sport, at every resolution"""
+
+    def __init__(self, retention_hours: float = None):
+        if retention_hours is None:
+            retention_hours = HISTORY.get('rollup_retention_hours', 72)
+        self.max_buckets = {
+            name: max(1, int(min(hours, retention_hours) * 3600 // seconds))
+            for name, (seconds, hours) in RESOLUTIONS.items()
+        }
+        self.lock = threading.Lock()
+        self.games = {}       # game -> {resolution: RollupSeries}
+        self.last_tick = {}   # game -> epoch seconds of the latest tick
+
+    def add_tick(self, game: str, timestamp: float, values: Dict[str, float]):
+        """Fold one tick (epoch seconds, series values) into all resolutions"""
+        with self.lock:
+            series = self.games.get(game)
+            if series is None:
+                series = self.games[game] = {
+                    name: RollupSeries(seconds, self.max_buckets[name])
+                    for name, (seconds, _) in RESOLUTIONS.items()
+                }
+            for rollup in series.values():
+                rollup.add(timestamp, values)
+            self.last_tick[game] = max(timestamp, self.last_tick.get(game, 0))
+
+    def query(self, game: str, resolution: str, start: Optional[float] = None,
+              end: Optional[float] = None) -> Optional[List[Dict]]:
+        """Buckets of a game between start and end (epoch seconds), None if unknown"""
+        with self.lock:
+            series = self.games.get(game)
+            if series is None:
+                return None
+            return series[resolution].query(start, end)
+
+    def remove(self, game: str):
+        with self.lock:
+            self.games.pop(game, None)
+            self.last_tick.pop(game, None)
+
+    def evict_before(self, cutoff: float) -> List[str]:
+        """Drop games whose latest tick is older than `cutoff` (epoch seconds)"""
+        with self.lock:
+            stale = [game for game, last in self.last_tick.items() if last < cutoff]
+            for game in stale:
+                self.games.pop(game, None)
+                self.last_tick.pop(game, None)
+            return stale
+
+    def list_games(self) -> List[str]:
+        with self.lock:
+            return sorted(self.games)
@@ -1,14 +1,77 @@
 import requests
-from typing import List, Dict
+from upstream_session import UpstreamSession
+from typing import Dict, Iterable, Iterator, List, Optional
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from team_mapping import normalize_team_name
+from config import UPSTREAM_URLS
+from structured_log import get_logger, skips
+
+log = get_logger('kalshi')
+
+
+def series_params(series_ticker: str, page_size: int = 200, cursor: Optional[str] = None) -> Dict:
+    """/events query of one page of a series' open events, markets nested"""
+    params = {
+        'series_ticker': series_ticker,
+        'status': 'open',
+        'with_nested_markets': 'true',
+        'limit': page_size
+    }
+    if cursor:
+        params['cursor'] = cursor
+    return params
+
+
+def ticker_params(tickers: List[str]) -> Dict:
+    """/markets query of specific markets"""
+    return {
+        'tickers': ','.join(tickers),
+        'limit': len(tickers)
+    }
+
+
+def iter_series_events(session, base_url: str, series_ticker: str,
+                       page_size: int = 200, max_pages: int = 50) -> Iterator[Dict]:
+    """
+    Yield every open event of a series with its markets nested
+
+    Follows the response cursor until the listing is exhausted. Cursors are
+    sequential, so pages can't be requested in parallel; instead the next
+    page is already in flight while the caller parses the current one.
+
+    Raises:
+        requests.RequestException on any failed page (no partial slates)
+    """
+    url = f"{base_url}/events"
+
+    def fetch_page(cursor):
+        response = session.get(url, params=series_params(series_ticker, page_size, cursor), timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = executor.submit(fetch_page, None)
+        for _ in range(max_pages):
+            data = pending.result()
+            events = data.get('events', [])
+            cursor = data.get('cursor')
+            pending = executor.submit(fetch_page, cursor) if cursor and events else None
+
+            yield from events
+
+            if pending is None:
+                return
+
+        log.warning('Kalshi %s listing exceeded %d pages, truncated', series_ticker, max_pages)
 
 class KalshiAPI:
-    BASE_URL = "https://api.elections.kalshi.com/trade-api/v2"
+    BASE_URL = UPSTREAM_URLS['kalshi']
     NBA_SERIES = "KXNBAGAME"
+    SOURCE = 'kalshi'   # skip counter key
 
     def __init__(self):
-        self.session = requests.Session()
+        self.session = UpstreamSession('kalshi')
 
     def get_nba_games(self) -> List[Dict]:
         """
@@ -17,103 +80,140 @@ class KalshiAPI:
         Returns:
             List of game dictionaries with standardized format
         """
-        url = f"{self.BASE_URL}/markets"
-        params = {
-            'series_ticker': self.NBA_SERIES,
-            'status': 'open',
-            'limit': 100
-        }
+        try:
+            return self.parse_events(iter_series_events(self.session, self.BASE_URL, self.NBA_SERIES))
+
+        except requests.RequestException as e:
+            log.error('Error fetching Kalshi data: %s', e)
+            return []
+
+    def parse_events(self, events: Iterable[Dict]) -> List[Dict]:
+        """Games of /events results with nested markets"""
+        games = []
+        for event in events:
+            game = self._parse_event(event.get('event_ticker', ''), event.get('markets', []))
+            if game:
+                games.append(game)
+        return games
+
+    def get_games_by_tickers(self, tickers: List[str]) -> List[Dict]:
+        """
+        Refresh specific NBA games by market ticker
+
+        Pass both team markets of a game (see 'market_tickers' on each game),
+        a game missing one side is dropped like in get_nba_games.
+
+        Returns:
+            List of game dictionaries with standardized format
+        """
+        tickers = [ticker for ticker in tickers if ticker]
+        if not tickers:
+            return []
 
         try:
-            response = self.session.get(url, params=params, timeout=10)
+            response = self.session.get(f"{self.BASE_URL}/markets", params=ticker_params(tickers), timeout=10)
             response.raise_for_status()
             data = response.json()
-            markets = data.get('markets', [])
+            return self._group_markets(data.get('markets', []))
 
-            # Group markets by game (each game has 2 markets, one for each team)
-            games_dict = defaultdict(dict)
+        except requests.RequestException as e:
+            log.error('Error fetching Kalshi markets: %s', e)
+            return []
 
-            for market in markets:
-                title = market.get('title', '')
+    def _group_markets(self, markets: List[Dict]) -> List[Dict]:
+        """Group flat /markets results into games by event ticker"""
+        markets_by_event = defaultdict(list)
+        for market in markets:
+            markets_by_event[market.get('event_ticker', '')].append(market)
 
-                # Filter for Winner markets only
-                if 'Winner?' not in title:
-                    continue
+        games = []
+        for event_ticker, event_markets in markets_by_event.items():
+            game = self._parse_event(event_ticker, event_markets)
+            if game:
+                games.append(game)
+        return games
 
-                # Extract game identifier from ticker
-                ticker = market.get('ticker', '')
-                # Ticker format: KXNBAGAME-25NOV16BKNWAS-BKN
-                parts = ticker.split('-')
-                if len(parts) < 3:
-                    continue
+    def _parse_event(self, event_ticker: str, markets: List[Dict]) -> Optional[Dict]:
+        """
+        Build one game from the per-team Winner markets of an event
 
-                game_id = parts[1]  # e.g., "25NOV16BKNWAS"
-                team_code = parts[2]  # e.g., "BKN" or "WAS"
+        Returns:
+            Game dictionary, or None if a side is missing
+        """
+        game_data = None
+
+        for market in markets:
+            title = market.get('title', '')
+
+            # Filter for Winner markets only
+            if 'Winner?' not in title:
+                continue
+
+            # Ticker format: KXNBAGAME-25NOV16BKNWAS-BKN
+            ticker = market.get('ticker', '')
+            team_code = ticker.rsplit('-', 1)[-1]
 
-                # Extract team names from title
+            if game_data is None:
                 # Format: "Brooklyn vs Washington Winner?"
-                title_clean = title.replace(' Winner?', '')
-                teams = title_clean.split(' vs ')
+                teams = title.replace(' Winner?', '').split(' vs ')
                 if len(teams) != 2:
-                    continue
+                    skips.skip(self.SOURCE, 'bad_title')
+                    return None
 
                 away_team = teams[0].strip()
                 home_team = teams[1].strip()
-
-                # Get team codes
                 away_code = normalize_team_name(away_team, 'kalshi')
                 home_code = normalize_team_name(home_team, 'kalshi')
 
                 if not away_code or not home_code:
-                    print(f"Warning: Could not normalize Kalshi teams: {away_team} vs {home_team}")
-                    continue
-
-                # Get probability directly from last_price (already in percentage)
-                last_price = market.get('last_price', 0)
-                probability = last_price  # last_price is already the correct percentage
-
-                # Store in games_dict
-                if game_id not in games_dict:
-                    games_dict[game_id] = {
-                        'platform': 'Kalshi',
-                        'away_team': away_team,
-                        'home_team': home_team,
-                        'away_code': away_code,
-                        'home_code': home_code,
-                        'close_time': market.get('close_time', ''),
-                        'ticker': ticker,
-                    }
-
-                # Add probability for this team
-                if team_code == away_code:
-                    games_dict[game_id]['away_prob'] = probability
-                elif team_code == home_code:
-                    games_dict[game_id]['home_prob'] = probability
-
-            # Convert to list and filter complete games (with both probabilities)
-            games = []
-            for game_id, game_data in games_dict.items():
-                if 'away_prob' in game_data and 'home_prob' in game_data:
-                    # last_price is already in percentage format, use directly
-                    away_prob = game_data['away_prob']
-                    home_prob = game_data['home_prob']
-
-                    # Update game data with the direct values
-                    game_data['away_prob'] = away_prob
-                    game_data['home_prob'] = home_prob
-
-                    # Add Kalshi market URL
-                    ticker = game_data.get('ticker', '')
-                    if ticker:
-                        game_data['url'] = f'https://kalshi.com/markets/{ticker}'
-
-                    games.append(game_data)
-
-            return games
-
-        except requests.RequestException as e:
-            print(f"Error fetching Kalshi data: {e}")
-            return []
+                    skips.skip(self.SOURCE, 'unmapped_team')
+                    log.warning('Could not normalize Kalshi teams: %s vs %s', away_team, home_team)
+                    return None
+
+                game_data = {
+                    'platform': 'Kalshi',
+                    'away_team': away_team,
+                    'home_team': home_team,
+                    'away_code': away_code,
+                    'home_code': home_code,
+                    'close_time': market.get('close_time', ''),
+                    'ticker': ticker,
+                    'event_ticker': event_ticker or market.get('event_ticker', ''),
+                    'market_tickers': [],
+                }
+
+            game_data['market_tickers'].append(ticker)
+
+            # last_price is already the correct percentage
+            last_price = market.get('last_price', 0)
+
+            # Raw orderbook data, kept next to the display probability
+            orderbook = {
+                'yes_bid': market.get('yes_bid', 0),
+                'yes_ask': market.get('yes_ask', 0),
+                'last_price': last_price,
+                'volume': market.get('volume', 0)
+            }
+
+            if team_code == game_data['away_code']:
+                game_data['away_prob'] = last_price
+                game_data['away_orderbook'] = orderbook
+            elif team_code == game_data['home_code']:
+                game_data['home_prob'] = last_price
+                game_data['home_orderbook'] = orderbook
+
+        # Only complete games (with both probabilities)
+        if game_data is None or 'away_prob' not in game_data or 'home_prob' not in game_data:
+            skips.skip(self.SOURCE, 'incomplete')
+            return None
+
+        game_data['url'] = f"https://kalshi.com/markets/{game_data['ticker']}"
+
+        # Orderbook summary: cost of buying / selling both sides, spread over 100¢
+        game_data['total_ask'] = game_data['away_orderbook']['yes_ask'] + game_data['home_orderbook']['yes_ask']
+        game_data['total_bid'] = game_data['away_orderbook']['yes_bid'] + game_data['home_orderbook']['yes_bid']
+        game_data['spread'] = game_data['total_ask'] - 100
+        return game_data
 
     def get_today_games(self) -> List[Dict]:
         """Get today's NBA games (Kalshi API doesn't have easy date filtering, returns all open)"""
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Concurrent load driver for the PolyMix API
+Runs a weighted mix of client requests from many threads for a fixed time
+and reports throughput and latency percentiles per endpoint. Point the app
+at fake_upstream.py to measure it without touching real services.
+
+Usage:
+    python load_test.py --url http://127.0.0.1:5000 --concurrency 32 --duration 30
+    python load_test.py --mix "/api/odds/nba=1,/api/arbitrage?sport=nba=1"
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+import requests
+
+# Realistic client mix: mostly dashboards polling the trimmed leaderboard
+DEFAULT_MIX = [
+    ('/api/odds/nba?history=none', 50),
+    ('/api/odds/nba', 15),
+    ('/api/odds/nba?fields=game_id,diff,arbitrage_score&history=none', 10),
+    ('/api/odds/nfl?history=none', 10),
+    ('/api/changes/nba?since=0', 10),
+    ('/api/arbitrage?sport=nba&min_profit=0.5', 5),
+]
+
+
+def parse_mix(value: str) -> List[Tuple[str, float]]:
+    """'path=weight,path=weight' (the last '=' splits, so query strings work)"""
+    mix = []
+    for item in value.split(','):
+        path, _, weight = item.strip().rpartition('=')
+        mix.append((path, float(weight)))
+    return mix
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, math.ceil(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+class LoadDriver:
+    """Worker threads sharing a deadline, each with its own pooled session"""
+
+    def __init__(self, base_url: str, mix: List[Tuple[str, float]], concurrency: int, timeout: float):
+        self.base_url = base_url.rstrip('/')
+        self.paths = [path for path, _ in mix]
+        self.weights = [weight for _, weight in mix]
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)    # path -> [(latency, status, bytes)]
+
+    def _worker(self, seed: int, deadline: float, record_after: float):
+        rng = random.Random(seed)
+        session = requests.Session()
+        local = defaultdict(list)
+        while True:
+            started = time.perf_counter()
+            if started >= deadline:
+                break
+            path = rng.choices(self.paths, self.weights)[0]
+            try:
+                response = session.get(self.base_url + path, timeout=self.timeout)
+                status, size = response.status_code, len(response.content)
+            except requests.RequestException:
+                status, size = 0, 0
+            finished = time.perf_counter()
+            if started >= record_after:
+                local[path].append((finished - started, status, size))
+
+        with self.lock:
+            for path, samples in local.items():
+                self.samples[path].extend(samples)
+
+    def run(self, duration: float, warmup: float) -> float:
+        """Run the mix, returns the measured duration (warmup excluded)"""
+        start = time.perf_counter()
+        record_after = start + warmup
+        deadline = record_after + duration
+        threads = [
+            threading.Thread(target=self._worker, args=(seed, deadline, record_after), daemon=True)
+            for seed in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - record_after
+
+    def report(self, elapsed: float) -> Dict:
+        rows = []
+        total = errors = 0
+        for path in self.paths:
+            samples = self.samples.get(path, [])
+            latencies = sorted(sample[0] * 1000 for sample in samples)
+            failed = sum(1 for sample in samples if not 200 <= sample[1] < 400)
+            total += len(samples)
+            errors += failed
+            rows.append({
+                'path': path,
+                'requests': len(samples),
+                'errors': failed,
+                'rps': round(len(samples) / elapsed, 1) if elapsed else 0.0,
+                'p50_ms': round(percentile(latencies, 50), 1),
+                'p90_ms': round(percentile(latencies, 90), 1),
+                'p99_ms': round(percentile(latencies, 99), 1),
+                'max_ms': round(latencies[-1], 1) if latencies else 0.0,
+                'avg_kb': round(sum(sample[2] for sample in samples) / len(samples) / 1024, 1) if samples else 0.0,
+            })
+        all_latencies = sorted(sample[0] * 1000 for samples in self.samples.values() for sample in samples)
+        return {
+            'url': self.base_url,
+            'concurrency': self.concurrency,
+            'duration': round(elapsed, 1),
+            'requests': total,
+            'errors': errors,
+            'rps': round(total / elapsed, 1) if elapsed else 0.0,
+            'p50_ms': round(percentile(all_latencies, 50), 1),
+            'p99_ms': round(percentile(all_latencies, 99), 1),
+            'endpoints': rows
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the PolyMix API')
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='API base URL')
+    parser.add_argument('--concurrency', type=int, default=16, help='concurrent clients')
+    parser.add_argument('--duration', type=float, default=30, help='measured seconds')
+    parser.add_argument('--warmup', type=float, default=3, help='unmeasured seconds first')
+    parser.add_argument('--timeout', type=float, default=30, help='per-request timeout (s)')
+    parser.add_argument('--mix', help='weighted paths, e.g. "/api/odds/nba=3,/api/arbitrage=1"')
+    parser.add_argument('--json', help='write the report to this file')
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+    driver = LoadDriver(args.url, mix, args.concurrency, args.timeout)
+
+    print(f"🚀 {args.concurrency} clients × {args.duration:.0f}s against {args.url} (+{args.warmup:.0f}s warmup)")
+    elapsed = driver.run(args.duration, args.warmup)
+    report = driver.report(elapsed)
+
+    print(f"\n✅ {report['requests']} requests, {report['errors']} errors, {report['rps']} req/s, "
+          f"p50 {report['p50_ms']} ms, p99 {report['p99_ms']} ms\n")
+    print(f"{'endpoint':<62} {'req':>6} {'err':>5} {'rps':>7} {'p50':>7} {'p90':>7} {'p99':>7} {'max':>7} {'KB':>6}")
+    print("-" * 122)
+    for row in report['endpoints']:
+        print(f"{row['path'][:62]:<62} {row['requests']:>6} {row['errors']:>5} {row['rps']:>7} "
+              f"{row['p50_ms']:>7} {row['p90_ms']:>7} {row['p99_ms']:>7} {row['max_ms']:>7} {row['avg_kb']:>6}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📄 Report written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
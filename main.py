@@ -9,6 +9,10 @@ from kalshi_api import KalshiAPI
 from team_mapping import NBA_TEAMS
 from typing import List, Dict, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import sys
+import time
 
 
 def match_games(polymarket_games: List[Dict], kalshi_games: List[Dict]) -> List[Tuple[Dict, Dict]]:
@@ -120,8 +124,110 @@ def print_results(comparisons: List[Dict]):
     print("="*100 + "\n")
 
 
+def fetch_both(executor: ThreadPoolExecutor, poly_api: PolymarketAPI,
+               kalshi_api: KalshiAPI) -> Tuple[List[Dict], List[Dict], Dict[str, float]]:
+    """
+    Fetch both platforms concurrently
+
+    Returns:
+        (polymarket_games, kalshi_games, fetch latency in seconds per platform)
+    """
+    def timed(fetch):
+        started = time.perf_counter()
+        games = fetch()
+        return games, time.perf_counter() - started
+
+    poly_future = executor.submit(timed, poly_api.get_today_games)
+    kalshi_future = executor.submit(timed, kalshi_api.get_today_games)
+    poly_games, poly_latency = poly_future.result()
+    kalshi_games, kalshi_latency = kalshi_future.result()
+
+    return poly_games, kalshi_games, {'polymarket': poly_latency, 'kalshi': kalshi_latency}
+
+
+def format_row(comp: Dict) -> str:
+    """One terminal line per game for watch mode"""
+    flag = '⚠️' if comp['max_diff'] > 5 else '  '
+    return (f"{flag} {comp['away_code']:>3} @ {comp['home_code']:<3} | "
+            f"Polymarket {comp['polymarket_away']:5.1f}% / {comp['polymarket_home']:5.1f}%  | "
+            f"Kalshi {comp['kalshi_away']:5.1f}% / {comp['kalshi_home']:5.1f}%  | "
+            f"Diff {comp['max_diff']:5.1f}%")
+
+
+class WatchScreen:
+    """
+    Incremental terminal redraw
+
+    Keeps the lines currently on screen and only rewrites the ones that
+    changed (ANSI cursor addressing). A full redraw happens only when the
+    number of lines changes, i.e. games were added or removed.
+    """
+
+    def __init__(self, out=sys.stdout):
+        self.out = out
+        self.lines = []
+
+    def render(self, lines: List[str]) -> int:
+        """Draw `lines`, returns how many lines were rewritten"""
+        if len(lines) != len(self.lines):
+            self.out.write('\033[2J\033[H' + '\n'.join(lines) + '\n')
+            changed = len(lines)
+        else:
+            changed = 0
+            for row, (old, new) in enumerate(zip(self.lines, lines), 1):
+                if old != new:
+                    self.out.write(f'\033[{row};1H\033[2K{new}')
+                    changed += 1
+            self.out.write(f'\033[{len(lines) + 1};1H')
+        self.out.flush()
+        self.lines = lines
+        return changed
+
+
+def watch(interval: float):
+    """Refresh both platforms every `interval` seconds and redraw changed rows"""
+    # Adapters (and their pooled HTTP sessions) live for the whole watch
+    poly_api = PolymarketAPI()
+    kalshi_api = KalshiAPI()
+    screen = WatchScreen()
+    rows = {}
+    changed_rows = 0
+
+    sys.stdout.write('\033[?25l')  # hide cursor
+    try:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            while True:
+                started = time.monotonic()
+                poly_games, kalshi_games, latency = fetch_both(executor, poly_api, kalshi_api)
+                comparisons = calculate_diff(match_games(poly_games, kalshi_games))
+
+                # Stable row order (by matchup) so a price move rewrites one line only
+                rows = {f"{comp['away_code']}@{comp['home_code']}": format_row(comp) for comp in comparisons}
+                header = (f"🏀 PolyMix watch | {datetime.now().strftime('%H:%M:%S')} | "
+                          f"Polymarket {latency['polymarket'] * 1000:4.0f} ms | "
+                          f"Kalshi {latency['kalshi'] * 1000:4.0f} ms | "
+                          f"every {interval:g}s | rows redrawn {changed_rows}")
+                body = [rows[key] for key in sorted(rows)] or ['❌ No matching games found between platforms']
+                changed_rows = screen.render([header, '-' * 100] + body) - 1
+
+                time.sleep(max(0.0, interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sys.stdout.write('\033[?25h\n')  # show cursor
+        sys.stdout.flush()
+
+
 def main():
     """Main program"""
+    parser = argparse.ArgumentParser(description='Compare NBA odds between Polymarket and Kalshi')
+    parser.add_argument('--watch', action='store_true', help='keep refreshing and redraw changed rows')
+    parser.add_argument('--interval', type=float, default=5, help='watch refresh interval in seconds (default: 5)')
+    args = parser.parse_args()
+
+    if args.watch:
+        watch(args.interval)
+        return
 
     print("🏀 PolyMix - NBA Odds Comparison Tool")
     print("Fetching data from Polymarket and Kalshi...\n")
@@ -9,12 +9,18 @@ import requests
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from team_mapping import normalize_team_name
+from upstream_session import UpstreamSession
+from config import UPSTREAM_URLS
+from structured_log import get_logger, skips
+
+log = get_logger('manifold')
 
 class ManifoldAPI:
-    BASE_URL = "https://api.manifold.markets/v0"
+    BASE_URL = UPSTREAM_URLS['manifold']
+    SOURCE = 'manifold'   # skip counter key
 
     def __init__(self):
-        self.session = requests.Session()
+        self.session = UpstreamSession('manifold')
 
     def get_nba_games(self) -> List[Dict]:
         """
@@ -56,7 +62,7 @@ class ManifoldAPI:
                         games.append(game)
 
             except requests.RequestException as e:
-                print(f"Error fetching Manifold data for '{term}': {e}")
+                log.error("Error fetching Manifold data for '%s': %s", term, e)
                 continue
 
         return games
@@ -71,6 +77,7 @@ class ManifoldAPI:
                 return None
 
             if ' vs ' not in question and ' @ ' not in question:
+                skips.skip(self.SOURCE, 'not_a_game')
                 return None
 
             # Parse team names
@@ -80,6 +87,7 @@ class ManifoldAPI:
                 parts = question.split(' @ ')
 
             if len(parts) != 2:
+                skips.skip(self.SOURCE, 'bad_title')
                 return None
 
             away_team = parts[0].strip()
@@ -90,6 +98,7 @@ class ManifoldAPI:
             home_code = normalize_team_name(home_team, 'manifold')
 
             if not away_code or not home_code:
+                skips.skip(self.SOURCE, 'unmapped_team')
                 return None
 
             # Get probability
@@ -115,7 +124,8 @@ class ManifoldAPI:
             }
 
         except Exception as e:
-            print(f"Error parsing Manifold market: {e}")
+            skips.skip(self.SOURCE, 'parse_error')
+            log.warning('Error parsing Manifold market: %s', e)
             return None
 
 
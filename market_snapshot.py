@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Shared market snapshot
+One canonical listing per (sport, platform), fetched once and cached for
+every consumer: the dashboard API and ArbitrageDetector read the same
+games, which carry raw prices / orderbooks next to display probabilities
+"""
+
+import importlib
+import itertools
+import time
+from datetime import datetime, timedelta
+from quota_governor import governor
+from circuit_breaker import get_breaker
+from config import HORIZON
+from structured_log import get_logger, skips
+
+log = get_logger('snapshot')
+
+# Platform adapters and team tables per sport, imported on first use so a
+# cold (serverless) start only loads what the requested sport needs
+SPORT_MODULES = {
+    'nba': {
+        'polymarket': ('polymarket_api', 'PolymarketAPI'),
+        'kalshi': ('kalshi_api', 'KalshiAPI'),
+        'odds_api': ('odds_api_aggregator', 'OddsAPIAggregator'),
+        'manifold': ('manifold_api', 'ManifoldAPI'),
+        'logos': ('team_mapping', 'TEAM_LOGOS'),
+        'teams': ('team_mapping', 'NBA_TEAMS')
+    },
+    'nfl': {
+        'polymarket': ('nfl_polymarket_api', 'NFLPolymarketAPI'),
+        'kalshi': ('nfl_kalshi_api', 'NFLKalshiAPI'),
+        'logos': ('nfl_team_mapping', 'NFL_TEAM_LOGOS'),
+        'teams': ('nfl_team_mapping', 'NFL_TEAMS')
+    }
+}
+
+def load_sport(sport, name):
+    """Adapter class or team table of a sport, imported lazily"""
+    module_name, attr = SPORT_MODULES[sport][name]
+    return getattr(importlib.import_module(module_name), attr)
+
+# Last successful result per (sport, platform)
+# Reused until the governor allows the next refresh of that source, and
+# served as last-known-good (flagged stale) when a platform fails
+source_cache = {}
+
+# Every change to a listing gets a new version, so derived views (e.g. the
+# arbitrage endpoint) can be memoized per snapshot
+_versions = itertools.count(1)
+
+def set_source_data(entry, games):
+    """Replace an entry's games and give it a new version"""
+    entry['data'] = games
+    entry['version'] = next(_versions)
+
+def cached_source(sport, platform):
+    """
+    Cached games of a source while it doesn't need a refresh (governor
+    interval not elapsed, or over budget), None when it's due
+    """
+    entry = source_cache.get((sport, platform))
+    if entry and entry['timestamp'] is not None:
+        age = time.time() - entry['timestamp']
+        if age < governor.refresh_interval(platform) or governor.is_exhausted(platform):
+            return entry['data']
+    return None
+
+def store_source(sport, platform, games, error, source=None):
+    """
+    Record the result of a source refresh
+
+    Args:
+        games: games the adapter returned
+        error: the session's last_error (None when the fetch succeeded)
+        source: adapter SOURCE its skip counts are kept under
+
+    Returns:
+        The games to serve: the new ones, or the last known good ones
+        (flagged stale) when the refresh failed. A source that never
+        loaded gets an empty, stale entry without a timestamp, so the
+        failure shows in source_status and the next request retries.
+    """
+    key = (sport, platform)
+    entry = source_cache.get(key)
+    skipped = skips.flush(source or platform)
+
+    # Upstream failed, breaker open or over budget: keep the last known good games
+    if error is not None and entry:
+        log.warning('%s unavailable (%s), serving cached data', platform, error,
+                    extra={'fields': {'sport': sport, 'platform': platform}})
+        entry['stale'] = True
+        entry['error'] = str(error)
+        return entry['data']
+
+    if error is not None:
+        log.warning('%s unavailable (%s), no cached data', platform, error,
+                    extra={'fields': {'sport': sport, 'platform': platform}})
+        source_cache[key] = {'data': [], 'timestamp': None, 'stale': True, 'error': str(error),
+                             'version': next(_versions), 'skipped': skipped}
+        return []
+
+    source_cache[key] = {'data': games, 'timestamp': time.time(), 'stale': False, 'error': None,
+                         'version': next(_versions), 'skipped': skipped}
+    return games
+
+def fetch_source(sport, platform, adapter, fetch):
+    """
+    Fetch one platform's games through its source cache
+
+    Args:
+        sport: 'nba' or 'nfl'
+        platform: governor platform name ('polymarket', 'kalshi', ...)
+        adapter: platform adapter instance (exposes an UpstreamSession)
+        fetch: callable taking the adapter and returning the list of games
+
+    Returns:
+        List of games, possibly the cached ones
+    """
+    cached = cached_source(sport, platform)
+    if cached is not None:
+        return cached
+
+    games = fetch(adapter)
+    return store_source(sport, platform, games, adapter.session.last_error, getattr(adapter, 'SOURCE', platform))
+
+def source_status(sport):
+    """Freshness of each platform's games for a sport"""
+    now = time.time()
+    status = {}
+    for (entry_sport, platform), entry in source_cache.items():
+        if entry_sport != sport:
+            continue
+        status[platform] = {
+            'stale': entry.get('stale', False),
+            'age': round(now - entry['timestamp'], 1) if entry['timestamp'] is not None else None,
+            'error': entry.get('error'),
+            'skipped': entry.get('skipped', {}),
+            'breaker': get_breaker(platform).status()['state']
+        }
+    return status
+
+def sources_loaded(sport):
+    """False while any of a sport's sources has never loaded (see store_source)"""
+    return all(entry['timestamp'] is not None
+               for (entry_sport, _), entry in source_cache.items() if entry_sport == sport)
+
+def upcoming_dates(days=2):
+    """Local date strings ('YYYY-MM-DD') from today, `days` in total"""
+    today = datetime.now()
+    return [(today + timedelta(days=offset)).strftime('%Y-%m-%d') for offset in range(days)]
+
+# Canonical fetch of each listing, so whichever consumer refreshes a source
+# caches the same games for all of them
+LISTINGS = {
+    ('nba', 'polymarket'): lambda api: api.get_games_for_dates(upcoming_dates(HORIZON['max_days'])),
+    ('nba', 'kalshi'): lambda api: api.get_nba_games(),
+    ('nba', 'odds_api'): lambda api: api.get_nba_games(),
+    ('nba', 'manifold'): lambda api: api.get_nba_games(),
+    ('nfl', 'polymarket'): lambda api: api.get_nfl_games(),
+    ('nfl', 'kalshi'): lambda api: api.get_nfl_games(),
+}
+
+def get_listing(sport, platform):
+    """Games of one platform for a sport, through the shared source cache"""
+    return fetch_source(sport, platform, load_sport(sport, platform)(), LISTINGS[(sport, platform)])
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Memory accounting for the long-lived structures of the API process
+Deep sizes of caches and history stores, process RSS, and tracemalloc top
+allocation sites with labeled snapshots that can be diffed later, so
+growth can be tracked down in a running process
+"""
+
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+from types import BuiltinFunctionType, CodeType, FrameType, FunctionType, MethodType, ModuleType
+from typing import Dict, List, Optional, Tuple
+from config import MEMORY
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Shared, immortal or unbounded objects that are never part of a structure
+SKIP_TYPES = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType, CodeType, FrameType)
+
+
+def deep_size(obj) -> Tuple[int, int]:
+    """
+    Bytes and number of objects reachable from `obj`
+
+    Follows containers, instance __dict__ and __slots__, counting every
+    object once. Classes, modules and functions are not followed. The
+    walk is iterative, so deeply nested structures can't overflow the stack.
+    """
+    seen = set()
+    size = count = 0
+    pending = [obj]
+    while pending:
+        item = pending.pop()
+        if id(item) in seen or isinstance(item, SKIP_TYPES):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        count += 1
+
+        if isinstance(item, (str, bytes, int, float, bool)) or item is None:
+            continue
+        if isinstance(item, dict):
+            for key, value in list(item.items()):
+                pending.append(key)
+                pending.append(value)
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            pending.extend(list(item))
+        else:
+            attributes = getattr(item, '__dict__', None)
+            if attributes is not None:
+                pending.append(attributes)
+            for slot in getattr(type(item), '__slots__', ()):
+                if hasattr(item, slot):
+                    pending.append(getattr(item, slot))
+    return size, count
+
+
+def process_memory() -> Dict:
+    """Current resident set size and the peak (bytes), where the platform reports them"""
+    memory = {'rss': None, 'peak_rss': None, 'gc_objects': len(gc.get_objects())}
+    try:
+        with open('/proc/self/statm') as f:
+            memory['rss'] = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        memory['peak_rss'] = peak if sys.platform == 'darwin' else peak * 1024
+    return memory
+
+
+def _site(trace_or_stat) -> str:
+    frame = trace_or_stat.traceback[0]
+    return f'{frame.filename}:{frame.lineno}'
+
+
+class MemoryTracker:
+    """
+    tracemalloc control with named snapshots
+
+    Tracing slows allocations down and costs memory of its own, so it is
+    off unless enabled in MEMORY or started from the admin endpoint.
+    Only the last `max_snapshots` snapshots are kept.
+    """
+
+    def __init__(self, settings: Optional[Dict] = None):
+        settings = settings if settings is not None else MEMORY
+        self.frames = settings.get('frames', 1)
+        self.max_snapshots = settings.get('max_snapshots', 5)
+        self.snapshots = OrderedDict()    # label -> (epoch seconds, tracemalloc.Snapshot)
+        self.lock = threading.Lock()
+        if settings.get('tracemalloc', False):
+            self.start()
+
+    @staticmethod
+    def _filtered(snapshot: tracemalloc.Snapshot) -> tracemalloc.Snapshot:
+        return snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        ])
+
+    def start(self, frames: Optional[int] = None):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames or self.frames)
+
+    def stop(self):
+        """Stop tracing, which also invalidates the stored snapshots"""
+        with self.lock:
+            self.snapshots.clear()
+        tracemalloc.stop()
+
+    def take(self, label: Optional[str] = None) -> str:
+        """
+        Store a snapshot under `label` (default: its time)
+
+        Raises:
+            RuntimeError if tracemalloc isn't tracing
+        """
+        if not tracemalloc.is_tracing():
+            raise RuntimeError('tracemalloc is not tracing, start it first')
+        snapshot = self._filtered(tracemalloc.take_snapshot())
+        now = time.time()
+        label = label or time.strftime('%H:%M:%S', time.localtime(now))
+        with self.lock:
+            self.snapshots.pop(label, None)
+            self.snapshots[label] = (now, snapshot)
+            while len(self.snapshots) > self.max_snapshots:
+                self.snapshots.popitem(last=False)
+        return label
+
+    def top(self, limit: int = 20) -> List[Dict]:
+        """Top allocation sites of the current heap, by size"""
+        if not tracemalloc.is_tracing():
+            return []
+        stats = self._filtered(tracemalloc.take_snapshot()).statistics('lineno')
+        return [{'site': _site(stat), 'size': stat.size, 'count': stat.count} for stat in stats[:limit]]
+
+    def diff(self, old: str, new: Optional[str] = None, limit: int = 20) -> Dict:
+        """
+        Allocation sites that grew (or shrank) the most between two snapshots
+
+        Args:
+            old: label of the earlier snapshot
+            new: label of the later one, None for the current heap
+
+        Raises:
+            KeyError for an unknown label, RuntimeError if not tracing
+        """
+        with self.lock:
+            old_time, old_snapshot = self.snapshots[old]
+            if new is not None:
+                new_time, new_snapshot = self.snapshots[new]
+        if new is None:
+            if not tracemalloc.is_tracing():
+                raise RuntimeError('tracemalloc is not tracing, start it first')
+            new_time, new_snapshot = time.time(), self._filtered(tracemalloc.take_snapshot())
+
+        stats = new_snapshot.compare_to(old_snapshot, 'lineno')
+        return {
+            'from': old,
+            'to': new or 'now',
+            'seconds': round(new_time - old_time, 1),
+            'size_diff': sum(stat.size_diff for stat in stats),
+            'sites': [
+                {'site': _site(stat), 'size': stat.size, 'size_diff': stat.size_diff,
+                 'count': stat.count, 'count_diff': stat.count_diff}
+                for stat in stats[:limit]
+            ]
+        }
+
+    def status(self) -> Dict:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self.lock:
+            snapshots = [{'label': label, 'time': taken} for label, (taken, _) in self.snapshots.items()]
+        return {
+            'tracing': tracing,
+            'frames': tracemalloc.get_traceback_limit() if tracing else self.frames,
+            'traced': current,
+            'traced_peak': peak,
+            'overhead': tracemalloc.get_tracemalloc_memory() if tracing else 0,
+            'snapshots': snapshots
+        }
+
+
+# Shared tracker of the API process
+memory_tracker = MemoryTracker()
@@ -4,104 +4,146 @@ Kalshi API for NFL games
 Fetches NFL game data from Kalshi
 """
 
-import requests
+from upstream_session import UpstreamSession
+from kalshi_api import iter_series_events, ticker_params
+from config import UPSTREAM_URLS
 from nfl_team_mapping import normalize_team_name, get_team_info
+from structured_log import get_logger, skips
+
+log = get_logger('nfl_kalshi')
 
 class NFLKalshiAPI:
     def __init__(self):
-        self.BASE_URL = "https://api.elections.kalshi.com/trade-api/v2"
+        self.BASE_URL = UPSTREAM_URLS['kalshi']
         self.NFL_SERIES = "KXNFLGAME"
+        self.SOURCE = 'nfl_kalshi'  # skip counter key
+        self.session = UpstreamSession('kalshi')
 
     def get_nfl_games(self):
         """
         Fetch NFL games from Kalshi
         Returns list of game dictionaries with standardized format
         """
-        url = f"{self.BASE_URL}/markets"
-        params = {
-            'series_ticker': self.NFL_SERIES,
-            'status': 'open',
-            'limit': 200
-        }
-
         try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            markets = data.get('markets', [])
-
-            # Group markets by event (2 markets per game, one for each team)
-            games_dict = {}
-            for market in markets:
-                event_ticker = market.get('event_ticker', '')
-                ticker = market.get('ticker', '')
-                team_name = market.get('yes_sub_title', '')
+            return self.parse_events(iter_series_events(self.session, self.BASE_URL, self.NFL_SERIES))
 
-                if not event_ticker or not team_name:
-                    continue
+        except Exception as e:
+            log.error('Error fetching NFL games from Kalshi: %s', e)
+            return []
 
-                # Normalize team name
-                team_code = normalize_team_name(team_name, 'kalshi')
-                if not team_code:
-                    continue
+    def parse_events(self, events):
+        """Games of /events results with nested markets"""
+        games = []
+        for event in events:
+            game = self._parse_event(event.get('event_ticker', ''), event.get('markets', []))
+            if game:
+                games.append(game)
+        return games
 
-                # Get probability directly from last_price (already in percentage)
-                prob = market.get('last_price', 0)
+    def get_games_by_tickers(self, tickers):
+        """
+        Refresh specific NFL games by market ticker (both team markets of a game)
+        Returns list of game dictionaries with standardized format
+        """
+        tickers = [ticker for ticker in tickers if ticker]
+        if not tickers:
+            return []
 
-                if event_ticker not in games_dict:
-                    games_dict[event_ticker] = {'ticker': ticker}
+        try:
+            response = self.session.get(f"{self.BASE_URL}/markets", params=ticker_params(tickers), timeout=10)
+            response.raise_for_status()
+            data = response.json()
+            return self._group_markets(data.get('markets', []))
 
-                games_dict[event_ticker][team_code] = {
-                    'name': team_name,
-                    'prob': prob,
-                    'team_code': team_code
-                }
+        except Exception as e:
+            log.error('Error fetching NFL markets from Kalshi: %s', e)
+            return []
 
-            # Convert to game format
-            games = []
-            for event_ticker, teams in games_dict.items():
-                if len(teams) != 2:
-                    continue
-
-                team_codes = list(teams.keys())
-                team1_code = team_codes[0]
-                team2_code = team_codes[1]
-
-                team1_info = get_team_info(team1_code)
-                team2_info = get_team_info(team2_code)
-
-                if not team1_info or not team2_info:
-                    continue
-
-                # Determine home/away based on event title pattern
-                # Kalshi format is usually "Away at Home"
-                team1_data = teams[team1_code]
-                team2_data = teams[team2_code]
-
-                # last_price is already in percentage format, use directly
-                away_prob = team1_data['prob']
-                home_prob = team2_data['prob']
-
-                # Create game entry (assume first team is away, second is home)
-                ticker = teams.get('ticker', '')
-                game = {
-                    'away_team': team1_info[0],  # Polymarket name for consistency
-                    'home_team': team2_info[0],
-                    'away_code': team1_code,
-                    'home_code': team2_code,
-                    'away_prob': away_prob,
-                    'home_prob': home_prob,
-                    'event_ticker': event_ticker,
-                    'url': f'https://kalshi.com/markets/{ticker}' if ticker else '',
-                }
+    def _group_markets(self, markets):
+        """Group flat /markets results into games by event ticker"""
+        markets_by_event = {}
+        for market in markets:
+            markets_by_event.setdefault(market.get('event_ticker', ''), []).append(market)
 
+        games = []
+        for event_ticker, event_markets in markets_by_event.items():
+            game = self._parse_event(event_ticker, event_markets)
+            if game:
                 games.append(game)
+        return games
 
-            return games
-
-        except Exception as e:
-            print(f"Error fetching NFL games from Kalshi: {e}")
-            return []
+    def _parse_event(self, event_ticker, markets):
+        """
+        Build one game from the per-team markets of an event (one market per team)
+        Returns the game dictionary, or None if the event isn't a complete game
+        """
+        if not event_ticker:
+            return None
+
+        teams = {}
+        tickers = []
+        for market in markets:
+            team_name = market.get('yes_sub_title', '')
+            if not team_name:
+                continue
+
+            # Normalize team name
+            team_code = normalize_team_name(team_name, 'kalshi')
+            if not team_code:
+                skips.skip(self.SOURCE, 'unmapped_team')
+                log.warning('Could not normalize Kalshi team: %s', team_name)
+                continue
+
+            # Get probability directly from last_price (already in percentage)
+            prob = market.get('last_price', 0)
+
+            tickers.append(market.get('ticker', ''))
+            teams[team_code] = {
+                'name': team_name,
+                'prob': prob,
+                'team_code': team_code,
+                'orderbook': {
+                    'yes_bid': market.get('yes_bid', 0),
+                    'yes_ask': market.get('yes_ask', 0),
+                    'last_price': prob,
+                    'volume': market.get('volume', 0)
+                }
+            }
+
+        if len(teams) != 2:
+            skips.skip(self.SOURCE, 'incomplete')
+            return None
+
+        team1_code, team2_code = list(teams)
+        team1_info = get_team_info(team1_code)
+        team2_info = get_team_info(team2_code)
+
+        if not team1_info or not team2_info:
+            return None
+
+        # Kalshi format is usually "Away at Home", first team is away, second is home
+        team1_data = teams[team1_code]
+        team2_data = teams[team2_code]
+        ticker = tickers[0]
+
+        return {
+            'away_team': team1_info[0],  # Polymarket name for consistency
+            'home_team': team2_info[0],
+            'away_code': team1_code,
+            'home_code': team2_code,
+            # last_price is already in percentage format, use directly
+            'away_prob': team1_data['prob'],
+            'home_prob': team2_data['prob'],
+            'away_orderbook': team1_data['orderbook'],
+            'home_orderbook': team2_data['orderbook'],
+            'event_ticker': event_ticker,
+            'market_tickers': tickers,
+            'url': f'https://kalshi.com/markets/{ticker}' if ticker else '',
+            # Orderbook summary: cost of buying / selling both sides, spread over 100¢
+            'total_ask': team1_data['orderbook']['yes_ask'] + team2_data['orderbook']['yes_ask'],
+            'total_bid': team1_data['orderbook']['yes_bid'] + team2_data['orderbook']['yes_bid'],
+            'spread': team1_data['orderbook']['yes_ask'] + team2_data['orderbook']['yes_ask'] - 100,
+        }
 
 
 if __name__ == '__main__':
@@ -4,42 +4,71 @@ Polymarket API for NFL games
 Fetches NFL game data from Polymarket
 """
 
-import requests
 import json
+from upstream_session import UpstreamSession
+from polymarket_api import date_window, fetch_event_pages, slug_params
+from config import UPSTREAM_URLS
 from nfl_team_mapping import normalize_team_name, get_team_info
+from structured_log import get_logger, skips
+
+log = get_logger('nfl_polymarket')
 
 class NFLPolymarketAPI:
     def __init__(self):
-        self.BASE_URL = "https://gamma-api.polymarket.com"
+        self.BASE_URL = UPSTREAM_URLS['polymarket']
         self.NFL_SERIES_ID = "10187"  # NFL series ID from Polymarket
+        self.HORIZON_DAYS = 8  # A full week of games
+        self.SOURCE = 'nfl_polymarket'  # skip counter key
+        self.session = UpstreamSession('polymarket')
 
     def get_nfl_games(self):
         """
         Fetch NFL games from Polymarket
         Returns list of game dictionaries with standardized format
         """
-        url = f"{self.BASE_URL}/events"
-        params = {
+        try:
+            events = fetch_event_pages(self.session, self.BASE_URL, self.listing_params())
+            return self.parse_events(events)
+
+        except Exception as e:
+            log.error('Error fetching NFL games from Polymarket: %s', e)
+            return []
+
+    def listing_params(self):
+        """Gamma events listing query of the NFL games in the next week"""
+        end_date_min, end_date_max = date_window(horizon_days=self.HORIZON_DAYS)
+        return {
             'series_id': self.NFL_SERIES_ID,
             'closed': 'false',
-            'limit': 100
+            'end_date_min': end_date_min,
+            'end_date_max': end_date_max
         }
 
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            events = response.json()
+    def parse_events(self, events):
+        """Games of a list of events"""
+        games = []
+        for event in events:
+            game = self._parse_game(event)
+            if game:
+                games.append(game)
+        return games
 
-            games = []
-            for event in events:
-                game = self._parse_game(event)
-                if game:
-                    games.append(game)
+    def get_games_by_slugs(self, slugs=None, event_ids=None):
+        """
+        Refresh specific NFL games by event slug or ID
+        Returns list of game dictionaries with standardized format
+        """
+        params = slug_params(slugs, event_ids)
+        if not params:
+            return []
 
-            return games
+        try:
+            response = self.session.get(f"{self.BASE_URL}/events", params=params, timeout=10)
+            response.raise_for_status()
+            return self.parse_events(response.json())
 
         except Exception as e:
-            print(f"Error fetching NFL games from Polymarket: {e}")
+            log.error('Error fetching NFL events from Polymarket: %s', e)
             return []
 
     def _parse_game(self, event):
@@ -53,9 +82,11 @@ class NFLPolymarketAPI:
             elif ' vs ' in title:
                 teams = title.split(' vs ')
             else:
+                skips.skip(self.SOURCE, 'not_a_game')
                 return None
 
             if len(teams) != 2:
+                skips.skip(self.SOURCE, 'bad_title')
                 return None
 
             team1_name = teams[0].strip()
@@ -66,7 +97,8 @@ class NFLPolymarketAPI:
             team2_code = normalize_team_name(team2_name, 'polymarket')
 
             if not team1_code or not team2_code:
-                print(f"Could not map teams: {team1_name} vs {team2_name}")
+                skips.skip(self.SOURCE, 'unmapped_team')
+                log.warning('Could not map teams: %s vs %s', team1_name, team2_name)
                 return None
 
             # Find the moneyline market (exact title match)
@@ -79,7 +111,8 @@ class NFLPolymarketAPI:
                     break
 
             if not winner_market:
-                print(f"No moneyline market found for: {title}")
+                skips.skip(self.SOURCE, 'no_moneyline')
+                log.debug('No moneyline market found for: %s', title)
                 return None
 
             # Parse outcomes and prices (they are JSON strings)
@@ -89,6 +122,7 @@ class NFLPolymarketAPI:
                 prices = json.loads(winner_market.get('outcomePrices', '[]'))
 
                 if len(outcomes) != 2 or len(prices) != 2:
+                    skips.skip(self.SOURCE, 'bad_outcomes')
                     return None
 
                 # Process outcomes in their original order
@@ -98,10 +132,12 @@ class NFLPolymarketAPI:
                     if team_code:
                         outcome_data.append({
                             'code': team_code,
-                            'raw_prob': float(price) * 100
+                            'raw_prob': float(price) * 100,
+                            'price': float(price)
                         })
 
                 if len(outcome_data) != 2:
+                    skips.skip(self.SOURCE, 'unmapped_outcome')
                     return None
 
                 # Normalize probabilities - give remainder to SMALLER value
@@ -125,6 +161,7 @@ class NFLPolymarketAPI:
                     outcome_data[0]['code']: outcome_data[0]['prob'],
                     outcome_data[1]['code']: outcome_data[1]['prob']
                 }
+                raw_prices = {item['code']: item['price'] for item in outcome_data}
 
                 # Get team info
                 team1_info = get_team_info(team1_code)
@@ -139,6 +176,9 @@ class NFLPolymarketAPI:
                     'home_code': team2_code,
                     'away_prob': probs.get(team1_code, 0),
                     'home_prob': probs.get(team2_code, 0),
+                    'away_price': raw_prices.get(team1_code, 0),  # Raw price (0-1)
+                    'home_price': raw_prices.get(team2_code, 0),
+                    'total_price': sum(raw_prices.values()),
                     'end_date': event.get('endDate', ''),
                     'event_id': event.get('id', ''),
                     'slug': slug,
@@ -148,11 +188,13 @@ class NFLPolymarketAPI:
                 return game
 
             except (json.JSONDecodeError, ValueError) as e:
-                print(f"Error parsing outcomes/prices for {title}: {e}")
+                skips.skip(self.SOURCE, 'parse_error')
+                log.warning('Error parsing outcomes/prices for %s: %s', title, e)
                 return None
 
         except Exception as e:
-            print(f"Error parsing game: {e}")
+            skips.skip(self.SOURCE, 'parse_error')
+            log.warning('Error parsing game: %s', e, exc_info=True)
             return None
 
 
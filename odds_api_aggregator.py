@@ -8,14 +8,20 @@ Get your free API key at: https://the-odds-api.com/
 import requests
 from typing import List, Dict, Optional
 from team_mapping import normalize_team_name
-from config import API_KEYS
+from config import API_KEYS, UPSTREAM_URLS
+from upstream_session import UpstreamSession
+from quota_governor import governor
+from structured_log import get_logger, skips
+
+log = get_logger('odds_api')
 
 class OddsAPIAggregator:
-    BASE_URL = "https://api.the-odds-api.com/v4"
+    BASE_URL = UPSTREAM_URLS['odds_api']
+    SOURCE = 'odds_api'   # skip counter key
 
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or API_KEYS.get('ODDS_API_KEY', '')
-        self.session = requests.Session()
+        self.session = UpstreamSession('odds_api')
 
     def get_nba_games(self) -> List[Dict]:
         """
@@ -23,7 +29,7 @@ class OddsAPIAggregator:
         Returns aggregated odds from multiple sportsbooks
         """
         if not self.api_key:
-            print("⚠️  Odds API key not configured. Add key to config.py")
+            log.warning('Odds API key not configured. Add key to config.py')
             return []
 
         url = f"{self.BASE_URL}/sports/basketball_nba/odds/"
@@ -39,9 +45,12 @@ class OddsAPIAggregator:
             response.raise_for_status()
             events = response.json()
 
-            # Check remaining requests
+            # Remaining quota is tracked by the governor (UpstreamSession),
+            # which stretches the refresh interval to fit the monthly budget
             remaining = response.headers.get('x-requests-remaining', 'unknown')
-            print(f"📊 Odds API requests remaining: {remaining}")
+            interval = governor.refresh_interval('odds_api')
+            log.info('Odds API requests remaining: %s (refresh every %.0fs)', remaining, interval,
+                     extra={'fields': {'remaining': remaining, 'interval': round(interval)}})
 
             games = []
             for event in events:
@@ -52,7 +61,7 @@ class OddsAPIAggregator:
             return games
 
         except requests.RequestException as e:
-            print(f"Error fetching Odds API data: {e}")
+            log.error('Error fetching Odds API data: %s', e)
             return []
 
     def _parse_event(self, event: Dict) -> Optional[Dict]:
@@ -66,19 +75,23 @@ class OddsAPIAggregator:
             away_code = normalize_team_name(away_team_raw, 'odds_api')
 
             if not home_code or not away_code:
-                print(f"Warning: Could not normalize teams: {away_team_raw} @ {home_team_raw}")
+                skips.skip(self.SOURCE, 'unmapped_team')
+                log.warning('Could not normalize teams: %s @ %s', away_team_raw, home_team_raw)
                 return None
 
             # Get bookmakers data
             bookmakers = event.get('bookmakers', [])
             if not bookmakers:
+                skips.skip(self.SOURCE, 'no_bookmakers')
                 return None
 
             # Aggregate odds from multiple bookmakers (use average or best)
             all_home_odds = []
             all_away_odds = []
+            bookmaker_probs = []
 
             for bookmaker in bookmakers:
+                book_probs = {}
                 markets = bookmaker.get('markets', [])
                 for market in markets:
                     if market.get('key') == 'h2h':
@@ -92,10 +105,17 @@ class OddsAPIAggregator:
 
                             if team_name == home_team_raw:
                                 all_home_odds.append(prob)
+                                book_probs['home_prob'] = prob
                             elif team_name == away_team_raw:
                                 all_away_odds.append(prob)
+                                book_probs['away_prob'] = prob
+
+                # Implied (vig-inclusive) probabilities of each bookmaker
+                if len(book_probs) == 2:
+                    bookmaker_probs.append({'bookmaker': bookmaker.get('key'), **book_probs})
 
             if not all_home_odds or not all_away_odds:
+                skips.skip(self.SOURCE, 'no_moneyline')
                 return None
 
             # Use average probability
@@ -119,11 +139,13 @@ class OddsAPIAggregator:
                 'commence_time': event.get('commence_time', ''),
                 'num_bookmakers': len(bookmakers),
                 'bookmakers': [b.get('key') for b in bookmakers[:5]],  # Top 5 bookmakers
+                'bookmaker_probs': bookmaker_probs,
                 'url': f"https://the-odds-api.com"  # Generic URL
             }
 
         except Exception as e:
-            print(f"Error parsing event: {e}")
+            skips.skip(self.SOURCE, 'parse_error')
+            log.warning('Error parsing event: %s', e)
             return None
 
 
@@ -3,8 +3,8 @@
 订单簿数据总结 - 显示原始价格和价差
 """
 
-from polymarket_api_v2 import PolymarketAPI
-from kalshi_api_v2 import KalshiAPI
+from polymarket_api import PolymarketAPI
+from kalshi_api import KalshiAPI
 
 def main():
     poly_api = PolymarketAPI()
@@ -1,14 +1,100 @@
 import requests
+from upstream_session import UpstreamSession
 import json
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Tuple
 from team_mapping import normalize_team_name
+from config import UPSTREAM_URLS
+from structured_log import get_logger, skips
+
+log = get_logger('polymarket')
+
+
+def date_window(dates: List[str] = None, horizon_days: int = 2) -> Tuple[str, str]:
+    """
+    Server-side end date window (UTC, ISO) for game events
+
+    With `dates` ('YYYY-MM-DD', local slug dates) the window covers those
+    days plus one extra day, since late games end after midnight UTC.
+    Without, it covers in-progress games up to `horizon_days` ahead.
+    """
+    if dates:
+        start = datetime.strptime(min(dates), '%Y-%m-%d').replace(tzinfo=timezone.utc)
+        end = datetime.strptime(max(dates), '%Y-%m-%d').replace(tzinfo=timezone.utc) + timedelta(days=2)
+    else:
+        start = datetime.now(timezone.utc) - timedelta(hours=12)
+        end = start + timedelta(days=horizon_days, hours=12)
+    return start.strftime('%Y-%m-%dT%H:%M:%SZ'), end.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def page_offsets(first_page: Dict, page_size: int, max_pages: int) -> List[int]:
+    """Offsets of the pages after the first one, from its reported total"""
+    total = (first_page.get('pagination') or {}).get('totalResults', 0)
+    if total > page_size * max_pages:
+        log.warning('Polymarket listing has %d events, fetching the first %d', total, page_size * max_pages)
+    return list(range(page_size, min(total, page_size * max_pages), page_size))
+
+
+def merge_event_pages(pages: List[List[Dict]]) -> List[Dict]:
+    """Events of all pages in listing order, de-duplicated by ID"""
+    events = []
+    seen = set()
+    for page in pages:
+        for event in page:
+            # Offsets can shift between pages while the listing changes
+            event_id = event.get('id')
+            if event_id in seen:
+                continue
+            seen.add(event_id)
+            events.append(event)
+    return events
+
+
+def fetch_event_pages(session, base_url: str, params: Dict, page_size: int = 100,
+                      max_pages: int = 10, max_workers: int = 4) -> List[Dict]:
+    """
+    Fetch every page of a Gamma events listing
+
+    The first page (/events/pagination) reports the total number of
+    results; the remaining offsets are then requested concurrently, so the
+    full listing costs about two round trips. Events are returned in
+    listing order, de-duplicated by ID.
+
+    Raises:
+        requests.RequestException on any failed page (no partial listings)
+    """
+    url = f"{base_url}/events/pagination"
+
+    def fetch_page(offset):
+        response = session.get(url, params={**params, 'limit': page_size, 'offset': offset}, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    first = fetch_page(0)
+    pages = [first.get('data', [])]
+    offsets = page_offsets(first, page_size, max_pages)
+
+    if offsets:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(offsets))) as executor:
+            pages.extend(page.get('data', []) for page in executor.map(fetch_page, offsets))
+
+    return merge_event_pages(pages)
+
+
+def slug_params(slugs: List[str] = None, event_ids: List[str] = None) -> List[Tuple[str, str]]:
+    """/events query of specific events by slug or ID"""
+    params = [('slug', slug) for slug in (slugs or []) if slug]
+    params += [('id', event_id) for event_id in (event_ids or []) if event_id]
+    return params
 
 class PolymarketAPI:
-    BASE_URL = "https://gamma-api.polymarket.com"
+    BASE_URL = UPSTREAM_URLS['polymarket']
     NBA_TAG_ID = "745"
+    SOURCE = 'polymarket'   # skip counter key
 
     def __init__(self):
-        self.session = requests.Session()
+        self.session = UpstreamSession('polymarket')
 
     def get_nba_games(self, date_filter: Optional[str] = None) -> List[Dict]:
         """
@@ -20,136 +106,195 @@ class PolymarketAPI:
         Returns:
             List of game dictionaries with standardized format
         """
-        url = f"{self.BASE_URL}/events"
-        params = {
+        return self.get_games_for_dates([date_filter] if date_filter else None)
+
+    def get_games_for_dates(self, dates: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Get NBA games on any of the given dates with a single paginated listing
+
+        Args:
+            dates: Date strings in format 'YYYY-MM-DD', None for every game in
+                   the next couple of days
+
+        Returns:
+            List of game dictionaries with standardized format
+        """
+        try:
+            events = fetch_event_pages(self.session, self.BASE_URL, self.listing_params(dates))
+            return self.parse_events(events, dates)
+
+        except requests.RequestException as e:
+            log.error('Error fetching Polymarket data: %s', e)
+            return []
+
+    def listing_params(self, dates: Optional[List[str]] = None) -> Dict:
+        """Gamma events listing query of NBA games on `dates` (see get_games_for_dates)"""
+        end_date_min, end_date_max = date_window(dates)
+        return {
             'closed': 'false',
             'tag_id': self.NBA_TAG_ID,
-            'limit': 100
+            'end_date_min': end_date_min,
+            'end_date_max': end_date_max
         }
 
+    def parse_events(self, events: List[Dict], dates: Optional[List[str]] = None) -> List[Dict]:
+        """Games of a list of events, only the ones on `dates` if given"""
+        games = []
+        for event in events:
+            slug = event.get('slug', '')
+            if dates and not any(date in slug for date in dates):
+                continue
+            game = self._parse_event(event)
+            if game:
+                games.append(game)
+        return games
+
+    def get_games_by_slugs(self, slugs: List[str] = None, event_ids: List[str] = None) -> List[Dict]:
+        """
+        Refresh specific NBA games by event slug or ID
+
+        Only the requested events are transferred, instead of the whole
+        tag listing used by get_nba_games.
+
+        Returns:
+            List of game dictionaries with standardized format
+        """
+        params = slug_params(slugs, event_ids)
+        if not params:
+            return []
+
         try:
-            response = self.session.get(url, params=params, timeout=10)
+            response = self.session.get(f"{self.BASE_URL}/events", params=params, timeout=10)
             response.raise_for_status()
-            events = response.json()
-
-            games = []
-            for event in events:
-                title = event.get('title', '')
-                slug = event.get('slug', '')
-
-                # Filter for game events (contains 'vs.')
-                if ' vs. ' not in title:
-                    continue
-
-                # Optional date filtering
-                if date_filter and date_filter not in slug:
-                    continue
-
-                # Extract team names
-                teams = title.split(' vs. ')
-                if len(teams) != 2:
-                    continue
-
-                away_team = teams[0].strip()
-                home_team = teams[1].strip()
-
-                # Get team codes
-                away_code = normalize_team_name(away_team, 'polymarket')
-                home_code = normalize_team_name(home_team, 'polymarket')
-
-                if not away_code or not home_code:
-                    print(f"Warning: Could not normalize teams: {away_team} vs {home_team}")
-                    continue
-
-                # Find the Game Winner market (moneyline)
-                # The moneyline market has question exactly equal to the event title
-                winner_market = None
-                for market in event.get('markets', []):
-                    question = market.get('question', '')
-                    if question == title:
-                        winner_market = market
-                        break
-
-                # Fallback: if not found, try to find one with "Moneyline" that's NOT "1H Moneyline"
-                if not winner_market:
-                    for market in event.get('markets', []):
-                        question = market.get('question', '')
-                        if 'Moneyline' in question and '1H' not in question:
-                            winner_market = market
-                            break
-
-                if not winner_market:
-                    continue
-
-                # Parse outcomes and prices
-                try:
-                    import math
-                    outcomes = json.loads(winner_market.get('outcomes', '[]'))
-                    prices = json.loads(winner_market.get('outcomePrices', '[]'))
-
-                    if len(outcomes) != 2 or len(prices) != 2:
-                        continue
-
-                    # Process outcomes in their original order
-                    outcome_data = []
-                    for outcome, price in zip(outcomes, prices):
-                        team_code = normalize_team_name(outcome, 'polymarket')
-                        if team_code:
-                            outcome_data.append({
-                                'code': team_code,
-                                'raw_prob': float(price) * 100
-                            })
-
-                    if len(outcome_data) != 2:
-                        continue
-
-                    # Normalize probabilities - give remainder to SMALLER value
-                    prob1 = outcome_data[0]['raw_prob']
-                    prob2 = outcome_data[1]['raw_prob']
-
-                    floor1 = math.floor(prob1)
-                    floor2 = math.floor(prob2)
-                    remainder = 100 - (floor1 + floor2)
-
-                    # Give remainder to the SMALLER raw probability
-                    if prob1 <= prob2:
-                        outcome_data[0]['prob'] = floor1 + remainder
-                        outcome_data[1]['prob'] = floor2
-                    else:
-                        outcome_data[0]['prob'] = floor1
-                        outcome_data[1]['prob'] = floor2 + remainder
-
-                    # Map to team codes
-                    probs = {
-                        outcome_data[0]['code']: outcome_data[0]['prob'],
-                        outcome_data[1]['code']: outcome_data[1]['prob']
-                    }
-
-                    game_data = {
-                        'platform': 'Polymarket',
-                        'away_team': away_team,
-                        'home_team': home_team,
-                        'away_code': away_code,
-                        'home_code': home_code,
-                        'away_prob': probs.get(away_code, 0),
-                        'home_prob': probs.get(home_code, 0),
-                        'slug': slug,
-                        'end_date': winner_market.get('endDate', ''),
-                        'url': f'https://polymarket.com/event/{slug}',
-                    }
-
-                    games.append(game_data)
-
-                except (json.JSONDecodeError, ValueError) as e:
-                    print(f"Error parsing market data for {title}: {e}")
-                    continue
-
-            return games
+            return self.parse_events(response.json())
 
         except requests.RequestException as e:
-            print(f"Error fetching Polymarket data: {e}")
+            log.error('Error fetching Polymarket events: %s', e)
             return []
 
+    def _parse_event(self, event: Dict, date_filter: Optional[str] = None) -> Optional[Dict]:
+        """Parse a single event into our game format, None if it isn't a game"""
+        title = event.get('title', '')
+        slug = event.get('slug', '')
+
+        # Filter for game events (contains 'vs.')
+        if ' vs. ' not in title:
+            skips.skip(self.SOURCE, 'not_a_game')
+            return None
+
+        # Optional date filtering
+        if date_filter and date_filter not in slug:
+            return None
+
+        # Extract team names
+        teams = title.split(' vs. ')
+        if len(teams) != 2:
+            skips.skip(self.SOURCE, 'bad_title')
+            return None
+
+        away_team = teams[0].strip()
+        home_team = teams[1].strip()
+
+        # Get team codes
+        away_code = normalize_team_name(away_team, 'polymarket')
+        home_code = normalize_team_name(home_team, 'polymarket')
+
+        if not away_code or not home_code:
+            skips.skip(self.SOURCE, 'unmapped_team')
+            log.warning('Could not normalize teams: %s vs %s', away_team, home_team)
+            return None
+
+        # Find the Game Winner market (moneyline)
+        # The moneyline market has question exactly equal to the event title
+        winner_market = None
+        for market in event.get('markets', []):
+            question = market.get('question', '')
+            if question == title:
+                winner_market = market
+                break
+
+        # Fallback: if not found, try to find one with "Moneyline" that's NOT "1H Moneyline"
+        if not winner_market:
+            for market in event.get('markets', []):
+                question = market.get('question', '')
+                if 'Moneyline' in question and '1H' not in question:
+                    winner_market = market
+                    break
+
+        if not winner_market:
+            skips.skip(self.SOURCE, 'no_moneyline')
+            return None
+
+        # Parse outcomes and prices
+        try:
+            import math
+            outcomes = json.loads(winner_market.get('outcomes', '[]'))
+            prices = json.loads(winner_market.get('outcomePrices', '[]'))
+
+            if len(outcomes) != 2 or len(prices) != 2:
+                skips.skip(self.SOURCE, 'bad_outcomes')
+                return None
+
+            # Process outcomes in their original order
+            outcome_data = []
+            for outcome, price in zip(outcomes, prices):
+                team_code = normalize_team_name(outcome, 'polymarket')
+                if team_code:
+                    outcome_data.append({
+                        'code': team_code,
+                        'raw_prob': float(price) * 100,
+                        'price': float(price)
+                    })
+
+            if len(outcome_data) != 2:
+                skips.skip(self.SOURCE, 'unmapped_outcome')
+                return None
+
+            # Normalize probabilities - give remainder to SMALLER value
+            prob1 = outcome_data[0]['raw_prob']
+            prob2 = outcome_data[1]['raw_prob']
+
+            floor1 = math.floor(prob1)
+            floor2 = math.floor(prob2)
+            remainder = 100 - (floor1 + floor2)
+
+            # Give remainder to the SMALLER raw probability
+            if prob1 <= prob2:
+                outcome_data[0]['prob'] = floor1 + remainder
+                outcome_data[1]['prob'] = floor2
+            else:
+                outcome_data[0]['prob'] = floor1
+                outcome_data[1]['prob'] = floor2 + remainder
+
+            # Map to team codes
+            probs = {
+                outcome_data[0]['code']: outcome_data[0]['prob'],
+                outcome_data[1]['code']: outcome_data[1]['prob']
+            }
+            raw_prices = {item['code']: item['price'] for item in outcome_data}
+
+            return {
+                'platform': 'Polymarket',
+                'away_team': away_team,
+                'home_team': home_team,
+                'away_code': away_code,
+                'home_code': home_code,
+                'away_prob': probs.get(away_code, 0),
+                'home_prob': probs.get(home_code, 0),
+                'away_price': raw_prices.get(away_code, 0),  # Raw price (0-1)
+                'home_price': raw_prices.get(home_code, 0),
+                'total_price': sum(raw_prices.values()),  # ~1.0, the book's overround
+                'slug': slug,
+                'event_id': event.get('id', ''),
+                'end_date': winner_market.get('endDate', ''),
+                'url': f'https://polymarket.com/event/{slug}',
+            }
+
+        except (json.JSONDecodeError, ValueError) as e:
+            skips.skip(self.SOURCE, 'parse_error')
+            log.warning('Error parsing market data for %s: %s', title, e)
+            return None
+
     def get_today_games(self) -> List[Dict]:
         """Get today's NBA games"""
         from datetime import datetime
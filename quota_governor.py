@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Rate-limit and quota governor for upstream platforms
+Keeps one token bucket per platform, reads quota headers from responses
+and stretches each source's refresh interval to fit the remaining budget
+"""
+
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from config import RATE_LIMITS
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take tokens if available, never blocks"""
+        now = time.monotonic()
+        self._refill(now)
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    def wait_time(self, tokens: float = 1) -> float:
+        """Seconds until `tokens` would be available"""
+        self._refill(time.monotonic())
+        missing = tokens - self.tokens
+        if missing <= 0:
+            return 0.0
+        return missing / self.rate if self.rate > 0 else float('inf')
+
+
+def _period_end(period: str, now: datetime) -> Optional[datetime]:
+    """End of the current quota period (UTC)"""
+    if period == 'monthly':
+        if now.month == 12:
+            return datetime(now.year + 1, 1, 1, tzinfo=timezone.utc)
+        return datetime(now.year, now.month + 1, 1, tzinfo=timezone.utc)
+    if period == 'daily':
+        start = datetime(now.year, now.month, now.day, tzinfo=timezone.utc)
+        return datetime.fromtimestamp(start.timestamp() + 86400, tz=timezone.utc)
+    return None
+
+
+class QuotaGovernor:
+    """
+    Central governor for all upstream platforms
+
+    - acquire(): short-term rate limiting via token buckets
+    - observe(): reads quota headers (x-requests-remaining / x-requests-last)
+      and Retry-After on 429 responses
+    - refresh_interval(): how often a source may be refreshed so that the
+      remaining quota lasts until the end of its period
+    """
+
+    def __init__(self, limits: Dict[str, Dict]):
+        self.limits = limits
+        self.lock = threading.Lock()
+        self.buckets = {
+            platform: TokenBucket(cfg.get('rate', 1), cfg.get('burst', 1))
+            for platform, cfg in limits.items()
+        }
+        self.quota = {}            # platform -> {'remaining', 'used', 'last_cost', 'updated'}
+        self.blocked_until = {}    # platform -> monotonic time (Retry-After)
+        self.denied = defaultdict(int)
+
+    def acquire(self, platform: str, cost: float = 1) -> bool:
+        """Try to spend `cost` requests on a platform, returns False when over budget"""
+        with self.lock:
+            if time.monotonic() < self.blocked_until.get(platform, 0):
+                self.denied[platform] += 1
+                return False
+
+            quota = self.quota.get(platform)
+            reserve = self.limits.get(platform, {}).get('quota_reserve', 0)
+            if quota and quota['remaining'] is not None and quota['remaining'] - cost < reserve:
+                self.denied[platform] += 1
+                return False
+
+            bucket = self.buckets.get(platform)
+            if bucket and not bucket.try_acquire(cost):
+                self.denied[platform] += 1
+                return False
+            return True
+
+    def observe(self, platform: str, headers, status_code: Optional[int] = None):
+        """Record quota headers and throttling responses from an upstream call"""
+        with self.lock:
+            remaining = _to_float(headers.get('x-requests-remaining'))
+            if remaining is not None:
+                self.quota[platform] = {
+                    'remaining': remaining,
+                    'used': _to_float(headers.get('x-requests-used')),
+                    'last_cost': _to_float(headers.get('x-requests-last')) or 1,
+                    'updated': time.time()
+                }
+
+            if status_code == 429:
+                retry_after = _to_float(headers.get('Retry-After'))
+                backoff = retry_after if retry_after is not None else self.limits.get(platform, {}).get('min_interval', 30)
+                self.blocked_until[platform] = time.monotonic() + backoff
+
+    def is_exhausted(self, platform: str) -> bool:
+        """True when a platform cannot be called right now"""
+        with self.lock:
+            if time.monotonic() < self.blocked_until.get(platform, 0):
+                return True
+            quota = self.quota.get(platform)
+            reserve = self.limits.get(platform, {}).get('quota_reserve', 0)
+            return bool(quota and quota['remaining'] is not None and quota['remaining'] <= reserve)
+
+    def refresh_interval(self, platform: str) -> float:
+        """
+        Seconds between refreshes of a source
+
+        Never below the platform's `min_interval`; for quota-metered platforms
+        the remaining budget is spread evenly over the time left in the period
+        """
+        cfg = self.limits.get(platform, {})
+        interval = cfg.get('min_interval', 30)
+
+        with self.lock:
+            quota = self.quota.get(platform)
+            if not quota or quota['remaining'] is None:
+                return interval
+
+            period_end = _period_end(cfg.get('quota_period', ''), datetime.now(timezone.utc))
+            if not period_end:
+                return interval
+
+            budget = quota['remaining'] - cfg.get('quota_reserve', 0)
+            if budget <= 0:
+                return max(interval, period_end.timestamp() - time.time())
+
+            refreshes_left = budget / max(quota['last_cost'], 1)
+            seconds_left = period_end.timestamp() - time.time()
+            return max(interval, seconds_left / refreshes_left)
+
+    def status(self) -> Dict:
+        """Snapshot of buckets, quotas and adaptive intervals for monitoring"""
+        result = {}
+        for platform in self.limits:
+            bucket = self.buckets[platform]
+            with self.lock:
+                tokens = round(min(bucket.capacity, bucket.tokens + (time.monotonic() - bucket.updated) * bucket.rate), 2)
+                quota = dict(self.quota.get(platform, {}))
+                blocked = max(0, self.blocked_until.get(platform, 0) - time.monotonic())
+                denied = self.denied[platform]
+            result[platform] = {
+                'tokens': tokens,
+                'quota_remaining': quota.get('remaining'),
+                'quota_used': quota.get('used'),
+                'blocked_for': round(blocked, 1),
+                'denied': denied,
+                'exhausted': self.is_exhausted(platform),
+                'refresh_interval': round(self.refresh_interval(platform), 1)
+            }
+        return result
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+# Shared governor used by every adapter session
+governor = QuotaGovernor(RATE_LIMITS)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Quote-stream recorder
+Appends the matched Polymarket/Kalshi quotes of every game whose raw
+prices or orderbook moved in a refresh to one JSONL file per sport and UTC
+day, the input of backtester.py. Files are written by a background thread.
+"""
+
+import json
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+from config import RECORDER
+from structured_log import get_logger
+
+log = get_logger('recorder')
+
+POLY_FIELDS = ('away_team', 'home_team', 'away_code', 'home_code', 'away_price', 'home_price')
+KALSHI_FIELDS = ('away_code', 'home_code', 'away_orderbook', 'home_orderbook')
+
+
+def quote_fingerprint(poly_game: Dict, kalshi_game: Dict) -> Tuple:
+    """Raw inputs of a replay: Polymarket prices and both Kalshi orderbooks (bid, ask, last, volume)"""
+    return (
+        poly_game.get('away_price'), poly_game.get('home_price'),
+        tuple(sorted((kalshi_game.get('away_orderbook') or {}).items())),
+        tuple(sorted((kalshi_game.get('home_orderbook') or {}).items()))
+    )
+
+
+class QuoteRecorder:
+    """
+    Append-only recorder, one line per (refresh, game whose quotes moved)
+
+    record() only compares fingerprints and enqueues; serializing and
+    appending happen on the writer thread. A full queue drops the refresh
+    instead of blocking.
+    """
+
+    def __init__(self, settings: Optional[Dict] = None):
+        settings = settings if settings is not None else RECORDER
+        self.enabled = settings.get('enabled', False)
+        self.root = settings.get('root', 'quotes')
+        self.queue = queue.Queue(maxsize=settings.get('queue_size', 1000))
+        self.last = {}        # sport -> {game_id: fingerprint of the last recorded quotes}
+        self.lock = threading.Lock()
+        self.worker = None
+        self.recorded = 0
+        self.dropped = 0
+
+    def day_path(self, sport: str, day: str) -> str:
+        return os.path.join(self.root, sport, f'{day}.jsonl')
+
+    def record(self, sport: str, ts: float, matched: List[Tuple[Dict, Dict]], game_ids: List[str]):
+        """
+        Record matched quotes whose raw prices or orderbook changed
+
+        Display probabilities are rounded, so they can't tell whether the
+        replayable quotes moved; the raw fingerprint can.
+
+        Args:
+            matched: (polymarket_game, kalshi_game) pairs
+            game_ids: game ID of each pair
+        """
+        if not self.enabled:
+            return
+
+        previous = self.last.get(sport, {})
+        current = {}
+        quotes = []
+        for (poly_game, kalshi_game), game_id in zip(matched, game_ids):
+            # Games without raw prices or an orderbook can't be replayed
+            if 'away_price' not in poly_game or 'away_orderbook' not in kalshi_game:
+                continue
+            fingerprint = current[game_id] = quote_fingerprint(poly_game, kalshi_game)
+            if previous.get(game_id) != fingerprint:
+                quotes.append((game_id, poly_game, kalshi_game))
+        # Only listed games are remembered, so finished ones fall out
+        self.last[sport] = current
+
+        if not quotes:
+            return
+        self._ensure_worker()
+        try:
+            self.queue.put_nowait((sport, ts, quotes))
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_worker(self):
+        if self.worker is None:
+            with self.lock:
+                if self.worker is None:
+                    self.worker = threading.Thread(target=self._run, name='quote-recorder', daemon=True)
+                    self.worker.start()
+
+    def _run(self):
+        while True:
+            sport, ts, quotes = self.queue.get()
+            lines = [json.dumps({
+                'ts': ts,
+                'game_id': game_id,
+                'poly': {field: poly_game.get(field) for field in POLY_FIELDS},
+                'kalshi': {field: kalshi_game.get(field) for field in KALSHI_FIELDS}
+            }, ensure_ascii=False, separators=(',', ':')) for game_id, poly_game, kalshi_game in quotes]
+
+            path = self.day_path(sport, datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%d'))
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write('\n'.join(lines) + '\n')
+                self.recorded += len(lines)
+            except OSError as e:
+                log.warning('Could not record %s quotes: %s', sport, e, extra={'fields': {'path': path}})
+
+    def status(self) -> Dict:
+        return {
+            'enabled': self.enabled,
+            'root': self.root,
+            'recorded': self.recorded,
+            'pending': self.queue.qsize(),
+            'dropped': self.dropped
+        }
+
+    def days(self, sport: str, start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
+        """Recorded days of a sport ('YYYY-MM-DD'), optionally within [start, end]"""
+        directory = os.path.join(self.root, sport)
+        if not os.path.isdir(directory):
+            return []
+        days = sorted(name[:-len('.jsonl')] for name in os.listdir(directory) if name.endswith('.jsonl'))
+        return [day for day in days if (not start or day >= start) and (not end or day <= end)]
+
+
+def read_quotes(path: str) -> Iterator[Dict]:
+    """Recorded quotes of one day file, skipping truncated lines"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+# Shared recorder fed by the API refresh loop
+quote_recorder = QuoteRecorder()
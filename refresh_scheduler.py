@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Adaptive per-game refresh scheduler
+Hot games (volatile spread, high arbitrage score, close to tip-off) are
+refreshed every few seconds, cold games far less often
+"""
+
+import heapq
+import statistics
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from config import SCHEDULER
+
+
+def parse_game_time(value: str) -> Optional[datetime]:
+    """Parse an ISO game time ('2025-11-16T00:00' or with 'Z'), assumed UTC"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class RefreshScheduler:
+    """
+    Gives each game a priority in [0, 1] and a refresh interval derived from it
+
+    priority = weighted mix of
+      - volatility: standard deviation of the recent diff history
+      - arbitrage score (0-100 from calculate_comparisons)
+      - proximity: 1.0 while live, decaying with hours until tip-off
+    interval = hot + (cold - hot) * (1 - priority) ** 2
+    """
+
+    def __init__(self, settings: Optional[Dict] = None):
+        settings = settings or SCHEDULER
+        self.hot_interval = settings.get('hot_interval', 5)
+        self.cold_interval = settings.get('cold_interval', 300)
+        self.volatility_window = settings.get('volatility_window', 10)
+        self.volatility_scale = settings.get('volatility_scale', 3.0)
+        self.live_hours = settings.get('live_hours', 3)
+        self.weights = settings.get('weights', {'volatility': 0.4, 'score': 0.3, 'proximity': 0.3})
+
+        self.lock = threading.Lock()
+        self.games = {}     # game_key -> {'priority', 'interval', 'next_due', 'refs'}
+
+    def _volatility(self, diffs: List[float]) -> float:
+        recent = diffs[-self.volatility_window:]
+        if len(recent) < 2:
+            return 0.0
+        return min(statistics.pstdev(recent) / self.volatility_scale, 1.0)
+
+    def _proximity(self, game_time: Optional[datetime], now: datetime) -> float:
+        if not game_time:
+            return 0.0
+        hours_until = (game_time - now).total_seconds() / 3600
+        if hours_until <= 0:
+            # In progress (or just finished): hottest while the game is live
+            return 1.0 if -hours_until <= self.live_hours else 0.0
+        return 1.0 / (1.0 + hours_until / 2)
+
+    def priority(self, comparison: Dict, now: Optional[datetime] = None) -> float:
+        """Priority in [0, 1] for one comparison from calculate_comparisons"""
+        now = now or datetime.now(timezone.utc)
+        diffs = comparison.get('history', {}).get('diff', [])
+        volatility = self._volatility(diffs)
+        score = comparison.get('arbitrage_score', 0) / 100
+        proximity = self._proximity(parse_game_time(comparison.get('game_time', '')), now)
+
+        return (self.weights['volatility'] * volatility +
+                self.weights['score'] * score +
+                self.weights['proximity'] * proximity)
+
+    def interval_for(self, priority: float) -> float:
+        """Refresh interval (seconds) for a priority"""
+        priority = min(max(priority, 0.0), 1.0)
+        return self.hot_interval + (self.cold_interval - self.hot_interval) * (1 - priority) ** 2
+
+    def update(self, comparisons: List[Dict], game_keys: List[str], refs: Optional[List[Dict]] = None):
+        """
+        Re-prioritize games after a refresh
+
+        Args:
+            comparisons: comparison dicts from calculate_comparisons
+            game_keys: key of each comparison (same order)
+            refs: optional per-game upstream references (slugs, tickers) used
+                  for targeted refreshes
+        """
+        now_wall = datetime.now(timezone.utc)
+        now = time.monotonic()
+
+        with self.lock:
+            for i, (comparison, key) in enumerate(zip(comparisons, game_keys)):
+                priority = self.priority(comparison, now_wall)
+                interval = self.interval_for(priority)
+                entry = self.games.get(key)
+                if entry is None:
+                    entry = self.games[key] = {'next_due': now + interval}
+                entry['priority'] = priority
+                entry['interval'] = interval
+                # A hotter game must not wait out an interval computed while cold
+                entry['next_due'] = min(entry['next_due'], now + interval)
+                if refs is not None:
+                    entry['refs'] = refs[i]
+
+    def mark_refreshed(self, game_keys: List[str]):
+        """Schedule the next refresh of games that were just fetched"""
+        now = time.monotonic()
+        with self.lock:
+            for key in game_keys:
+                entry = self.games.get(key)
+                if entry:
+                    entry['next_due'] = now + entry['interval']
+
+    def due_games(self, limit: Optional[int] = None) -> List[str]:
+        """Games whose refresh is due, hottest first"""
+        now = time.monotonic()
+        with self.lock:
+            due = [(-entry['priority'], key) for key, entry in self.games.items() if entry['next_due'] <= now]
+        if limit is not None:
+            return [key for _, key in heapq.nsmallest(limit, due)]
+        return [key for _, key in sorted(due)]
+
+    def refs(self, game_key: str) -> Optional[Dict]:
+        """Upstream references recorded for a game"""
+        with self.lock:
+            entry = self.games.get(game_key)
+            return entry.get('refs') if entry else None
+
+    def forget(self, game_keys):
+        """Stop scheduling games (finished or no longer listed)"""
+        with self.lock:
+            for key in game_keys:
+                self.games.pop(key, None)
+
+    def status(self) -> Dict:
+        """Current priorities and intervals, hottest first"""
+        now = time.monotonic()
+        with self.lock:
+            rows = [
+                {
+                    'game': key,
+                    'priority': round(entry['priority'], 3),
+                    'interval': round(entry['interval'], 1),
+                    'due_in': round(max(0, entry['next_due'] - now), 1)
+                }
+                for key, entry in self.games.items()
+            ]
+        rows.sort(key=lambda row: row['priority'], reverse=True)
+        return {'games': rows, 'tracked': len(rows)}
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Response encodings of the odds endpoints
+Clients sending `Accept: application/msgpack` get MessagePack instead of
+JSON, and can leave the per-game team names and logos out in favor of the
+static team dictionary (/api/teams/<sport>)
+"""
+
+import importlib.util
+from flask import Response, jsonify, request
+
+# Optional dependency, JSON is served when it's missing
+HAS_MSGPACK = importlib.util.find_spec('msgpack') is not None
+msgpack = None
+
+MSGPACK_TYPES = ('application/msgpack', 'application/x-msgpack')
+
+# Game fields that only repeat the team dictionary
+TEAM_FIELDS = ('away_team', 'home_team', 'away_logo', 'home_logo')
+TEAM_MODES = ('inline', 'ref')
+
+
+def wants_msgpack() -> bool:
+    """True if the request's Accept header prefers MessagePack over JSON"""
+    if not HAS_MSGPACK:
+        return False
+    offered = ['application/json', *MSGPACK_TYPES]
+    return request.accept_mimetypes.best_match(offered, default='application/json') in MSGPACK_TYPES
+
+
+def team_mode(binary: bool) -> str:
+    """
+    ?teams= of the request: 'inline' keeps names and logos on every game,
+    'ref' leaves them to the team dictionary (the default for MessagePack)
+
+    Raises:
+        ValueError on an unknown mode
+    """
+    mode = request.args.get('teams', 'ref' if binary else 'inline')
+    if mode not in TEAM_MODES:
+        raise ValueError(f'Unknown teams mode: {mode} (use {", ".join(TEAM_MODES)})')
+    return mode
+
+
+def encode(payload, binary: bool) -> Response:
+    """JSON or MessagePack response; Vary: Accept keeps caches from mixing them"""
+    global msgpack
+    if binary:
+        if msgpack is None:
+            import msgpack as _msgpack
+            msgpack = _msgpack
+        response = Response(msgpack.packb(payload, use_bin_type=True, default=str), mimetype=MSGPACK_TYPES[0])
+    else:
+        response = jsonify(payload)
+    response.headers['Vary'] = 'Accept'
+    return response
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Always-on sampling profiler
+A daemon thread snapshots the stacks of the threads serving requests
+(sys._current_frames) at a low rate and aggregates them as folded stacks in
+time buckets, so the hot spots of the last minutes, or of one traced
+refresh, can be pulled from a running server as a flame graph.
+
+Folded stacks ('frame;frame;frame count' per line) load directly into
+speedscope or flamegraph.pl; render_svg() draws a minimal flame graph.
+"""
+
+import os
+import sys
+import threading
+import time
+import zlib
+from collections import Counter, deque
+from contextlib import contextmanager
+from html import escape
+from typing import Dict, List, Optional
+from config import PROFILER
+
+
+class SamplingProfiler:
+    """
+    Folded-stack sampler
+
+    Only threads registered with track() (the request threads) are sampled,
+    unless `all_threads` is set. While a trace() is running the sampler
+    switches to `trace_interval`, and the traced thread's samples are also
+    collected separately.
+    """
+
+    def __init__(self, settings: Optional[Dict] = None):
+        settings = settings if settings is not None else PROFILER
+        self.enabled = settings.get('enabled', True)
+        self.interval = settings.get('interval', 0.02)
+        self.trace_interval = settings.get('trace_interval', 0.001)
+        self.bucket_seconds = settings.get('bucket_seconds', 10)
+        self.retention = settings.get('retention_minutes', 15) * 60
+        self.all_threads = settings.get('all_threads', False)
+        self.max_depth = settings.get('max_depth', 64)
+
+        self.buckets = deque()     # (bucket start, Counter of folded stacks)
+        self.tracked = {}          # thread ident -> root label
+        self.traces = {}           # thread ident -> Counter, while traced
+        self.labels = {}           # code object -> 'module:function'
+        self.samples = 0
+        self.busy = 0.0            # seconds spent sampling
+        self.started_at = None
+        self.worker = None
+        self.lock = threading.Lock()
+
+    def _ensure_worker(self):
+        if self.worker is None and self.enabled:
+            with self.lock:
+                if self.worker is None:
+                    self.started_at = time.monotonic()
+                    self.worker = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+                    self.worker.start()
+
+    def track(self, label: str):
+        """Sample the calling thread under `label` until untrack()"""
+        self._ensure_worker()
+        self.tracked[threading.get_ident()] = label
+
+    def untrack(self):
+        self.tracked.pop(threading.get_ident(), None)
+
+    @contextmanager
+    def trace(self, label: str):
+        """
+        Profile the calling thread for the duration of the block
+
+        Yields the Counter that collects its folded stacks.
+        """
+        self._ensure_worker()
+        ident = threading.get_ident()
+        previous = self.tracked.get(ident)
+        stacks = Counter()
+        self.tracked[ident] = label
+        self.traces[ident] = stacks
+        try:
+            yield stacks
+        finally:
+            self.traces.pop(ident, None)
+            if previous is None:
+                self.tracked.pop(ident, None)
+            else:
+                self.tracked[ident] = previous
+
+    def _label(self, code) -> str:
+        label = self.labels.get(code)
+        if label is None:
+            module = os.path.splitext(os.path.basename(code.co_filename))[0]
+            label = self.labels[code] = f'{module}:{code.co_name}'
+        return label
+
+    def _fold(self, root: str, frame) -> str:
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            names.append(self._label(frame.f_code))
+            frame = frame.f_back
+        names.append(root)
+        return ';'.join(reversed(names))
+
+    def _run(self):
+        own = threading.get_ident()
+        next_regular = 0.0
+        while True:
+            time.sleep(self.trace_interval if self.traces else self.interval)
+            started = time.perf_counter()
+
+            # Traces tick faster; only ticks on the regular interval feed the time buckets
+            regular = started >= next_regular
+            if regular:
+                next_regular = started + self.interval
+
+            frames = sys._current_frames()
+            if self.all_threads:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                targets = {ident: self.tracked.get(ident) or names.get(ident, 'thread')
+                           for ident in frames if ident != own}
+            else:
+                targets = dict(self.tracked)
+
+            now = time.time()
+            bucket_start = now - now % self.bucket_seconds
+            with self.lock:
+                if not self.buckets or self.buckets[-1][0] != bucket_start:
+                    self.buckets.append((bucket_start, Counter()))
+                    while self.buckets and self.buckets[0][0] < now - self.retention:
+                        self.buckets.popleft()
+                bucket = self.buckets[-1][1]
+
+                for ident, root in targets.items():
+                    frame = frames.get(ident)
+                    traced = self.traces.get(ident)
+                    if frame is None or (traced is None and not regular):
+                        continue
+                    stack = self._fold(root, frame)
+                    if traced is not None:
+                        traced[stack] += 1
+                    if regular:
+                        bucket[stack] += 1
+                    self.samples += 1
+
+            del frames
+            self.busy += time.perf_counter() - started
+
+    def recent(self, minutes: float) -> Counter:
+        """Folded stacks sampled in the last `minutes`"""
+        since = time.time() - minutes * 60
+        stacks = Counter()
+        with self.lock:
+            for bucket_start, bucket in self.buckets:
+                if bucket_start + self.bucket_seconds > since:
+                    stacks.update(bucket)
+        return stacks
+
+    def status(self) -> Dict:
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        return {
+            'enabled': self.enabled,
+            'running': self.worker is not None,
+            'interval': self.interval,
+            'samples': self.samples,
+            'tracked_threads': len(self.tracked),
+            'retention_minutes': self.retention / 60,
+            'overhead_pct': round(self.busy / elapsed * 100, 3) if elapsed else 0.0
+        }
+
+
+def folded(stacks: Counter) -> str:
+    """Folded-stack text, heaviest stacks first"""
+    return ''.join(f'{stack} {count}\n' for stack, count in stacks.most_common())
+
+
+def render_svg(stacks: Counter, title: str = 'Flame graph', width: int = 1200, row: int = 16) -> str:
+    """
+    Minimal flame graph (SVG) of folded stacks
+
+    Frames narrower than one pixel are dropped; hover a frame for its name,
+    sample count and share.
+    """
+    total = sum(stacks.values())
+
+    # Merge the stacks into a tree: name -> [count, children]
+    tree = {}
+    depth = 0
+    for stack, count in stacks.items():
+        level = tree
+        names = stack.split(';')
+        depth = max(depth, len(names))
+        for name in names:
+            node = level.setdefault(name, [0, {}])
+            node[0] += count
+            level = node[1]
+
+    height = (depth + 2) * row
+    rects: List[str] = []
+
+    def draw(level: Dict, x: float, y: int):
+        for name, (count, children) in sorted(level.items()):
+            w = count / total * width
+            if w < 1:
+                x += w
+                continue
+            hue = 10 + zlib.crc32(name.encode()) % 50
+            share = count / total * 100
+            rects.append(
+                f'<g><title>{escape(name)} ({count} samples, {share:.1f}%)</title>'
+                f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row - 1}" fill="hsl({hue},85%,60%)"/>'
+                f'<text x="{x + 3:.1f}" y="{y + row - 4}" font-size="11" font-family="monospace">'
+                f'{escape(name[:int(w / 7)])}</text></g>'
+            )
+            draw(children, x, y - row)
+            x += w
+
+    if total:
+        draw(tree, 0.0, height - 2 * row)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">'
+        f'<text x="4" y="{height - 4}" font-size="12" font-family="sans-serif">'
+        f'{escape(title)}: {total} samples</text>{"".join(rects)}</svg>'
+    )
+
+
+# Shared profiler of the API process
+profiler = SamplingProfiler()
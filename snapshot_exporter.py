@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Columnar export of every refresh for offline research
+Normalized quotes are written as Parquet (or Arrow IPC) batches under
+<root>/sport=<sport>/date=<YYYY-MM-DD>/, from a background thread
+
+Load a season with:
+    pandas.read_parquet('exports/sport=nba')
+"""
+
+import atexit
+import importlib.util
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from config import EXPORT
+from structured_log import get_logger
+
+# Optional dependency, imported by the writer thread on first use so that
+# importing this module stays cheap
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+pa = pq = ipc = None
+
+log = get_logger('export')
+
+
+def _load_pyarrow():
+    global pa, pq, ipc
+    if pa is None:
+        import pyarrow
+        import pyarrow.parquet
+        import pyarrow.ipc
+        pa, pq, ipc = pyarrow, pyarrow.parquet, pyarrow.ipc
+
+
+# One row per (refresh, game, platform, source)
+COLUMNS = [
+    ('ts', 'timestamp'),
+    ('game_id', 'string'),       # canonical game ID (api.get_game_id), null for unmatched games
+    ('platform', 'string'),
+    ('source', 'string'),        # bookmaker key for the Odds API, '' otherwise
+    ('away_code', 'string'),
+    ('home_code', 'string'),
+    ('game_time', 'string'),
+    ('away_prob', 'float'),      # display probability (percent)
+    ('home_prob', 'float'),
+    ('away_price', 'float'),     # Polymarket raw price (0-1)
+    ('home_price', 'float'),
+    ('away_bid', 'float'),       # Kalshi orderbook (cents)
+    ('away_ask', 'float'),
+    ('away_last', 'float'),
+    ('away_volume', 'float'),
+    ('home_bid', 'float'),
+    ('home_ask', 'float'),
+    ('home_last', 'float'),
+    ('home_volume', 'float'),
+]
+
+
+def _schema():
+    types = {'timestamp': pa.timestamp('ms', tz='UTC'), 'string': pa.string(), 'float': pa.float64()}
+    return pa.schema([(name, types[kind]) for name, kind in COLUMNS])
+
+
+def quote_rows(ts: datetime, poly_games: List[Dict], kalshi_games: List[Dict],
+               odds_games: Optional[List[Dict]] = None, manifold_games: Optional[List[Dict]] = None,
+               game_ids: Optional[Dict] = None) -> List[Dict]:
+    """
+    Flatten one refresh of every platform into export rows
+
+    `game_ids` maps (away_code, home_code) to the game ID the rows are
+    keyed by, the same one history and the change log use.
+    """
+    rows = []
+    game_ids = game_ids or {}
+
+    def base(game, platform, source=''):
+        return {
+            'ts': ts,
+            'game_id': game_ids.get((game['away_code'], game['home_code'])),
+            'platform': platform,
+            'source': source,
+            'away_code': game['away_code'],
+            'home_code': game['home_code'],
+            'game_time': game.get('end_date') or game.get('close_time') or game.get('commence_time') or '',
+        }
+
+    for game in poly_games:
+        row = base(game, 'polymarket')
+        row.update({
+            'away_prob': game.get('away_prob'),
+            'home_prob': game.get('home_prob'),
+            'away_price': game.get('away_price'),
+            'home_price': game.get('home_price'),
+        })
+        rows.append(row)
+
+    for game in kalshi_games:
+        row = base(game, 'kalshi')
+        row.update({'away_prob': game.get('away_prob'), 'home_prob': game.get('home_prob')})
+        for side in ('away', 'home'):
+            orderbook = game.get(f'{side}_orderbook') or {}
+            row[f'{side}_bid'] = orderbook.get('yes_bid')
+            row[f'{side}_ask'] = orderbook.get('yes_ask')
+            row[f'{side}_last'] = orderbook.get('last_price')
+            row[f'{side}_volume'] = orderbook.get('volume')
+        rows.append(row)
+
+    for game in odds_games or []:
+        row = base(game, 'odds_api', 'consensus')
+        row.update({'away_prob': game.get('away_prob'), 'home_prob': game.get('home_prob')})
+        rows.append(row)
+        for book in game.get('bookmaker_probs', []):
+            row = base(game, 'odds_api', book.get('bookmaker') or '')
+            row.update({'away_prob': book.get('away_prob'), 'home_prob': book.get('home_prob')})
+            rows.append(row)
+
+    for game in manifold_games or []:
+        row = base(game, 'manifold')
+        row.update({'away_prob': game.get('away_prob'), 'home_prob': game.get('home_prob')})
+        rows.append(row)
+
+    return rows
+
+
+class SnapshotExporter:
+    """
+    Batched, non-blocking exporter
+
+    submit() only enqueues references to the fetched lists; flattening and
+    writing happen on the background thread. A partition is flushed to a
+    new file once it holds `batch_rows` rows or `flush_interval` seconds passed.
+    """
+
+    def __init__(self, settings: Optional[Dict] = None):
+        settings = settings if settings is not None else EXPORT
+        self.root = settings.get('root', 'exports')
+        self.format = settings.get('format', 'parquet')
+        self.batch_rows = settings.get('batch_rows', 5000)
+        self.flush_interval = settings.get('flush_interval', 300)
+        self.enabled = settings.get('enabled', False) and HAS_PYARROW
+
+        if settings.get('enabled', False) and not HAS_PYARROW:
+            log.warning('pyarrow not installed, snapshot export disabled')
+
+        self.queue = queue.Queue(maxsize=settings.get('queue_size', 1000))
+        self.buffers = {}     # (sport, date) -> list of rows
+        self.last_flush = time.monotonic()
+        self.files_written = 0
+        self.rows_written = 0
+        self.dropped = 0
+        self.worker = None
+        self.lock = threading.Lock()
+
+    def submit(self, sport: str, ts: datetime, poly_games, kalshi_games, odds_games=None, manifold_games=None,
+               game_ids=None):
+        """Queue one refresh for export, never blocks the caller (see quote_rows for `game_ids`)"""
+        if not self.enabled:
+            return
+        self._ensure_worker()
+        try:
+            self.queue.put_nowait((sport, ts, poly_games, kalshi_games, odds_games, manifold_games, game_ids))
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_worker(self):
+        if self.worker is None:
+            with self.lock:
+                if self.worker is None:
+                    self.worker = threading.Thread(target=self._run, name='snapshot-exporter', daemon=True)
+                    self.worker.start()
+                    atexit.register(self.flush)
+
+    def _run(self):
+        _load_pyarrow()
+        while True:
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+
+            with self.lock:
+                if item is not None:
+                    sport, ts, poly_games, kalshi_games, odds_games, manifold_games, game_ids = item
+                    ts = ts.astimezone(timezone.utc)
+                    rows = quote_rows(ts, poly_games, kalshi_games, odds_games, manifold_games, game_ids)
+                    buffer = self.buffers.setdefault((sport, ts.strftime('%Y-%m-%d')), [])
+                    buffer.extend(rows)
+                    if len(buffer) >= self.batch_rows:
+                        self._write(sport, ts.strftime('%Y-%m-%d'))
+
+                if time.monotonic() - self.last_flush >= self.flush_interval:
+                    self._flush_locked()
+
+    def flush(self):
+        """Write every buffered partition"""
+        with self.lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        for sport, date in list(self.buffers):
+            self._write(sport, date)
+        self.last_flush = time.monotonic()
+
+    def _write(self, sport: str, date: str):
+        rows = self.buffers.pop((sport, date), None)
+        if not rows:
+            return
+        _load_pyarrow()
+
+        directory = os.path.join(self.root, f'sport={sport}', f'date={date}')
+        os.makedirs(directory, exist_ok=True)
+        columns = {name: [row.get(name) for row in rows] for name, _ in COLUMNS}
+        table = pa.table(columns, schema=_schema())
+
+        name = f'part-{int(time.time() * 1000)}-{self.files_written}'
+        try:
+            if self.format == 'arrow':
+                with pa.OSFile(os.path.join(directory, name + '.arrow'), 'wb') as sink:
+                    with ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+            else:
+                pq.write_table(table, os.path.join(directory, name + '.parquet'), compression='zstd')
+        except (OSError, pa.ArrowException) as e:
+            log.warning('Snapshot export failed for %s %s: %s', sport, date, e)
+            return
+
+        self.files_written += 1
+        self.rows_written += len(rows)
+
+    def status(self) -> Dict:
+        with self.lock:
+            buffered = sum(len(rows) for rows in self.buffers.values())
+        return {
+            'enabled': self.enabled,
+            'format': self.format,
+            'root': self.root,
+            'files_written': self.files_written,
+            'rows_written': self.rows_written,
+            'rows_buffered': buffered,
+            'pending': self.queue.qsize(),
+            'dropped': self.dropped
+        }
+
+
+# Shared exporter fed by the API refresh loop
+snapshot_exporter = SnapshotExporter()
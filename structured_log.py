@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Structured, non-blocking logging
+Log calls only enqueue the record; a listener thread formats it (JSON lines
+by default) and writes it to stderr. Repeated identical warnings are
+rate-limited and sampled before they are queued, and parse skips are
+counted per refresh instead of logged one by one.
+
+Usage:
+    log = get_logger('polymarket')
+    log.warning('Could not normalize teams', extra={'fields': {'away': away, 'home': home}})
+    skips.skip('polymarket', 'unmapped_team')
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Dict
+from config import LOGGING
+
+ROOT_LOGGER = 'polymix'
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, `extra={'fields': {...}}` merged in"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        entry.update(getattr(record, 'fields', None) or {})
+        if getattr(record, 'suppressed', 0):
+            entry['suppressed'] = record.suppressed
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local runs, fields appended as key=value"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)-7s %(name)s: %(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = dict(getattr(record, 'fields', None) or {})
+        if getattr(record, 'suppressed', 0):
+            fields['suppressed'] = record.suppressed
+        if fields:
+            line += ' ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+        return line
+
+
+class RepeatFilter(logging.Filter):
+    """
+    Rate limit for identical records
+
+    Records are identical when logger, level and message template match
+    (not the formatted arguments). In every `window` seconds the first
+    `burst` pass, after that one in `sample`; the next record that passes
+    carries how many were dropped in between. Records below `level` are
+    never limited.
+    """
+
+    def __init__(self, window: float = 60, burst: int = 5, sample: int = 100, level: int = logging.WARNING):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self.sample = max(1, sample)
+        self.level = level
+        self.keys = {}        # (logger, level, template) -> [window start, count, suppressed]
+        self.suppressed = 0
+        self.lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.level:
+            return True
+
+        key = (record.name, record.levelno, record.msg)
+        now = time.monotonic()
+        with self.lock:
+            state = self.keys.get(key)
+            if state is None:
+                state = self.keys[key] = [now, 0, 0]
+            elif now - state[0] >= self.window:
+                state[0], state[1] = now, 0
+            state[1] += 1
+
+            count = state[1]
+            if count > self.burst and (count - self.burst) % self.sample:
+                state[2] += 1
+                self.suppressed += 1
+                return False
+
+            record.suppressed = state[2]
+            state[2] = 0
+            return True
+
+
+class BackgroundQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks the caller
+
+    Formatting is left to the listener thread (which is started on the
+    first record), and a full queue drops the record instead of waiting.
+    """
+
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler):
+        super().__init__(log_queue)
+        self.handlers = handlers
+        self.listener = None
+        self.dropped = 0
+        self.start_lock = threading.Lock()   # Handler.lock is held around emit()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.listener is None:
+            self._start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self):
+        with self.start_lock:
+            if self.listener is None:
+                self.listener = logging.handlers.QueueListener(self.queue, *self.handlers,
+                                                               respect_handler_level=True)
+                self.listener.start()
+                atexit.register(self.listener.stop)
+
+
+class SkipCounter:
+    """
+    Markets skipped while parsing, per source and reason
+
+    Adapters call skip() inside their parse loops; the source cache calls
+    flush() after every refresh, which logs one summary line and keeps the
+    counts as the source's last refresh.
+    """
+
+    def __init__(self):
+        self.current = defaultdict(Counter)   # source -> reason -> count (refresh in progress)
+        self.last = {}                         # source -> counts of the last refresh
+        self.totals = defaultdict(Counter)
+        self.lock = threading.Lock()
+
+    def skip(self, source: str, reason: str):
+        with self.lock:
+            self.current[source][reason] += 1
+
+    def flush(self, source: str) -> Dict[str, int]:
+        """Close the source's refresh, returns its skip counts by reason"""
+        with self.lock:
+            counts = dict(self.current.pop(source, {}))
+            self.last[source] = counts
+            self.totals[source].update(counts)
+        if counts:
+            get_logger('skips').info('Skipped markets', extra={'fields': {'source': source, 'skipped': counts}})
+        return counts
+
+    def status(self) -> Dict:
+        with self.lock:
+            return {
+                'last': dict(self.last),
+                'totals': {source: dict(counts) for source, counts in self.totals.items()}
+            }
+
+
+def _configure(settings: Dict) -> BackgroundQueueHandler:
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(TextFormatter() if settings.get('format') == 'text' else JsonFormatter())
+
+    handler = BackgroundQueueHandler(queue.Queue(maxsize=settings.get('queue_size', 10000)), stream)
+    handler.addFilter(RepeatFilter(settings.get('window', 60), settings.get('burst', 5), settings.get('sample', 100)))
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(settings.get('level', 'INFO'))
+    root.addHandler(handler)
+    root.propagate = False
+    return handler
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the shared 'polymix' hierarchy"""
+    return logging.getLogger(f'{ROOT_LOGGER}.{name}')
+
+
+def log_status() -> Dict:
+    """Queue, rate-limit and skip counters"""
+    repeat = next(f for f in handler.filters if isinstance(f, RepeatFilter))
+    return {
+        'level': logging.getLevelName(logging.getLogger(ROOT_LOGGER).level),
+        'pending': handler.queue.qsize(),
+        'dropped': handler.dropped,
+        'suppressed': repeat.suppressed,
+        'skipped': skips.status()
+    }
+
+
+# Shared handler and skip counters of the whole process
+handler = _configure(LOGGING)
+skips = SkipCounter()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+HTTP session shared by all platform adapters
+Every request goes through the quota governor and the platform's
+circuit breaker first
+"""
+
+import time
+import requests
+from quota_governor import governor
+from circuit_breaker import get_breaker
+
+
+class QuotaExhausted(requests.RequestException):
+    """Raised instead of calling upstream when a platform is over budget"""
+
+
+class CircuitOpen(requests.RequestException):
+    """Raised instead of calling upstream while the platform's breaker is open"""
+
+
+class UpstreamSession(requests.Session):
+    """
+    requests.Session bound to one platform
+
+    The adapters keep catching requests.RequestException, so a denied call
+    looks like any other upstream failure to them. The caller can inspect
+    `last_error` to tell a real empty slate from a failed fetch.
+    """
+
+    def __init__(self, platform: str):
+        super().__init__()
+        self.platform = platform
+        self.breaker = get_breaker(platform)
+        self.last_error = None
+
+    def request(self, method, url, *args, **kwargs):
+        if not self.breaker.allow():
+            self.last_error = CircuitOpen(f"{self.platform} circuit open")
+            raise self.last_error
+
+        if not governor.acquire(self.platform):
+            # Not a platform failure, just give back a half-open probe slot
+            self.breaker.release()
+            self.last_error = QuotaExhausted(f"{self.platform} rate limit or quota exhausted")
+            raise self.last_error
+
+        # Bound the time a slow platform can hold a refresh
+        timeout = kwargs.get('timeout')
+        kwargs['timeout'] = min(timeout, self.breaker.timeout) if timeout else self.breaker.timeout
+
+        started = time.monotonic()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except requests.RequestException as e:
+            self.breaker.record_failure()
+            self.last_error = e
+            raise
+
+        governor.observe(self.platform, response.headers, response.status_code)
+        if response.status_code >= 500 or response.status_code == 429:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success(time.monotonic() - started)
+        if response.status_code >= 400:
+            self.last_error = requests.HTTPError(f"{response.status_code} from {self.platform}", response=response)
+
+        return response
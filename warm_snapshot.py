@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Warm snapshot persistence for serverless cold starts
+The latest result, per-source listings and game history are written to a
+local file store (/tmp by default) and loaded back by a fresh process.
+Saves from the request path go through a background writer.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+from config import COLD_START
+from structured_log import get_logger
+
+log = get_logger('warm_snapshot')
+
+
+def snapshot_path(sport: str) -> str:
+    return os.path.join(COLD_START.get('snapshot_dir', '/tmp/polymix'), f'{sport}_snapshot.json')
+
+
+def save_snapshot(sport: str, payload: Dict):
+    """Atomically write a sport's warm snapshot (errors are logged, never raised)"""
+    path = snapshot_path(sport)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'saved_at': time.time(), **payload}, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        log.warning('Could not save %s snapshot: %s', sport, e)
+
+
+def load_snapshot(sport: str, max_age: Optional[float] = None) -> Optional[Dict]:
+    """Load a sport's warm snapshot if it exists and is younger than `max_age` seconds"""
+    max_age = max_age if max_age is not None else COLD_START.get('max_age', 600)
+    try:
+        with open(snapshot_path(sport), encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if time.time() - snapshot.get('saved_at', 0) > max_age:
+        return None
+    return snapshot
+
+
+class SnapshotWriter:
+    """
+    Background writer of warm snapshots
+
+    submit() only queues a payload builder; building (history export) and
+    writing happen on the writer thread. Only the latest pending snapshot
+    of a sport is written, older ones are replaced.
+    """
+
+    def __init__(self):
+        self.pending = {}     # sport -> payload builder
+        self.condition = threading.Condition()
+        self.worker = None
+        self.saved = 0
+        self.replaced = 0
+
+    def submit(self, sport: str, build: Callable[[], Dict]):
+        with self.condition:
+            if sport in self.pending:
+                self.replaced += 1
+            self.pending[sport] = build
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._run, name='warm-snapshot', daemon=True)
+                self.worker.start()
+            self.condition.notify()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                sport, build = self.pending.popitem()
+            try:
+                save_snapshot(sport, build())
+                self.saved += 1
+            except Exception as e:
+                log.warning('Could not build %s snapshot: %s', sport, e)
+
+    def status(self) -> Dict:
+        with self.condition:
+            return {'saved': self.saved, 'pending': len(self.pending), 'replaced': self.replaced}
+
+
+# Shared writer used by the API
+snapshot_writer = SnapshotWriter()